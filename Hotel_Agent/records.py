@@ -0,0 +1,210 @@
+import threading
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+def index_key(value: Any) -> Any:
+    """Index strings case- and whitespace-insensitively, so "Hassan " finds "hassan"."""
+    return " ".join(value.split()).casefold() if isinstance(value, str) else value
+
+
+class RecordStore:
+    """Records (dicts) keyed by id, with secondary indexes on chosen fields.
+
+    Lookups, inserts, updates and removals are O(1) no matter how many records
+    the store holds: each index maps a field value to an insertion-ordered dict
+    of ids, so moving a record between index entries never scans a list.
+    Like RoomInventory, one store is shared by every session of the process and
+    session state only keeps the ids it cares about.
+
+    on_change, if set, is called with (record_id, record) after every change,
+    and with (record_id, None) after a removal, while the store is still
+    locked, so a persistence layer sees the changes in order.
+    """
+
+    def __init__(self, id_field: str, indexed_fields: Iterable[str] = ()):
+        self.id_field = id_field
+        self.on_change: Optional[Callable[[str, Optional[dict]], None]] = None
+        self._records: Dict[str, dict] = {}
+        self._indexes: Dict[str, Dict[Any, Dict[str, None]]] = {field: {} for field in indexed_fields}
+        self._lock = threading.RLock()
+        # Bumped on every change, so callers can tell when derived data is stale
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, record_id: str) -> bool:
+        return record_id in self._records
+
+    def new_id(self) -> str:
+        """A short id not used by any record yet. Eight hex characters start
+        colliding around 65k records, so draws are checked against the store."""
+        while True:
+            record_id = str(uuid.uuid4())[:8]
+            if record_id not in self._records:
+                return record_id
+
+    def add(self, record: dict) -> dict:
+        with self._lock:
+            record = self._insert(record)
+            self._changed(record[self.id_field], record)
+            return dict(record)
+
+    def load(self, records: Iterable[dict]):
+        """Adds records saved by an earlier run, oldest first, without
+        reporting them to on_change."""
+        with self._lock:
+            for record in records:
+                self._insert(record)
+            self.version += 1
+
+    def clear(self):
+        """Drops every record, without reporting it to on_change."""
+        with self._lock:
+            self._records.clear()
+            for index in self._indexes.values():
+                index.clear()
+            self.version += 1
+
+    def get(self, record_id: str) -> Optional[dict]:
+        """Returns a copy of the record, or None if it does not exist."""
+        record = self._records.get(record_id)
+        return dict(record) if record else None
+
+    def update(self, record_id: str, **changes) -> Optional[dict]:
+        """Applies changes to a record and re-indexes the changed fields.
+        Returns the updated copy, or None if the record does not exist."""
+        with self._lock:
+            record = self._records.get(record_id)
+            if record is None:
+                return None
+            for field, value in changes.items():
+                if field in self._indexes and index_key(record.get(field)) != index_key(value):
+                    self._unindex(field, record.get(field), record_id)
+                    self._index(field, value, record_id)
+                record[field] = value
+            self._changed(record_id, record)
+            return dict(record)
+
+    def remove(self, record_id: str) -> Optional[dict]:
+        with self._lock:
+            record = self._records.pop(record_id, None)
+            if record is None:
+                return None
+            for field in self._indexes:
+                self._unindex(field, record.get(field), record_id)
+            self._changed(record_id, None)
+            return record
+
+    def ids(self, field: str, value: Any) -> List[str]:
+        """Ids of records whose indexed field equals value, oldest first."""
+        with self._lock:
+            return list(self._indexes[field].get(index_key(value), ()))
+
+    def find(self, field: str, value: Any, limit: Optional[int] = None) -> List[dict]:
+        """Records whose indexed field equals value, newest first."""
+        with self._lock:
+            ids = self._indexes[field].get(index_key(value), {})
+            records = []
+            for record_id in reversed(ids):
+                if limit is not None and len(records) >= limit:
+                    break
+                records.append(dict(self._records[record_id]))
+            return records
+
+    def count(self, field: str, value: Any) -> int:
+        return len(self._indexes[field].get(index_key(value), ()))
+
+    def _insert(self, record: dict) -> dict:
+        record_id = record[self.id_field]
+        if record_id in self._records:
+            raise KeyError(f"Duplicate {self.id_field}: {record_id}")
+        record = dict(record)
+        self._records[record_id] = record
+        for field in self._indexes:
+            self._index(field, record.get(field), record_id)
+        return record
+
+    def _changed(self, record_id: str, record: Optional[dict]):
+        self.version += 1
+        if self.on_change:
+            self.on_change(record_id, dict(record) if record else None)
+
+    def _index(self, field: str, value: Any, record_id: str):
+        self._indexes[field].setdefault(index_key(value), {})[record_id] = None
+
+    def _unindex(self, field: str, value: Any, record_id: str):
+        key = index_key(value)
+        ids = self._indexes[field].get(key)
+        if ids is not None:
+            ids.pop(record_id, None)
+            if not ids:
+                del self._indexes[field][key]
+
+
+def owner_of(tool_context) -> str:
+    """The user a tool call acts for. Bookings and tickets are tagged with it,
+    so guests can only see and change their own."""
+    # ToolContext has no public accessor for the user id
+    return tool_context._invocation_context.user_id
+
+
+def owner_scoped(tool):
+    """Marks a tool whose result depends on the user calling it (see owner_of).
+    The response cache never stores a turn that called one, so one guest's
+    bookings or tickets are never replayed to another."""
+    tool.owner_scoped = True
+    return tool
+
+
+def is_owned_by(record: Optional[dict], owner: str) -> bool:
+    return record is not None and record.get("owner") == owner
+
+
+def public_view(record: Optional[dict]) -> Optional[dict]:
+    """A record as tools may return it to the model: without the owner, which
+    is an internal user id the model could repeat to the guest."""
+    if record is None:
+        return None
+    return {field: value for field, value in record.items() if field != "owner"}
+
+
+def remember_id(ids: List[str], record_id: str, limit: int) -> List[str]:
+    """Appends record_id to a short list of ids kept in session state, dropping the oldest."""
+    ids = [i for i in ids if i != record_id]
+    ids.append(record_id)
+    return ids[-limit:]
+
+
+if __name__ == "__main__":
+    # Micro-benchmark: id and index lookups stay flat while a list scan grows with history
+    import random
+    import time
+
+    rng = random.Random(0)
+    names = [f"guest_{i}" for i in range(1000)]
+    lookups = 2000
+
+    print(f"{'records':>10}{'get µs':>10}{'by guest µs':>14}{'update µs':>12}{'list scan µs':>15}")
+    for size in [10, 100, 1_000, 10_000, 100_000]:
+        store = RecordStore("booking_id", ("guest_name", "status"))
+        history = []
+        for i in range(size):
+            record = {"booking_id": f"b{i}", "guest_name": rng.choice(names), "status": "confirmed"}
+            store.add(record)
+            history.append(record)
+        targets = [f"b{rng.randrange(size)}" for _ in range(lookups)]
+
+        timings = []
+        for query in [
+            lambda target: store.get(target),
+            lambda target: store.find("guest_name", rng.choice(names), limit=5),
+            lambda target: store.update(target, status=rng.choice(["confirmed", "cancelled"])),
+            lambda target: next(r for r in history if r["booking_id"] == target),
+        ]:
+            start = time.perf_counter()
+            for target in targets:
+                query(target)
+            timings.append((time.perf_counter() - start) / lookups * 1e6)
+        print(f"{size:>10}{timings[0]:>10.2f}{timings[1]:>14.2f}{timings[2]:>12.2f}{timings[3]:>15.2f}")
@@ -0,0 +1,205 @@
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from google.adk.agents.readonly_context import ReadonlyContext # type: ignore
+
+from Hotel_Agent.sub_agents.booking_agent.bookings import booking_store
+from Hotel_Agent.sub_agents.booking_agent.inventory import get_inventory
+from Hotel_Agent.sub_agents.issues_agent.tickets import ticket_engine
+
+SECTIONS = ("user", "bookings", "issues", "inventory")
+DESCRIPTION_CHARS = 80
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count without a tokenizer: about 4 characters per token for
+    Latin text and 2 for Arabic."""
+    ascii_chars = sum(1 for c in text if c.isascii())
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars + 1) // 2
+
+
+class StateRenderer:
+    """Renders the session state into a compact block for agent instructions.
+
+    Instead of interpolating whole records into every prompt, each section is
+    summarized (room counts by type, the few most recent bookings and open
+    tickets), then trimmed to fit a token budget. Rendered blocks are cached
+    under the versions of the stores they read, so a turn only re-renders after
+    a booking, ticket or inventory change.
+    """
+
+    def __init__(self, token_budget: int = 300, max_items: int = 5, max_entries: int = 512):
+        self.token_budget = token_budget
+        self.max_items = max_items
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.tokens_rendered = 0
+
+    def instruction(self, template: str, sections: Sequence[str] = SECTIONS,
+                    token_budget: int = None) -> Callable[[ReadonlyContext], str]:
+        """An ADK InstructionProvider filling {state_context} in template.
+        ADK skips its own {key} injection for providers, so the template's other
+        text goes to the model as is."""
+        def provider(context: ReadonlyContext) -> str:
+            return template.replace("{state_context}", self.render(context.state, sections, token_budget))
+        # Lets callers (e.g. the response cache) see which state an agent's answers depend on
+        provider.sections = tuple(sections)
+        return provider
+
+    def render(self, state, sections: Sequence[str] = SECTIONS, token_budget: int = None) -> str:
+        token_budget = token_budget or self.token_budget
+        key = (tuple(sections), token_budget) + self.versions(state, sections)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+
+        text = self._fit([self._render_section(section, state) for section in sections], token_budget)
+        with self._lock:
+            self.misses += 1
+            self.tokens_rendered += estimate_tokens(text)
+            self._cache[key] = text
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return text
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "avg_tokens": self.tokens_rendered / self.misses if self.misses else 0.0,
+            }
+
+    def versions(self, state, sections: Sequence[str] = SECTIONS) -> tuple:
+        """Everything the given sections' text depends on; a new value means re-render."""
+        return tuple(self._version(section, state) for section in sections)
+
+    def _version(self, section: str, state) -> tuple:
+        if section == "user":
+            return state.get("user_name"), date.today()
+        if section == "bookings":
+            return tuple(state.get("recent_bookings", [])[-self.max_items:]), booking_store.version
+        if section == "issues":
+            return tuple(state.get("pending_issues", [])), ticket_engine.store.version
+        if section == "inventory":
+            inventory = get_inventory(state)
+            return id(inventory), inventory.version, date.today()
+        raise ValueError(f"Unknown state section: {section}")
+
+    def _render_section(self, section: str, state) -> Tuple[str, List[str], int]:
+        """A section as (header, item lines, total items), most important items first."""
+        if section == "user":
+            return f"User name: {state.get('user_name', 'Guest')}\nToday: {date.today().isoformat()}", [], 0
+
+        if section == "bookings":
+            items = []
+            for booking_id in reversed(state.get("recent_bookings", [])[-self.max_items:]):
+                booking = booking_store.get(booking_id)
+                if booking:
+                    items.append(
+                        f"- {booking_id}: {booking['room_id']} ({booking['room_type']}), "
+                        f"{booking['check_in']} to {booking['check_out']}, {booking['guest_name']}, "
+                        f"{booking['status']}, total {booking['total_cost']}"
+                    )
+            return "Recent bookings:" if items else "Recent bookings: none", items, len(items)
+
+        if section == "issues":
+            tickets = [ticket_engine.get(ticket_id) for ticket_id in state.get("pending_issues", [])]
+            tickets = [ticket for ticket in tickets if ticket and ticket["status"] != "resolved"]
+            items = [
+                f"- {ticket['ticket_id']}: [{ticket['severity']}, {ticket['status']}] "
+                f"{ticket['issue_description'][:DESCRIPTION_CHARS]}"
+                for ticket in reversed(tickets[-self.max_items:])
+            ]
+            return "Open tickets:" if items else "Open tickets: none", items, len(tickets)
+
+        if section == "inventory":
+            items = [
+                f"- {room_type}: {info['total']} rooms, {info['min_price']}-{info['max_price']} per night, "
+                f"{info['free_tonight']} free tonight"
+                + (f" from {info['cheapest_free']}" if info["cheapest_free"] is not None else "")
+                for room_type, info in get_inventory(state).summary().items()
+            ]
+            return "Rooms (use find_available_rooms for other dates):" if items else "Rooms: none", items, len(items)
+
+        raise ValueError(f"Unknown state section: {section}")
+
+    @staticmethod
+    def _fit(sections: List[Tuple[str, List[str], int]], token_budget: int) -> str:
+        """Joins the sections, dropping the last items of the longest lists until
+        the text fits the budget. Headers are always kept."""
+
+        def join() -> str:
+            blocks = []
+            for header, items, total in sections:
+                dropped = total - len(items)
+                lines = [header] + items + ([f"  (+{dropped} more)"] if dropped else [])
+                blocks.append("\n".join(lines))
+            return "\n".join(blocks)
+
+        text = join()
+        while estimate_tokens(text) > token_budget:
+            longest = max(sections, key=lambda section: len(section[1]))
+            if not longest[1]:
+                break
+            longest[1].pop()
+            text = join()
+        return text
+
+
+state_renderer = StateRenderer()
+
+
+if __name__ == "__main__":
+    import json
+    import random
+    import time
+    from datetime import timedelta
+
+    from Hotel_Agent.sub_agents.booking_agent.inventory import RoomInventory, register_inventory
+
+    # Compares the compact block with interpolating every record, as the prompts used to
+    rng = random.Random(0)
+    rooms = {
+        f"room_{i}": {"type": rng.choice(["single", "double", "suite"]), "price": rng.randrange(80, 600, 10)}
+        for i in range(500)
+    }
+    inventory = RoomInventory(rooms)
+    register_inventory(inventory, "demo")
+    booking_ids = []
+    for i in range(200):
+        check_in = date.today() + timedelta(days=rng.randrange(60))
+        booking_id = booking_store.new_id()
+        room_id = f"room_{rng.randrange(500)}"
+        if inventory.reserve(room_id, check_in, check_in + timedelta(days=2), booking_id):
+            booking_store.add({
+                "booking_id": booking_id, "room_id": room_id, "room_type": rooms[room_id]["type"],
+                "guest_name": "Hassan", "check_in": check_in.isoformat(),
+                "check_out": (check_in + timedelta(days=2)).isoformat(), "total_cost": 200, "status": "confirmed",
+            })
+            booking_ids.append(booking_id)
+    ticket_ids = [ticket_engine.create("Hassan", "التكييف لا يعمل في الغرفة", "high")["ticket_id"] for _ in range(20)]
+    state = {"user_name": "Hassan", "inventory_id": "demo", "recent_bookings": booking_ids, "pending_issues": ticket_ids}
+
+    full = json.dumps({
+        "rooms_db": rooms,
+        "recent_bookings": [booking_store.get(i) for i in booking_ids],
+        "pending_issues": [ticket_engine.get(i) for i in ticket_ids],
+    }, ensure_ascii=False)
+    compact = state_renderer.render(state)
+    print(compact)
+    print(f"\nfull state: ~{estimate_tokens(full)} tokens, compact: ~{estimate_tokens(compact)} tokens")
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        state_renderer.render(state)
+    print(f"cached render: {(time.perf_counter() - start) * 1000:.3f} µs, {state_renderer.stats()}")
@@ -1,145 +1,256 @@
 from google.adk.agents import Agent
 from google.adk.tools.tool_context import ToolContext
-import uuid
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from Hotel_Agent.prompts import PROMPTS
+from Hotel_Agent.records import index_key, is_owned_by, owner_of, owner_scoped, public_view, remember_id
+from Hotel_Agent.state_renderer import state_renderer
+from Hotel_Agent.sub_agents.booking_agent.bookings import RECENT_BOOKINGS_KEPT, booking_store
+from Hotel_Agent.sub_agents.booking_agent.inventory import get_inventory
 
+# Keeps find_available_rooms responses short enough to read out loud
+MAX_ROOMS_LISTED = 5
+MAX_NIGHTS = 30
 
-def check_room_availability(tool_context: ToolContext, room_id: str):
-    rooms_db = tool_context.state.get("rooms_db", {})
+
+def parse_stay(check_in: str, check_out: str):
+    """Parses ISO (YYYY-MM-DD) stay dates. An empty check_in means today and an
+    empty check_out means one night. Returns (check_in, check_out, error)."""
+    try:
+        start = date.fromisoformat(check_in) if check_in else date.today()
+        end = date.fromisoformat(check_out) if check_out else start + timedelta(days=1)
+    except ValueError:
+        return None, None, "Dates must be in YYYY-MM-DD format."
+    
+    if start < date.today():
+        return None, None, "Check-in date can't be in the past."
+    if end <= start:
+        return None, None, "Check-out date must be after the check-in date."
+    if (end - start).days > MAX_NIGHTS:
+        return None, None, f"Stays are limited to {MAX_NIGHTS} nights."
+    return start, end, None
+
+
+def check_room_availability(tool_context: ToolContext, room_id: str, check_in: str, check_out: str):
+    """Check if a specific room is free for a stay.
+    
+    Args:
+        room_id: The room ID to check
+        check_in: Check-in date as YYYY-MM-DD, or an empty string for today
+        check_out: Check-out date as YYYY-MM-DD, or an empty string for a one night stay
+    """
+    inventory = get_inventory(tool_context.state)
+    room_info = inventory.get(room_id)
     
-    if room_id not in rooms_db:
+    if room_info is None:
         return {
             "status": "error",
             "message": f"Room {room_id} does not exist."
         }
     
+    start, end, error = parse_stay(check_in, check_out)
+    if error:
+        return {
+            "status": "error",
+            "message": error
+        }
+    
+    if inventory.is_free(room_id, start, end):
+        return {
+            "status": "success",
+            "message": f"Room {room_id} is available from {start} to {end}.",
+            "room_info": room_info
+        }
     else:
-        room_info = rooms_db[room_id]
-        if room_info.get("available", False):
-            return {
-                "status": "success",
-                "message": f"Room {room_id} is available.",
-                "room_info": room_info
-            }
-        else:
-            return {
-                "status": "error",
-                "message": f"Room {room_id} is not available."
-            }
-
-
-def make_reservation(tool_context: ToolContext, room_id: str, guest_name: str):
+        return {
+            "status": "error",
+            "message": f"Room {room_id} is not available from {start} to {end}."
+        }
+
+
+def find_available_rooms(tool_context: ToolContext, room_type: str, max_price: float, check_in: str, check_out: str):
+    """Find rooms that are free for a whole stay, cheapest first.
+    
+    Args:
+        room_type: Room type to look for (e.g. single, double, suite), or an empty string for any type
+        max_price: Highest acceptable price per night, or 0 for no limit
+        check_in: Check-in date as YYYY-MM-DD, or an empty string for today
+        check_out: Check-out date as YYYY-MM-DD, or an empty string for a one night stay
+    """
+    inventory = get_inventory(tool_context.state)
+    room_type = (room_type or "").strip().lower() or None
+    max_price = max_price if max_price and max_price > 0 else None
+    
+    if room_type and room_type not in inventory.room_types():
+        return {
+            "status": "error",
+            "message": f"Unknown room type {room_type}. Available types: {', '.join(inventory.room_types())}"
+        }
+    
+    start, end, error = parse_stay(check_in, check_out)
+    if error:
+        return {
+            "status": "error",
+            "message": error
+        }
+    
+    rooms = inventory.find_available(room_type, max_price, start, end)
+    if not rooms:
+        return {
+            "status": "error",
+            "message": f"No available rooms match the request from {start} to {end}."
+        }
+    
+    return {
+        "status": "success",
+        "message": f"Found {len(rooms)} available room(s) from {start} to {end}.",
+        "rooms": rooms[:MAX_ROOMS_LISTED]
+    }
+
+
+@owner_scoped
+def make_reservation(tool_context: ToolContext, room_id: str, guest_name: str, check_in: str, check_out: str):
     """Make a room reservation.
     
     Args:
         room_id: The room ID to book
         guest_name: Name of the guest (optional, will use session user_name if not provided)
+        check_in: Check-in date as YYYY-MM-DD, or an empty string for today
+        check_out: Check-out date as YYYY-MM-DD, or an empty string for a one night stay
     """
     
-    rooms_db = tool_context.state.get("rooms_db", {})
-    recent_bookings = tool_context.state.get("recent_bookings", [])
+    inventory = get_inventory(tool_context.state)
     user_name = tool_context.state.get("user_name", "Guest")
     
     if not guest_name:
         guest_name = user_name
     
-    if room_id not in rooms_db:
+    room_info = inventory.get(room_id)
+    if room_info is None:
         return {
             "status": "error",
             "message": f"Room {room_id} does not exist."
         }
     
-    if not rooms_db[room_id].get("available", False):
+    start, end, error = parse_stay(check_in, check_out)
+    if error:
+        return {
+            "status": "error",
+            "message": error
+        }
+    
+    booking_id = booking_store.new_id()
+    
+    # reserve() checks and books the nights atomically, so two sessions can't book them twice
+    if not inventory.reserve(room_id, start, end, booking_id):
         return {
             "status": "error",
-            "message": f"Room {room_id} is not available for booking."
+            "message": f"Room {room_id} is not available for booking from {start} to {end}."
         }
     
-    booking_id = str(uuid.uuid4())[:8]
-    total_cost = rooms_db[room_id]["price"]
+    nights = (end - start).days
+    total_cost = room_info["price"] * nights
     
     booking = {
         "booking_id": booking_id,
+        "owner": owner_of(tool_context),
         "room_id": room_id,
-        "room_type": rooms_db[room_id]["type"],
+        "room_type": room_info["type"],
         "guest_name": guest_name,
+        "check_in": start.isoformat(),
+        "check_out": end.isoformat(),
+        "nights": nights,
         "total_cost": total_cost,
         "status": "confirmed",
         "booking_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
     
-    # Update room availability
-    rooms_db[room_id]["available"] = False
-    
-    # Add to recent bookings
-    recent_bookings.append(booking)
+    booking_store.add(booking)
     
-    tool_context.state["rooms_db"] = rooms_db
-    tool_context.state["recent_bookings"] = recent_bookings
+    tool_context.state["recent_bookings"] = remember_id(
+        tool_context.state.get("recent_bookings", []), booking_id, RECENT_BOOKINGS_KEPT)
 
     return {
         "status": "success",
         "message": f"Reservation confirmed! Booking ID: {booking_id}",
-        "booking_details": {
-            "booking_id": booking_id,
-            "guest_name": guest_name,
-            "room_id": room_id,
-            "room_type": rooms_db[room_id]["type"],
-            "total_cost": total_cost,
-            "status": "confirmed",
-            "booking_date": booking["booking_date"]
-        }
+        "booking_details": public_view(booking)
     }
 
 
+@owner_scoped
 def confirm_booking(tool_context: ToolContext, booking_id: str):
-    recent_bookings = tool_context.state.get("recent_bookings", [])
-    
-    for booking in recent_bookings:
-        if booking_id and booking.get("booking_id") == booking_id:
-            return {
-                "status": "success",
-                "message": f"Booking found with ID: {booking_id}",
-                "booking_details": booking
-            }
+    booking = booking_store.get(booking_id) if booking_id else None
     
+    # Other guests' bookings are reported as missing, so ids can't be probed
+    if is_owned_by(booking, owner_of(tool_context)):
+        return {
+            "status": "success",
+            "message": f"Booking found with ID: {booking_id}",
+            "booking_details": public_view(booking)
+        }
     
     return {
         "status": "error",
         "message": f"No booking found with ID: {booking_id}"
     }
+
+
+@owner_scoped
+def find_guest_bookings(tool_context: ToolContext, guest_name: str):
+    """Find the guest's confirmed bookings, optionally only those made under a name.
+    
+    Args:
+        guest_name: Name the bookings were made under, or an empty string for all of the guest's bookings
+    """
+    bookings = [
+        booking for booking in booking_store.find("owner", owner_of(tool_context))
+        if booking["status"] == "confirmed"
+        and (not guest_name or index_key(booking["guest_name"]) == index_key(guest_name))
+    ]
+    found_for = f" for {guest_name}" if guest_name else ""
+    if not bookings:
+        return {
+            "status": "error",
+            "message": f"No confirmed bookings found{found_for}"
+        }
+    
+    return {
+        "status": "success",
+        "message": f"Found {len(bookings)} confirmed booking(s){found_for}",
+        "bookings": [public_view(booking) for booking in bookings]
+    }
     
 
+@owner_scoped
 def cancel_booking(tool_context: ToolContext, booking_id: str):
-    recent_bookings = tool_context.state.get("recent_bookings", [])
-    rooms_db = tool_context.state.get("rooms_db", {})
+    inventory = get_inventory(tool_context.state)
+    booking = booking_store.get(booking_id) if booking_id else None
     
-    for i, booking in enumerate(recent_bookings):
-        if booking.get("booking_id") == booking_id:
-            rooms_db["room_id"]["available"] = True
-            recent_bookings.pop(i)
-            tool_context.state["recent_bookings"] = recent_bookings
-            tool_context.state["rooms_db"] = rooms_db
-
-            return {
-                "status": "success",
-                "message": f"Booking with ID {booking_id} has been cancelled.",
-                "booking_details": booking
-            }
-
+    if not is_owned_by(booking, owner_of(tool_context)):
+        return {
+            "status": "error",
+            "message": f"No booking found with ID: {booking_id}"
+        }
     
+    if booking["status"] != "confirmed":
+        return {
+            "status": "error",
+            "message": f"Booking with ID {booking_id} is already {booking['status']}."
+        }
+    
+    inventory.release(booking["room_id"], date.fromisoformat(booking["check_in"]), booking_id)
+    booking = booking_store.update(booking_id, status="cancelled")
+
     return {
-        "status": "error",
-        "message": f"No booking found with ID: {booking_id}"
+        "status": "success",
+        "message": f"Booking with ID {booking_id} has been cancelled.",
+        "booking_details": public_view(booking)
     }
-    
 
 
 booking_agent = Agent(
     name="booking_agent",
     model="gemini-2.0-flash",
-    description="An agent that handles hotel room bookings and reservations for immediate occupancy.",
-    instruction=PROMPTS["booking_agent"],
-    tools=[check_room_availability, make_reservation, confirm_booking, cancel_booking],
+    description="An agent that handles hotel room bookings and reservations for given check-in and check-out dates.",
+    instruction=state_renderer.instruction(PROMPTS["booking_agent"], sections=("user", "bookings", "inventory")),
+    tools=[find_available_rooms, check_room_availability, make_reservation, confirm_booking, find_guest_bookings, cancel_booking],
 )
\ No newline at end of file
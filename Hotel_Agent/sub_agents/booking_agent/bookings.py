@@ -0,0 +1,6 @@
+from Hotel_Agent.records import RecordStore
+
+# Booking ids kept in session state; the records themselves live in booking_store
+RECENT_BOOKINGS_KEPT = 5
+
+booking_store = RecordStore("booking_id", indexed_fields=("owner", "guest_name", "status"))
@@ -0,0 +1,279 @@
+import bisect
+import threading
+from datetime import date, timedelta
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+DEFAULT_INVENTORY_ID = "hotel"
+
+_price = itemgetter(0)
+
+
+def tonight() -> Tuple[date, date]:
+    today = date.today()
+    return today, today + timedelta(days=1)
+
+
+class RoomCalendar:
+    """Reservations of one room as non-overlapping [check_in, check_out) intervals
+    kept sorted by check-in, so conflict checks are a single bisect."""
+
+    def __init__(self):
+        self.starts: List[date] = []
+        self.ends: List[date] = []
+        self.booking_ids: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def is_free(self, check_in: date, check_out: date) -> bool:
+        # Stays starting before check_out are starts[:i]. They don't overlap each
+        # other, so the last of them also ends last; the range is free if that one
+        # has checked out by check_in.
+        i = bisect.bisect_left(self.starts, check_out)
+        return i == 0 or self.ends[i - 1] <= check_in
+
+    def add(self, check_in: date, check_out: date, booking_id: str) -> bool:
+        if not self.is_free(check_in, check_out):
+            return False
+        i = bisect.bisect_left(self.starts, check_in)
+        self.starts.insert(i, check_in)
+        self.ends.insert(i, check_out)
+        self.booking_ids.insert(i, booking_id)
+        return True
+
+    def remove(self, check_in: date, booking_id: str) -> bool:
+        i = bisect.bisect_left(self.starts, check_in)
+        if i == len(self.starts) or self.starts[i] != check_in or self.booking_ids[i] != booking_id:
+            return False
+        del self.starts[i], self.ends[i], self.booking_ids[i]
+        return True
+
+    def overlapping(self, check_in: date, check_out: date) -> Iterator[Tuple[date, date, str]]:
+        """Reservations that overlap [check_in, check_out)."""
+        # Check-outs are sorted too, since the intervals don't overlap
+        i = bisect.bisect_right(self.ends, check_in)
+        while i < len(self.starts) and self.starts[i] < check_out:
+            yield self.starts[i], self.ends[i], self.booking_ids[i]
+            i += 1
+
+
+class RoomInventory:
+    """Hotel rooms indexed by type and price, with a reservation calendar per room.
+
+    One inventory is shared by every session of the process, so session state
+    only needs to hold its id (see get_inventory) instead of a copy of every room.
+    """
+
+    def __init__(self, rooms: Optional[Dict[str, dict]] = None):
+        self._rooms: Dict[str, dict] = {}
+        self._calendars: Dict[str, RoomCalendar] = {}
+        self._by_type: Dict[str, Set[str]] = {}
+        # Rooms in service as (price, room_id), kept sorted per type and overall
+        # so price-capped queries are a bisect plus a slice
+        self._in_service_by_type: Dict[str, List[Tuple[float, str]]] = {}
+        self._in_service: List[Tuple[float, str]] = []
+        self._lock = threading.RLock()
+        # Bumped on every change, so callers can tell when derived data is stale
+        self.version = 0
+
+        for room_id, room in (rooms or {}).items():
+            self.add_room(room_id, room["type"], room["price"], room.get("in_service", True))
+
+    def __len__(self) -> int:
+        return len(self._rooms)
+
+    def __contains__(self, room_id: str) -> bool:
+        return room_id in self._rooms
+
+    def add_room(self, room_id: str, room_type: str, price: float, in_service: bool = True):
+        with self._lock:
+            if room_id in self._rooms:
+                self.remove_room(room_id)
+            self._rooms[room_id] = {"type": room_type, "price": price, "in_service": False}
+            self._calendars[room_id] = RoomCalendar()
+            self._by_type.setdefault(room_type, set()).add(room_id)
+            if in_service:
+                self.set_in_service(room_id, True)
+            self.version += 1
+
+    def remove_room(self, room_id: str):
+        with self._lock:
+            room = self._rooms.get(room_id)
+            if room is None:
+                return
+            self.set_in_service(room_id, False)
+            self._by_type[room["type"]].discard(room_id)
+            del self._rooms[room_id]
+            del self._calendars[room_id]
+            self.version += 1
+
+    def set_in_service(self, room_id: str, in_service: bool):
+        """Takes a room in or out of service. Rooms out of service can't be booked."""
+        with self._lock:
+            room = self._rooms[room_id]
+            if room["in_service"] == in_service:
+                return
+            room["in_service"] = in_service
+            entry = (room["price"], room_id)
+            for index in (self._in_service_by_type.setdefault(room["type"], []), self._in_service):
+                if in_service:
+                    bisect.insort(index, entry)
+                else:
+                    del index[bisect.bisect_left(index, entry)]
+            self.version += 1
+
+    def get(self, room_id: str) -> Optional[dict]:
+        """Returns a copy of the room record, or None if it does not exist."""
+        room = self._rooms.get(room_id)
+        return dict(room) if room else None
+
+    def is_free(self, room_id: str, check_in: date, check_out: date) -> bool:
+        with self._lock:
+            room = self._rooms.get(room_id)
+            return bool(room and room["in_service"] and self._calendars[room_id].is_free(check_in, check_out))
+
+    def reserve(self, room_id: str, check_in: date, check_out: date, booking_id: str) -> bool:
+        """Books [check_in, check_out) if the room is free then. The check and the
+        booking happen under one lock, so two sessions can't take the same nights."""
+        if check_out <= check_in:
+            raise ValueError("check_out must be after check_in")
+        with self._lock:
+            room = self._rooms.get(room_id)
+            if room is None or not room["in_service"]:
+                return False
+            if not self._calendars[room_id].add(check_in, check_out, booking_id):
+                return False
+            self.version += 1
+            return True
+
+    def release(self, room_id: str, check_in: date, booking_id: str) -> bool:
+        """Drops a reservation. Returns False if it does not exist."""
+        with self._lock:
+            calendar = self._calendars.get(room_id)
+            if calendar is None or not calendar.remove(check_in, booking_id):
+                return False
+            self.version += 1
+            return True
+
+    def clear_reservations(self):
+        with self._lock:
+            self._calendars = {room_id: RoomCalendar() for room_id in self._rooms}
+            self.version += 1
+
+    def reservations(self, room_id: str, check_in: date, check_out: date) -> List[Tuple[date, date, str]]:
+        with self._lock:
+            return list(self._calendars[room_id].overlapping(check_in, check_out))
+
+    def find_available(self, room_type: Optional[str] = None, max_price: Optional[float] = None,
+                       check_in: Optional[date] = None, check_out: Optional[date] = None,
+                       limit: Optional[int] = None) -> List[dict]:
+        """Rooms free for the whole stay (tonight by default), cheapest first,
+        optionally filtered by type and price cap."""
+        if check_in is None or check_out is None:
+            check_in, check_out = tonight()
+        rooms = []
+        with self._lock:
+            for price, room_id in self._candidates(room_type, max_price):
+                if self._calendars[room_id].is_free(check_in, check_out):
+                    rooms.append({"room_id": room_id, "type": self._rooms[room_id]["type"], "price": price})
+                    if limit is not None and len(rooms) >= limit:
+                        break
+        return rooms
+
+    def count_available(self, room_type: Optional[str] = None, max_price: Optional[float] = None,
+                        check_in: Optional[date] = None, check_out: Optional[date] = None) -> int:
+        return len(self.find_available(room_type, max_price, check_in, check_out))
+
+    def free_rooms(self, check_in: date, check_out: date) -> List[str]:
+        """Ids of every room free from check_in to check_out."""
+        return [room["room_id"] for room in self.find_available(check_in=check_in, check_out=check_out)]
+
+    def room_types(self) -> List[str]:
+        return sorted(t for t, ids in self._by_type.items() if ids)
+
+    def summary(self) -> Dict[str, dict]:
+        """Room counts and price range per type, with availability for tonight."""
+        check_in, check_out = tonight()
+        with self._lock:
+            summary = {}
+            for room_type in self.room_types():
+                prices = [self._rooms[room_id]["price"] for room_id in self._by_type[room_type]]
+                free = self.find_available(room_type, None, check_in, check_out)
+                summary[room_type] = {
+                    "total": len(prices),
+                    "free_tonight": len(free),
+                    "min_price": min(prices),
+                    "max_price": max(prices),
+                    "cheapest_free": free[0]["price"] if free else None,
+                }
+            return summary
+
+    def to_dict(self) -> Dict[str, dict]:
+        with self._lock:
+            return {room_id: dict(room) for room_id, room in self._rooms.items()}
+
+    def _candidates(self, room_type: Optional[str], max_price: Optional[float]) -> List[Tuple[float, str]]:
+        candidates = self._in_service_by_type.get(room_type, []) if room_type else self._in_service
+        if max_price is not None:
+            candidates = candidates[:bisect.bisect_right(candidates, max_price, key=_price)]
+        return candidates
+
+
+_inventories: Dict[str, RoomInventory] = {}
+
+
+def register_inventory(inventory: RoomInventory, inventory_id: str = DEFAULT_INVENTORY_ID) -> str:
+    _inventories[inventory_id] = inventory
+    return inventory_id
+
+
+def get_inventory(state) -> RoomInventory:
+    """The inventory referenced by a session state's inventory_id."""
+    inventory_id = state.get("inventory_id", DEFAULT_INVENTORY_ID)
+    if inventory_id not in _inventories:
+        _inventories[inventory_id] = RoomInventory()
+    return _inventories[inventory_id]
+
+
+if __name__ == "__main__":
+    # Load benchmark: availability queries against a growing number of future bookings
+    import random
+    import time
+
+    rng = random.Random(0)
+    room_types = ["single", "double", "suite"]
+    queries = 2000
+
+    print(f"{'bookings':>10}{'is_free µs':>14}{'find_available µs':>20}{'free_rooms µs':>16}")
+    for target in [1_000, 10_000, 50_000]:
+        inventory = RoomInventory({
+            f"room_{i}": {"type": rng.choice(room_types), "price": rng.randrange(80, 600, 10)}
+            for i in range(200)
+        })
+        room_ids = [f"room_{i}" for i in range(200)]
+        today = date.today()
+        horizon = max(365, target // 40)
+        bookings = 0
+        while bookings < target:
+            check_in = today + timedelta(days=rng.randrange(horizon))
+            check_out = check_in + timedelta(days=rng.randint(1, 5))
+            if inventory.reserve(rng.choice(room_ids), check_in, check_out, str(bookings)):
+                bookings += 1
+
+        stays = []
+        for _ in range(queries):
+            check_in = today + timedelta(days=rng.randrange(horizon))
+            stays.append((check_in, check_in + timedelta(days=rng.randint(1, 5))))
+
+        timings = []
+        for query in [
+            lambda stay: inventory.is_free(rng.choice(room_ids), *stay),
+            lambda stay: inventory.find_available(rng.choice(room_types), rng.randrange(80, 600), *stay, limit=5),
+            lambda stay: inventory.free_rooms(*stay),
+        ]:
+            start = time.perf_counter()
+            for stay in stays:
+                query(stay)
+            timings.append((time.perf_counter() - start) / queries * 1e6)
+        print(f"{bookings:>10}{timings[0]:>14.1f}{timings[1]:>20.1f}{timings[2]:>16.1f}")
@@ -1,50 +1,54 @@
 from google.adk.agents import Agent
 from google.adk.tools.tool_context import ToolContext
-import uuid
-from datetime import datetime
 from Hotel_Agent.prompts import PROMPTS
+from Hotel_Agent.records import index_key, is_owned_by, owner_of, owner_scoped, public_view
+from Hotel_Agent.state_renderer import state_renderer
+from Hotel_Agent.sub_agents.issues_agent.tickets import DEFAULT_SEVERITY, SEVERITIES, ticket_engine
 
 
-def create_issue_ticket(tool_context: ToolContext, user_name: str, issue_description: str):
-    pending_issues = tool_context.state.get("pending_issues", [])
+@owner_scoped
+def create_issue_ticket(tool_context: ToolContext, user_name: str, issue_description: str, severity: str):
+    """Create a new support ticket.
+    
+    Args:
+        user_name: Name of the user reporting the issue (optional, will use session user_name if not provided)
+        issue_description: Detailed description of the issue
+        severity: One of critical, high, normal or low
+    """
     session_user_name = tool_context.state.get("user_name", "Guest")
     
     if not user_name:
         user_name = session_user_name
     
-    ticket_id = str(uuid.uuid4())[:8]
-    issue_ticket = {
-        "ticket_id": ticket_id,
-        "user_name": user_name,
-        "issue_description": issue_description,
-        "status": "open",
-    }
+    severity = (severity or DEFAULT_SEVERITY).strip().lower()
+    if severity not in SEVERITIES:
+        severity = DEFAULT_SEVERITY
     
-    pending_issues.append(issue_ticket)
-    tool_context.state["pending_issues"] = pending_issues
+    issue_ticket = ticket_engine.create(user_name, issue_description, severity, owner=owner_of(tool_context))
+    ticket_id = issue_ticket["ticket_id"]
+    
+    # Session state only tracks the ids of this session's open tickets
+    pending_issues = tool_context.state.get("pending_issues", [])
+    tool_context.state["pending_issues"] = pending_issues + [ticket_id]
     
     return {
         "status": "success",
         "message": f"Issue ticket created successfully! Ticket ID: {ticket_id}",
-        "ticket_details": {
-            "ticket_id": ticket_id,
-            "user_name": user_name,
-            "issue_description": issue_description,
-            "status": "open",
-        }
+        "ticket_details": public_view(issue_ticket)
     }
 
 
+@owner_scoped
 def view_issue_status(tool_context: ToolContext, ticket_id: str):
-    pending_issues = tool_context.get_state("pending_issues", [])
+    issue = ticket_engine.get(ticket_id) if ticket_id else None
     
-    for issue in pending_issues:
-        if issue.get("ticket_id") == ticket_id:
-            return {
-                "status": "success",
-                "message": f"Ticket found with ID: {ticket_id}",
-                "ticket_details": issue
-            }
+    # Other guests' tickets are reported as missing, so ids can't be probed
+    if is_owned_by(issue, owner_of(tool_context)):
+        return {
+            "status": "success",
+            "message": f"Ticket found with ID: {ticket_id}",
+            "ticket_details": public_view(issue)
+        }
     
     return {
         "status": "error",
@@ -52,23 +56,57 @@ def view_issue_status(tool_context: ToolContext, ticket_id: str):
     }
 
 
-def resolve_issue(tool_context: ToolContext, ticket_id: str):
-    pending_issues = tool_context.state.get("pending_issues", [])
+@owner_scoped
+def view_user_issues(tool_context: ToolContext, user_name: str):
+    """List the guest's open tickets, optionally only those reported under a name.
     
-    for i, issue in enumerate(pending_issues):
-        if issue.get("ticket_id") == ticket_id:
-            pending_issues.pop(i)
-            tool_context.state["pending_issues"] = pending_issues
-            
-            return {
-                "status": "success",
-                "message": f"Ticket {ticket_id} has been resolved",
-                "ticket_details": pending_issues[i]
-            }
+    Args:
+        user_name: Name the tickets were reported under, or an empty string for all of the guest's tickets
+    """
+    issues = [
+        issue for issue in ticket_engine.store.find("owner", owner_of(tool_context))
+        if issue["status"] in ("open", "in_progress")
+        and (not user_name or index_key(issue["user_name"]) == index_key(user_name))
+    ]
+    found_for = f" for {user_name}" if user_name else ""
+    if not issues:
+        return {
+            "status": "error",
+            "message": f"No open tickets found{found_for}"
+        }
     
     return {
-        "status": "error",
-        "message": f"No ticket found with ID: {ticket_id}"
+        "status": "success",
+        "message": f"Found {len(issues)} open ticket(s){found_for}",
+        "tickets": [public_view(issue) for issue in issues]
+    }
+
+
+@owner_scoped
+def resolve_issue(tool_context: ToolContext, ticket_id: str, resolution_notes: str):
+    issue = ticket_engine.get(ticket_id) if ticket_id else None
+    
+    if not is_owned_by(issue, owner_of(tool_context)):
+        return {
+            "status": "error",
+            "message": f"No ticket found with ID: {ticket_id}"
+        }
+    
+    if issue["status"] == "resolved":
+        return {
+            "status": "error",
+            "message": f"Ticket {ticket_id} is already resolved"
+        }
+    
+    issue = ticket_engine.resolve(ticket_id, resolution_notes)
+    pending_issues = tool_context.state.get("pending_issues", [])
+    if ticket_id in pending_issues:
+        tool_context.state["pending_issues"] = [i for i in pending_issues if i != ticket_id]
+    
+    return {
+        "status": "success",
+        "message": f"Ticket {ticket_id} has been resolved",
+        "ticket_details": public_view(issue)
     }
 
 
@@ -77,6 +115,6 @@ issue_agent = Agent(
     name="issue_agent",
     model="gemini-2.0-flash",
     description="An agent that handles customer issues and support tickets.",
-    instruction=PROMPTS["issue_agent"],
-    tools=[create_issue_ticket, view_issue_status, resolve_issue],
+    instruction=state_renderer.instruction(PROMPTS["issue_agent"], sections=("user", "issues")),
+    tools=[create_issue_ticket, view_issue_status, view_user_issues, resolve_issue],
 )
\ No newline at end of file
@@ -0,0 +1,255 @@
+import heapq
+import itertools
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from Hotel_Agent.records import RecordStore
+
+# Most urgent first; the index is the ticket's priority rank in the queue
+SEVERITIES = ["critical", "high", "normal", "low"]
+DEFAULT_SEVERITY = "normal"
+# Minutes a ticket may stay open at each severity before it's escalated
+SLA_MINUTES = {"critical": 15, "high": 60, "normal": 240, "low": 1440}
+
+
+def timestamp(seconds: float) -> str:
+    return datetime.fromtimestamp(seconds).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def parse_timestamp(text: str) -> float:
+    return datetime.strptime(text, "%Y-%m-%d %H:%M:%S").timestamp()
+
+
+class TicketEngine:
+    """Issue tickets in a priority queue with SLA-driven escalation.
+
+    Open tickets sit in a heap ordered by (severity, SLA deadline), so the most
+    urgent one is found in O(1) and claimed in O(log n). A second heap ordered
+    by deadline lets the escalation scheduler find breaches without scanning
+    every unresolved ticket; claimed tickets leave the queue but keep their
+    deadline until resolved. Both heaps are lazy: entries of tickets that were
+    claimed, resolved or escalated are skipped when they surface.
+    """
+
+    def __init__(self, sla_minutes: Optional[Dict[str, float]] = None,
+                 on_escalate: Optional[Callable[[dict], None]] = None,
+                 clock: Callable[[], float] = time.time):
+        self.sla_minutes = {**SLA_MINUTES, **(sla_minutes or {})}
+        self.on_escalate = on_escalate
+        self.clock = clock
+        self.store = RecordStore("ticket_id", indexed_fields=("owner", "user_name", "status", "severity"))
+        self._queue: List[Tuple[int, float, int, str]] = []
+        self._deadlines: List[Tuple[float, int, str]] = []
+        # Live queue entry per open ticket and live deadline (its seq) per
+        # unresolved one; anything else in the heaps is stale
+        self._entries: Dict[str, Tuple[int, float, int, str]] = {}
+        self._deadline_seqs: Dict[str, int] = {}
+        self._seq = itertools.count()
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._scheduler: Optional[threading.Thread] = None
+
+    def create(self, user_name: str, issue_description: str, severity: str = DEFAULT_SEVERITY,
+               owner: Optional[str] = None) -> dict:
+        severity = severity if severity in SEVERITIES else DEFAULT_SEVERITY
+        now = self.clock()
+        with self._lock:
+            ticket = self.store.add({
+                "ticket_id": self.store.new_id(),
+                "owner": owner,
+                "user_name": user_name,
+                "issue_description": issue_description,
+                "severity": severity,
+                "status": "open",
+                "created_at": timestamp(now),
+                "escalations": 0,
+                "sla_breached": False,
+                # Set once the ticket breaches its SLA at critical severity,
+                # after which it has no deadline left
+                "sla_expired": False,
+            })
+            return self._enqueue(ticket["ticket_id"], severity, now)
+
+    def restore(self, tickets: Iterable[dict]):
+        """Loads tickets saved by an earlier run, oldest first, and puts the
+        unresolved ones back in the queue and deadline heaps. Deadlines that
+        passed while the app was down are escalated on the next pass."""
+        with self._lock:
+            tickets = list(tickets)
+            self.store.load(tickets)
+            for ticket in tickets:
+                if ticket["status"] == "resolved":
+                    continue
+                ticket_id = ticket["ticket_id"]
+                due_at = parse_timestamp(ticket["due_at"])
+                seq = next(self._seq)
+                if ticket["status"] == "open":
+                    entry = (SEVERITIES.index(ticket["severity"]), due_at, seq, ticket_id)
+                    self._entries[ticket_id] = entry
+                    heapq.heappush(self._queue, entry)
+                if not ticket.get("sla_expired"):
+                    self._deadline_seqs[ticket_id] = seq
+                    heapq.heappush(self._deadlines, (due_at, seq, ticket_id))
+            self._wake.set()
+
+    def clear(self):
+        """Drops every ticket. The scheduler, if running, keeps running."""
+        with self._lock:
+            self.store.clear()
+            self._queue.clear()
+            self._deadlines.clear()
+            self._entries.clear()
+            self._deadline_seqs.clear()
+
+    def get(self, ticket_id: str) -> Optional[dict]:
+        return self.store.get(ticket_id)
+
+    def next_ticket(self) -> Optional[dict]:
+        """The most urgent open ticket, without claiming it."""
+        with self._lock:
+            entry = self._peek(self._queue, lambda e: self._entries.get(e[3]) == e)
+            return self.store.get(entry[3]) if entry else None
+
+    def claim_next(self, assignee: str) -> Optional[dict]:
+        """Takes the most urgent open ticket off the queue and assigns it. Its
+        SLA deadline still runs until it is resolved."""
+        with self._lock:
+            entry = self._peek(self._queue, lambda e: self._entries.get(e[3]) == e)
+            if entry is None:
+                return None
+            heapq.heappop(self._queue)
+            del self._entries[entry[3]]
+            return self.store.update(entry[3], status="in_progress", assignee=assignee,
+                                     claimed_at=timestamp(self.clock()))
+
+    def resolve(self, ticket_id: str, resolution_notes: str) -> Optional[dict]:
+        with self._lock:
+            if self.store.get(ticket_id) is None:
+                return None
+            self._entries.pop(ticket_id, None)
+            self._deadline_seqs.pop(ticket_id, None)
+            return self.store.update(ticket_id, status="resolved", resolution_notes=resolution_notes,
+                                     resolved_at=timestamp(self.clock()))
+
+    def open_count(self) -> int:
+        return len(self._entries)
+
+    def escalate_overdue(self) -> List[dict]:
+        """Marks every unresolved ticket past its SLA deadline as breached and
+        raises its severity, with a new deadline at the new severity. A
+        critical ticket can't go higher, so it keeps its place in the queue
+        with no further deadline. Returns the tickets that breached."""
+        breached = []
+        with self._lock:
+            now = self.clock()
+            while True:
+                entry = self._peek(self._deadlines, self._is_live_deadline)
+                if entry is None or entry[0] > now:
+                    break
+                heapq.heappop(self._deadlines)
+                ticket_id = entry[2]
+                ticket = self.store.get(ticket_id)
+                if ticket["severity"] == SEVERITIES[0]:
+                    del self._deadline_seqs[ticket_id]
+                    breached.append(self.store.update(ticket_id, sla_breached=True, sla_expired=True))
+                    continue
+                severity = SEVERITIES[SEVERITIES.index(ticket["severity"]) - 1]
+                self.store.update(ticket_id, severity=severity, escalations=ticket["escalations"] + 1,
+                                  sla_breached=True)
+                # Claimed tickets are escalated in place, not put back in the queue
+                breached.append(self._enqueue(ticket_id, severity, now, queued=ticket_id in self._entries))
+        for ticket in breached:
+            if self.on_escalate:
+                self.on_escalate(ticket)
+            elif ticket["ticket_id"] in self._deadline_seqs:
+                print(f"⚠️ Ticket {ticket['ticket_id']} breached its SLA, escalated to {ticket['severity']}")
+            else:
+                print(f"⚠️ Ticket {ticket['ticket_id']} breached its SLA at {ticket['severity']} severity")
+        return breached
+
+    def start(self, max_interval: float = 60.0):
+        """Starts the background escalation scheduler. It sleeps until the
+        nearest SLA deadline (at most max_interval) instead of polling."""
+        with self._lock:
+            if self._scheduler and self._scheduler.is_alive():
+                return
+            self._stop.clear()
+            self._scheduler = threading.Thread(target=self._run, args=(max_interval,), daemon=True)
+            self._scheduler.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._scheduler:
+            self._scheduler.join()
+            self._scheduler = None
+
+    def _run(self, max_interval: float):
+        while not self._stop.is_set():
+            self.escalate_overdue()
+            with self._lock:
+                entry = self._peek(self._deadlines, self._is_live_deadline)
+                delay = max_interval if entry is None else min(max_interval, max(entry[0] - self.clock(), 0))
+                self._wake.clear()
+            self._wake.wait(delay)
+
+    def _enqueue(self, ticket_id: str, severity: str, now: float, queued: bool = True) -> dict:
+        due_at = now + self.sla_minutes[severity] * 60
+        seq = next(self._seq)
+        if queued:
+            entry = (SEVERITIES.index(severity), due_at, seq, ticket_id)
+            self._entries[ticket_id] = entry
+            heapq.heappush(self._queue, entry)
+        self._deadline_seqs[ticket_id] = seq
+        heapq.heappush(self._deadlines, (due_at, seq, ticket_id))
+        # Wake the scheduler in case this deadline is sooner than the one it sleeps on
+        self._wake.set()
+        return self.store.update(ticket_id, due_at=timestamp(due_at))
+
+    def _is_live_deadline(self, entry: Tuple[float, int, str]) -> bool:
+        return self._deadline_seqs.get(entry[2]) == entry[1]
+
+    @staticmethod
+    def _peek(heap: list, is_live: Callable[[tuple], bool]):
+        while heap and not is_live(heap[0]):
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+
+ticket_engine = TicketEngine()
+
+
+if __name__ == "__main__":
+    import random
+
+    # Simulated clock so SLA breaches happen instantly
+    now = [time.time()]
+    engine = TicketEngine(clock=lambda: now[0])
+    rng = random.Random(0)
+    count = 100_000
+
+    start = time.perf_counter()
+    for i in range(count):
+        engine.create(f"guest_{i % 500}", "issue", rng.choice(SEVERITIES))
+    print(f"create: {(time.perf_counter() - start) / count * 1e6:.1f} µs/ticket")
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        engine.next_ticket()
+    print(f"next_ticket with {engine.open_count()} open: {(time.perf_counter() - start) / 1000 * 1e6:.1f} µs")
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        engine.claim_next("front_desk")
+    print(f"claim_next: {(time.perf_counter() - start) / 1000 * 1e6:.1f} µs")
+
+    engine.on_escalate = lambda ticket: None
+    now[0] += 20 * 60
+    start = time.perf_counter()
+    escalated = engine.escalate_overdue()
+    print(f"{len(escalated)} critical tickets breached their SLA, handled in {(time.perf_counter() - start) * 1000:.1f} ms")
+    now[0] += 20 * 60
+    print(f"breached again 20 minutes later: {len(engine.escalate_overdue())}")
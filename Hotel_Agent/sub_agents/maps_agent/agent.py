@@ -1,23 +1,41 @@
 import os
+import sys
 from google.adk.agents import Agent
-from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, StdioServerParameters
+from google.adk.tools.mcp_tool import StdioConnectionParams
+from mcp import StdioServerParameters
 from Hotel_Agent.prompts import PROMPTS
+from Hotel_Agent.sub_agents.maps_agent.tool_cache import ToolResultCache, prefetch_calls
+from Hotel_Agent.sub_agents.maps_agent.toolset import PersistentMCPToolset
 
 
+if os.getenv("TOMTOM_MCP_FAKE"):
+    # Offline development: deterministic local server, no API key needed
+    server_params = StdioServerParameters(
+        command=sys.executable,
+        args=["-m", "Hotel_Agent.sub_agents.maps_agent.fake_tomtom_mcp"],
+    )
+else:
+    server_params = StdioServerParameters(
+        command='npx',
+        args=["-y", "@tomtom-org/tomtom-mcp"],
+        env={"TOMTOM_API_KEY": os.getenv("TOMTOM_API_KEY", "")},
+    )
+
+# One TomTom MCP server for the whole app; call maps_toolset.start() at startup
+# so it is running before the first directions request. Geocoding and routing
+# results are cached, and the common destinations are looked up right away.
+maps_toolset = PersistentMCPToolset(
+    StdioConnectionParams(server_params=server_params, timeout=20),
+    name="TomTom",
+    cache=ToolResultCache(),
+    prefetch=prefetch_calls(),
+)
+
 maps_agent = Agent(
     name="maps_agent",
-    model="gemini-2-0-flash",
+    model="gemini-2.0-flash",
     description="An agent that helps customer to reach our hotel.",
     instruction=PROMPTS["maps_agent"],
 
-    tools=[
-        MCPToolset(
-            connection_params=StdioServerParameters(
-                command='npx',
-                args=["-y", "@tomtom-org/tomtom-mcp"],
-                env={"TOMTOM_API_KEY": os.getenv("TOMTOM_API_KEY", "")},
-                timeout=20
-            ),
-        )
-    ],
-)
\ No newline at end of file
+    tools=[maps_toolset],
+)
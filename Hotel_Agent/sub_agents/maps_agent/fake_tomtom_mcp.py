@@ -0,0 +1,78 @@
+"""Offline stand-in for the TomTom MCP server, for tests and cache measurements.
+
+Serves the geocoding, routing and traffic tools over stdio with deterministic
+answers and a fixed delay per call, so hit rates and latencies are repeatable:
+
+    python -m Hotel_Agent.sub_agents.maps_agent.fake_tomtom_mcp
+    FAKE_TOMTOM_LATENCY=0.3 python -m ...   # seconds per call (default 0.2)
+    FAKE_TOMTOM_PID_FILE=/tmp/tomtom.pid ...  # where tests find the process to kill
+
+Set TOMTOM_MCP_FAKE=1 to have maps_agent start this server instead of npx.
+"""
+import hashlib
+import math
+import os
+import time
+from typing import Dict
+
+from mcp.server.fastmcp import FastMCP # type: ignore
+
+from Hotel_Agent.sub_agents.maps_agent.tool_cache import COMMON_DESTINATIONS
+
+LATENCY = float(os.getenv("FAKE_TOMTOM_LATENCY", "0.2"))
+# Unknown places land somewhere in this box around Alexandria
+AREA = ((31.10, 29.80), (31.30, 30.05))
+
+server = FastMCP("fake-tomtom")
+calls = 0
+
+
+def _lookup(query: str):
+    for name, position in COMMON_DESTINATIONS.items():
+        if query.casefold() in name.casefold():
+            return name, position
+    digest = hashlib.sha256(query.casefold().encode()).digest()
+    (south, west), (north, east) = AREA
+    return query, (round(south + (north - south) * digest[0] / 255, 6),
+                   round(west + (east - west) * digest[1] / 255, 6))
+
+
+def _distance_km(origin: Dict[str, float], destination: Dict[str, float]) -> float:
+    dlat = (destination["lat"] - origin["lat"]) * 111.0
+    dlon = (destination["lon"] - origin["lon"]) * 111.0 * math.cos(math.radians(origin["lat"]))
+    return math.hypot(dlat, dlon)
+
+
+def _served() -> int:
+    global calls
+    time.sleep(LATENCY)
+    calls += 1
+    return calls
+
+
+@server.tool(name="tomtom-geocode")
+def geocode(query: str) -> dict:
+    """Convert an address or place name to coordinates."""
+    name, (lat, lon) = _lookup(query)
+    return {"results": [{"address": name, "position": {"lat": lat, "lon": lon}}], "call": _served()}
+
+
+@server.tool(name="tomtom-routing")
+def routing(origin: Dict[str, float], destination: Dict[str, float]) -> dict:
+    """Driving route between two coordinates."""
+    km = _distance_km(origin, destination) * 1.3
+    return {"routes": [{"summary": {"lengthInMeters": int(km * 1000), "travelTimeInSeconds": int(km / 30 * 3600)}}],
+            "call": _served()}
+
+
+@server.tool(name="tomtom-traffic")
+def traffic(bbox: str) -> dict:
+    """Traffic incidents in a bounding box."""
+    return {"incidents": [], "call": _served()}
+
+
+if __name__ == "__main__":
+    if os.getenv("FAKE_TOMTOM_PID_FILE"):
+        with open(os.environ["FAKE_TOMTOM_PID_FILE"], "w") as f:
+            f.write(str(os.getpid()))
+    server.run()
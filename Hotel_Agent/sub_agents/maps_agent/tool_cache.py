@@ -0,0 +1,198 @@
+import json
+import re
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from Hotel_Agent.prompts import HOTEL_LOCATION, HOTEL_NAME
+
+# Seconds a result stays valid per TomTom MCP tool. Places barely move, routes
+# follow traffic; tools not listed here (traffic, maps) are never cached.
+TOOL_TTLS = {
+    "tomtom-geocode": 24 * 3600,
+    "tomtom-reverse-geocode": 24 * 3600,
+    "tomtom-fuzzy-search": 6 * 3600,
+    "tomtom-poi-search": 6 * 3600,
+    "tomtom-nearby": 3600,
+    "tomtom-routing": 600,
+    "tomtom-waypoint-routing": 600,
+    "tomtom-reachable-range": 600,
+}
+# Where guests ask to go most, as (lat, lon); the hotel first
+COMMON_DESTINATIONS = {
+    HOTEL_NAME: HOTEL_LOCATION,
+    "Misr Railway Station, Alexandria": (31.1925, 29.9062),
+    "Borg El Arab Airport": (30.9177, 29.6964),
+    "Bibliotheca Alexandrina": (31.2089, 29.9092),
+    "Citadel of Qaitbay": (31.2140, 29.8856),
+    "Montaza Palace": (31.2886, 30.0158),
+}
+# 4 decimal places is about 11 m: the same street corner, the same route
+COORDINATE_DIGITS = 4
+COORDINATE_PAIR = re.compile(r"^\s*(-?\d+\.\d+)\s*,\s*(-?\d+\.\d+)\s*$")
+
+
+def normalize_args(value: Any) -> Any:
+    """Arguments in a canonical form for cache keys: case and spacing of text
+    ignored, float coordinates (also "lat,lon" strings) rounded, dict order ignored."""
+    if isinstance(value, dict):
+        return {key: normalize_args(item) for key, item in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [normalize_args(item) for item in value]
+    if isinstance(value, float):
+        return round(value, COORDINATE_DIGITS)
+    if isinstance(value, str):
+        pair = COORDINATE_PAIR.match(value)
+        if pair:
+            return ",".join(str(round(float(number), COORDINATE_DIGITS)) for number in pair.groups())
+        return " ".join(value.casefold().split())
+    return value
+
+
+def is_error_result(result: Any) -> bool:
+    """MCP results flag errors as isError, on the CallToolResult or, once
+    serialized by the tool, as a key of the dict."""
+    if isinstance(result, dict):
+        return bool(result.get("isError") or result.get("is_error"))
+    return bool(getattr(result, "isError", False))
+
+
+def prefetch_calls(destinations: Dict[str, Tuple[float, float]] = COMMON_DESTINATIONS) -> List[Tuple[str, dict]]:
+    """Geocodes every destination and routes from each to the first (the hotel)."""
+    (hotel_lat, hotel_lon), *others = destinations.values()
+    calls = [("tomtom-geocode", {"query": name}) for name in destinations]
+    calls += [
+        ("tomtom-routing", {"origin": {"lat": lat, "lon": lon}, "destination": {"lat": hotel_lat, "lon": hotel_lon}})
+        for lat, lon in others
+    ]
+    return calls
+
+
+class ToolResultCache:
+    """TTL + LRU cache of MCP tool results keyed on (tool, normalized arguments).
+
+    Only successful results of tools with a TTL are stored. Hit rates and the
+    call time saved are tracked per tool.
+    """
+
+    def __init__(self, ttls: Dict[str, float] = TOOL_TTLS, max_entries: int = 512, clock=time.monotonic):
+        self.ttls = ttls
+        self.max_entries = max_entries
+        self.clock = clock
+        # key -> (result, expires_at)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, float]]" = OrderedDict()
+        self.hits: Dict[str, int] = defaultdict(int)
+        self.misses: Dict[str, int] = defaultdict(int)
+        self.call_seconds: Dict[str, float] = defaultdict(float)
+        self.expired = 0
+        self.evicted = 0
+
+    def cacheable(self, tool_name: str) -> bool:
+        return self.ttls.get(tool_name, 0) > 0
+
+    @staticmethod
+    def key(tool_name: str, args: dict) -> Tuple[str, str]:
+        return tool_name, json.dumps(normalize_args(args or {}), ensure_ascii=False)
+
+    def get(self, tool_name: str, args: dict) -> Optional[Any]:
+        if not self.cacheable(tool_name):
+            return None
+        key = self.key(tool_name, args)
+        entry = self._entries.get(key)
+        if entry is not None:
+            result, expires_at = entry
+            if self.clock() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits[tool_name] += 1
+                return result
+            del self._entries[key]
+            self.expired += 1
+        self.misses[tool_name] += 1
+        return None
+
+    def put(self, tool_name: str, args: dict, result: Any, seconds: float = 0.0):
+        """Stores a fresh result; seconds is how long the real call took."""
+        if not self.cacheable(tool_name):
+            return
+        self.call_seconds[tool_name] += seconds
+        if is_error_result(result):
+            return
+        key = self.key(tool_name, args)
+        self._entries[key] = (result, self.clock() + self.ttls[tool_name])
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evicted += 1
+
+    def stats(self) -> dict:
+        hits = sum(self.hits.values())
+        lookups = hits + sum(self.misses.values())
+        saved = sum(
+            self.hits[tool] * self.call_seconds[tool] / self.misses[tool]
+            for tool in self.hits if self.misses[tool]
+        )
+        return {
+            "entries": len(self._entries),
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "tools": {
+                tool: {"hits": self.hits[tool], "misses": self.misses[tool]}
+                for tool in sorted(set(self.hits) | set(self.misses))
+            },
+            "expired": self.expired,
+            "evicted": self.evicted,
+            # Each hit saves about the average real call of its tool
+            "est_saved_ms": saved * 1000,
+        }
+
+
+if __name__ == "__main__":
+    import asyncio
+    import random
+    import sys
+
+    from google.adk.tools.mcp_tool import StdioConnectionParams # type: ignore
+    from mcp import StdioServerParameters # type: ignore
+
+    from Hotel_Agent.sub_agents.maps_agent.toolset import PersistentMCPToolset
+
+    # Guest lookups against the fake server: destinations drawn with a skew
+    # towards the popular ones, origins jittered by a few meters as GPS fixes are
+    def workload(rng: random.Random, n: int) -> List[Tuple[str, dict]]:
+        names = list(COMMON_DESTINATIONS) + [f"Restaurant {i}" for i in range(30)]
+        weights = [1 / (rank + 1) for rank in range(len(names))]
+        (hotel_lat, hotel_lon), *_ = COMMON_DESTINATIONS.values()
+        calls = []
+        for name in rng.choices(names, weights, k=n):
+            if rng.random() < 0.5:
+                calls.append(("tomtom-geocode", {"query": rng.choice([name, name.upper(), f"  {name} "])}))
+            else:
+                lat, lon = COMMON_DESTINATIONS.get(name, (31.2, 29.95))
+                calls.append(("tomtom-routing", {
+                    "origin": {"lat": lat + rng.uniform(-2e-5, 2e-5), "lon": lon + rng.uniform(-2e-5, 2e-5)},
+                    "destination": {"lat": hotel_lat, "lon": hotel_lon},
+                }))
+        return calls
+
+    async def run(cache: Optional[ToolResultCache], calls: List[Tuple[str, dict]]):
+        params = StdioServerParameters(command=sys.executable,
+                                       args=["-m", "Hotel_Agent.sub_agents.maps_agent.fake_tomtom_mcp"],
+                                       env={"FAKE_TOMTOM_LATENCY": "0.05"})
+        toolset = PersistentMCPToolset(StdioConnectionParams(server_params=params, timeout=20), name="fake TomTom",
+                                       cache=cache)
+        toolset.start()
+        tools = {tool.name: tool for tool in await toolset.get_tools()}
+        if cache:
+            await toolset.prefetch(prefetch_calls())
+        start = time.perf_counter()
+        for name, args in calls:
+            await tools[name].run_async(args=args, tool_context=None)
+        elapsed = time.perf_counter() - start
+        print(f"{'cached' if cache else 'uncached'}: {len(calls)} lookups in {elapsed:.2f}s "
+              f"({elapsed / len(calls) * 1000:.1f} ms each)")
+        if cache:
+            print(cache.stats())
+        await toolset.close()
+
+    calls = workload(random.Random(0), 200)
+    asyncio.run(run(None, calls))
+    asyncio.run(run(ToolResultCache(), calls))
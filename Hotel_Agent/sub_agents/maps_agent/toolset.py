@@ -0,0 +1,241 @@
+import asyncio
+import time
+from collections import defaultdict, deque
+from contextlib import AsyncExitStack
+from datetime import timedelta
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+import anyio # type: ignore
+import numpy as np
+from google.adk.agents.readonly_context import ReadonlyContext # type: ignore
+from google.adk.tools.base_tool import BaseTool # type: ignore
+from google.adk.tools.base_toolset import BaseToolset # type: ignore
+from google.adk.tools.mcp_tool import MCPTool, StdioConnectionParams # type: ignore
+from google.adk.tools.tool_context import ToolContext # type: ignore
+from mcp import ClientSession # type: ignore
+from mcp.client.stdio import stdio_client # type: ignore
+from mcp.shared.exceptions import McpError # type: ignore
+from mcp.types import CONNECTION_CLOSED # type: ignore
+
+from Hotel_Agent.sub_agents.maps_agent.tool_cache import ToolResultCache
+
+# Errors that mean the server process or its pipes are gone
+CONNECTION_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream, ConnectionError)
+
+
+def is_connection_error(error: Exception) -> bool:
+    """Whether a failed call means the session is dead, rather than the call failing."""
+    if isinstance(error, McpError):
+        # Requests pending when the server exits fail with CONNECTION_CLOSED
+        return error.error.code == CONNECTION_CLOSED
+    return isinstance(error, CONNECTION_ERRORS)
+
+
+class SupervisedMCPTool(MCPTool):
+    """MCPTool that answers from its toolset's cache when it can, and reports
+    its latency and a dead connection to the toolset. A call that finds the
+    server dead is retried once on the restarted server."""
+
+    def __init__(self, toolset: "PersistentMCPToolset", **kwargs):
+        super().__init__(mcp_session_manager=toolset, **kwargs)
+        self._toolset = toolset
+
+    async def run_async(self, *, args, tool_context: ToolContext):
+        cache = self._toolset.cache
+        if cache:
+            cached = cache.get(self.name, args)
+            if cached is not None:
+                return cached
+
+        for attempt in range(2):
+            session = await self._toolset.create_session()
+            start = time.perf_counter()
+            try:
+                result = await super().run_async(args=args, tool_context=tool_context)
+                break
+            except Exception as e:
+                if attempt or not is_connection_error(e):
+                    raise
+                self._toolset.restart(session)
+            finally:
+                elapsed = time.perf_counter() - start
+                self._toolset.call_latencies[self.name].append(elapsed)
+        if hasattr(result, "model_dump"):
+            # As plain JSON, so the result reads the same in memory and in a
+            # session restored from storage
+            result = result.model_dump(mode="json", exclude_none=True)
+        if cache:
+            cache.put(self.name, args, result, elapsed)
+        return result
+
+
+class PersistentMCPToolset(BaseToolset):
+    """MCP toolset whose server process is started ahead of the first request
+    and kept alive for the life of the app.
+
+    MCPToolset connects on the first tool listing, i.e. inside the first guest
+    turn that reaches the agent, and lists tools again on every model call. Here
+    a supervisor task starts the server and lists its tools once in the
+    background (start()), pings it every health_interval seconds and restarts
+    it with backoff when it dies or stops answering. Tools wait for a running
+    server instead of failing, so a restart is invisible to the agent apart
+    from latency. The session is opened and closed in the supervisor task, as
+    the MCP client's task groups require.
+
+    With a cache, repeated lookups are answered locally, and the prefetch calls
+    (tool name, arguments) are made once in the background after start().
+    """
+
+    def __init__(self, connection_params: StdioConnectionParams, tool_filter=None, name: str = "mcp",
+                 health_interval: float = 30.0, startup_timeout: float = 60.0, max_backoff: float = 30.0,
+                 cache: Optional[ToolResultCache] = None, prefetch: Sequence[Tuple[str, dict]] = ()):
+        super().__init__(tool_filter=tool_filter)
+        self.connection_params = connection_params
+        self.name = name
+        self.health_interval = health_interval
+        self.startup_timeout = startup_timeout
+        self.max_backoff = max_backoff
+        self.cache = cache
+        self.prefetch_calls = list(prefetch)
+        self._prefetching: Optional[asyncio.Task] = None
+        self._session: Optional[ClientSession] = None
+        self._tools: List[SupervisedMCPTool] = []
+        self._ready: Optional[asyncio.Event] = None
+        self._restart: Optional[asyncio.Event] = None
+        self._supervisor: Optional[asyncio.Task] = None
+        self.starts = 0
+        self.restarts = 0
+        self.startup_seconds: Optional[float] = None
+        self.call_latencies: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=1000))
+
+    def start(self):
+        """Starts the server in the background; must be called from the event loop."""
+        if self._supervisor and not self._supervisor.done():
+            return
+        self._ready = asyncio.Event()
+        self._restart = asyncio.Event()
+        self._supervisor = asyncio.create_task(self._supervise())
+        if self.cache and self.prefetch_calls and self._prefetching is None:
+            self._prefetching = asyncio.create_task(self.prefetch(self.prefetch_calls))
+
+    def restart(self, session: Optional[ClientSession] = None):
+        """Asks the supervisor to replace the server process. Given the session
+        a call failed on, only if that is still the live one, so calls that hit
+        the same dead server restart it once."""
+        if session is not None and session is not self._session:
+            return
+        if self._restart:
+            # Callers wait for the new session instead of getting the dead one
+            self._session = None
+            self._ready.clear()
+            self._restart.set()
+
+    async def create_session(self, headers: Optional[dict] = None) -> ClientSession:
+        """The live session, waiting for (re)start if needed. Named after
+        MCPSessionManager.create_session so MCPTool can use this toolset as its
+        session manager."""
+        self.start()
+        session = self._session
+        if session is None:
+            try:
+                await asyncio.wait_for(self._wait_ready(), self.startup_timeout)
+            except asyncio.TimeoutError:
+                raise ConnectionError(f"{self.name} MCP server did not start within {self.startup_timeout:.0f}s")
+            session = self._session
+        return session
+
+    async def get_tools(self, readonly_context: Optional[ReadonlyContext] = None) -> List[BaseTool]:
+        await self.create_session()
+        return [tool for tool in self._tools if self._is_tool_selected(tool, readonly_context)]
+
+    async def prefetch(self, calls: Sequence[Tuple[str, dict]]):
+        """Makes the given calls once to warm the cache, e.g. geocoding the
+        hotel and the landmarks guests ask about most."""
+        tools = {tool.name: tool for tool in await self.get_tools()}
+        start = time.perf_counter()
+        for name, args in calls:
+            if name not in tools:
+                print(f"⚠️ {self.name} MCP server has no tool {name} to prefetch")
+                continue
+            try:
+                await tools[name].run_async(args=args, tool_context=None)
+            except Exception as e:
+                print(f"⚠️ Prefetching {name} {args} failed: {e!r}")
+        print(f"🗺️ Prefetched {len(calls)} {self.name} lookups in {time.perf_counter() - start:.2f}s")
+
+    async def close(self):
+        if self._prefetching:
+            self._prefetching.cancel()
+            await asyncio.gather(self._prefetching, return_exceptions=True)
+        if self._supervisor:
+            self._supervisor.cancel()
+            await asyncio.gather(self._supervisor, return_exceptions=True)
+            self._supervisor = None
+
+    def stats(self) -> dict:
+        calls = {}
+        for name, latencies in self.call_latencies.items():
+            if latencies:
+                ms = np.array(latencies) * 1000
+                calls[name] = {"count": len(ms), "p50_ms": float(np.percentile(ms, 50)),
+                               "p95_ms": float(np.percentile(ms, 95))}
+        return {
+            "running": self._session is not None,
+            "starts": self.starts,
+            "restarts": self.restarts,
+            "startup_ms": self.startup_seconds * 1000 if self.startup_seconds is not None else None,
+            "calls": calls,
+            "cache": self.cache.stats() if self.cache else None,
+        }
+
+    async def _wait_ready(self):
+        # A restart clears _ready after we looked at the session, so re-check
+        while self._session is None:
+            await self._ready.wait()
+
+    async def _supervise(self):
+        backoff = 1.0
+        while True:
+            self._restart.clear()
+            try:
+                async with AsyncExitStack() as stack:
+                    start = time.perf_counter()
+                    read, write = await stack.enter_async_context(stdio_client(self.connection_params.server_params))
+                    session = await stack.enter_async_context(ClientSession(
+                        read, write, read_timeout_seconds=timedelta(seconds=self.connection_params.timeout)))
+                    await session.initialize()
+                    listed = await session.list_tools()
+                    self._tools = [SupervisedMCPTool(self, mcp_tool=tool) for tool in listed.tools]
+                    self.startup_seconds = time.perf_counter() - start
+                    self.starts += 1
+                    self._session = session
+                    self._ready.set()
+                    print(f"🗺️ {self.name} MCP server ready in {self.startup_seconds:.2f}s "
+                          f"with {len(self._tools)} tools")
+                    backoff = 1.0
+                    await self._watch(session)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ {self.name} MCP server failed: {e!r}")
+            finally:
+                self._session = None
+                self._ready.clear()
+            self.restarts += 1
+            print(f"🔄 Restarting {self.name} MCP server in {backoff:.0f}s")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    async def _watch(self, session: ClientSession):
+        """Returns once the server stops answering pings or a restart is requested."""
+        while True:
+            try:
+                await asyncio.wait_for(self._restart.wait(), self.health_interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await asyncio.wait_for(session.send_ping(), self.connection_params.timeout)
+            except Exception as e:
+                print(f"⚠️ {self.name} MCP server health check failed: {e!r}")
+                return
@@ -1,21 +1,82 @@
+import io
 import os
+import time
+import asyncio
 import queue
 import threading
-import tempfile
 from abc import ABC, abstractmethod
-from typing import Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from math import gcd
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple, Union
 import sounddevice as sd # type: ignore
 import scipy.io.wavfile as wav # type: ignore
+from scipy.signal import resample_poly # type: ignore
 import numpy as np
+import hashlib
 import json
-import string
 
 # GCP
 import subprocess
 from google.cloud import speech
 
 # Groq
-from groq import Groq # type: ignore
+from groq import Groq, AsyncGroq # type: ignore
+
+from arabic_text import remove_punctuation
+
+# A WAV/audio file path, or an int16 sample buffer
+AudioInput = Union[str, np.ndarray]
+TARGET_FS = 16000
+
+
+def read_audio(audio_path: str) -> Tuple[np.ndarray, int]:
+    """Reads an audio file into memory, returning (samples, sample_rate)."""
+    try:
+        fs, samples = wav.read(audio_path)
+        return samples, fs
+    except ValueError:
+        # Not a WAV scipy can parse (mp3, ogg, ...): decode through ffmpeg's
+        # stdout instead of a temp file
+        decoded = subprocess.run([
+            "ffmpeg", "-v", "error",
+            "-i", audio_path,
+            "-ac", "1",           # Mono
+            "-ar", str(TARGET_FS),
+            "-f", "s16le", "-"    # Raw PCM on stdout
+        ], check=True, capture_output=True).stdout
+        return np.frombuffer(decoded, dtype=np.int16), TARGET_FS
+
+
+def to_linear16(samples: np.ndarray, fs: int, target_fs: int = TARGET_FS) -> np.ndarray:
+    """Converts samples to mono int16 at target_fs, doing nothing when they
+    already are."""
+    if samples.dtype != np.int16:
+        # Rescale other WAV sample formats to the int16 range
+        if samples.dtype == np.uint8:
+            samples = (samples.astype(np.float32) - 128) * 256
+        elif samples.dtype == np.int32:
+            samples = samples.astype(np.float32) / 65536
+        elif np.issubdtype(samples.dtype, np.floating):
+            samples = samples * 32767
+
+    if samples.ndim > 1:
+        samples = samples.reshape(-1) if samples.shape[1] == 1 else samples.mean(axis=1)
+
+    if fs != target_fs:
+        factor = gcd(fs, target_fs)
+        samples = resample_poly(samples.astype(np.float32), target_fs // factor, fs // factor)
+
+    if samples.dtype == np.int16:
+        return samples
+    return np.clip(samples, -32768, 32767).astype(np.int16)
+
+
+def load_linear16(audio: AudioInput, fs: int = TARGET_FS) -> np.ndarray:
+    """Returns 16 kHz mono int16 samples for a path or an in-memory buffer."""
+    if isinstance(audio, str):
+        audio, fs = read_audio(audio)
+    return to_linear16(np.asarray(audio), fs)
 
 
 class STTStrategy(ABC):
@@ -25,51 +86,127 @@ class STTStrategy(ABC):
         pass
 
     @abstractmethod
-    def transcribe(self, audio_path: str) -> str:
-        """Transcribes a given WAV file and returns the text."""
+    def transcribe(self, audio: AudioInput, fs: int = TARGET_FS) -> str:
+        """Transcribes a WAV file path or an int16 buffer sampled at fs and
+        returns the text."""
         pass
 
+    async def transcribe_async(self, audio: AudioInput, fs: int = TARGET_FS) -> str:
+        """Async variant of transcribe. Strategies without a native async
+        client run the blocking call on the default executor."""
+        return await asyncio.to_thread(self.transcribe, audio, fs)
+
+    def transcribe_stream(self, frames: Iterable[np.ndarray], fs: int = TARGET_FS,
+                          on_interim: Optional[Callable[[str], None]] = None,
+                          chunk_seconds: float = 4.0, overlap_seconds: float = 1.0) -> str:
+        """Transcribes int16 frames as they arrive.
+
+        Providers without a streaming API fall back to transcribing overlapping
+        chunks while recording continues, so only the last chunk is left to
+        transcribe once the frames run out.
+        """
+        window = int(fs * chunk_seconds)
+        overlap = int(fs * overlap_seconds)
+        carry = np.zeros(0, dtype=np.int16)
+        pending: List[np.ndarray] = []
+        buffered = 0
+        text = ""
+
+        for frame in frames:
+            frame = np.asarray(frame, dtype=np.int16).reshape(-1)
+            pending.append(frame)
+            buffered += len(frame)
+            if buffered < window:
+                continue
+
+            audio = np.concatenate(pending)
+            segment = np.concatenate([carry, audio[:window]])
+            rest = audio[window:]
+            pending = [rest] if len(rest) else []
+            buffered = len(rest)
+
+            text = merge_transcripts(text, self.transcribe(segment, fs))
+            carry = segment[-overlap:] if overlap else np.zeros(0, dtype=np.int16)
+            if on_interim:
+                on_interim(text)
+
+        if buffered:
+            segment = np.concatenate([carry] + pending)
+            text = merge_transcripts(text, self.transcribe(segment, fs))
+        return text
+
 
 class GCP_STT(STTStrategy):
-    def __init__(self):
+    def __init__(self, language_code="ar-SA"):
         self.client = speech.SpeechClient()
+        # gRPC aio clients bind to the running event loop, so this one is
+        # created on first use
+        self.async_client = None
+        self.language_code = language_code
 
     @property
     def name(self) -> str:
         return "GCP_STT"
     
-    def convert_to_linear16(self, input_path: str, output_path: str):
-        subprocess.run([
-            "ffmpeg", "-y",
-            "-i", input_path,
-            "-ac", "1",           # Mono
-            "-ar", "16000",       # 16kHz
-            "-f", "wav",          # WAV format
-            output_path
-        ], check=True)
+    def transcribe(self, audio: AudioInput, fs: int = TARGET_FS) -> str:
+        samples = load_linear16(audio, fs)
+
+        audio = speech.RecognitionAudio(content=samples.tobytes())
+        config = self.recognition_config(TARGET_FS)
 
-    def transcribe(self, audio_path: str) -> str:
-        converted_path = tempfile.NamedTemporaryFile(suffix=".wav", delete=False).name
-        self.convert_to_linear16(audio_path, converted_path)
+        response = self.client.recognize(config=config, audio=audio)
+        results = [result.alternatives[0].transcript for result in response.results]
+        return " ".join(results)
 
-        with open(converted_path, "rb") as f:
-            content = f.read()
+    async def transcribe_async(self, audio: AudioInput, fs: int = TARGET_FS) -> str:
+        # File reads and resampling are blocking, the request itself is not
+        samples = await asyncio.to_thread(load_linear16, audio, fs)
+        if self.async_client is None:
+            self.async_client = speech.SpeechAsyncClient()
 
-        audio = speech.RecognitionAudio(content=content)
-        config = speech.RecognitionConfig(
-            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-            sample_rate_hertz=16000,
-            language_code="ar-SA",
+        response = await self.async_client.recognize(
+            config=self.recognition_config(TARGET_FS),
+            audio=speech.RecognitionAudio(content=samples.tobytes()),
         )
-
-        response = self.client.recognize(config=config, audio=audio)
         results = [result.alternatives[0].transcript for result in response.results]
         return " ".join(results)
 
+    def recognition_config(self, fs: int) -> speech.RecognitionConfig:
+        return speech.RecognitionConfig(
+            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+            sample_rate_hertz=fs,
+            language_code=self.language_code,
+        )
+
+    def transcribe_stream(self, frames: Iterable[np.ndarray], fs: int = TARGET_FS,
+                          on_interim: Optional[Callable[[str], None]] = None, **kwargs) -> str:
+        streaming_config = speech.StreamingRecognitionConfig(
+            config=self.recognition_config(fs),
+            interim_results=True,
+        )
+        requests = (
+            speech.StreamingRecognizeRequest(audio_content=np.asarray(frame, dtype=np.int16).tobytes())
+            for frame in frames
+        )
+        responses = self.client.streaming_recognize(config=streaming_config, requests=requests)
+
+        final_parts = []
+        for response in responses:
+            for result in response.results:
+                if not result.alternatives:
+                    continue
+                transcript = result.alternatives[0].transcript
+                if result.is_final:
+                    final_parts.append(transcript.strip())
+                elif on_interim:
+                    on_interim(" ".join(final_parts + [transcript.strip()]))
+        return " ".join(final_parts)
+
 
 class GroqWhisper_STT(STTStrategy):
     def __init__(self, model='whisper-large-v3'):
         self.client = Groq()
+        self.async_client = AsyncGroq()
         self.model = model
         # self.prompt = "محادثة باللغة العربية بين موظف استقبال فندق وزبون، تتعلق بخدمة العملاء..."
         self.prompt = "Arabic speech related to hotel customer service"
@@ -78,17 +215,286 @@ class GroqWhisper_STT(STTStrategy):
     def name(self) -> str:
         return "GroqWhisper_STT"
     
-    def transcribe(self, audio_path: str) -> str:
-        with open(audio_path, "rb") as f:
-            transcription = self.client.audio.transcriptions.create(
-                file=f,
-                model=self.model,
-                prompt=self.prompt,
-                language="ar",
-                temperature=0.0
-            )
+    def transcribe(self, audio: AudioInput, fs: int = TARGET_FS) -> str:
+        transcription = self.client.audio.transcriptions.create(
+            file=self._upload_file(audio, fs),
+            model=self.model,
+            prompt=self.prompt,
+            language="ar",
+            temperature=0.0
+        )
+        return transcription.text
+
+    async def transcribe_async(self, audio: AudioInput, fs: int = TARGET_FS) -> str:
+        file = await asyncio.to_thread(self._upload_file, audio, fs)
+        transcription = await self.async_client.audio.transcriptions.create(
+            file=file,
+            model=self.model,
+            prompt=self.prompt,
+            language="ar",
+            temperature=0.0
+        )
         return transcription.text
 
+    def _upload_file(self, audio: AudioInput, fs: int) -> Tuple[str, bytes]:
+        if isinstance(audio, str):
+            with open(audio, "rb") as f:
+                return os.path.basename(audio), f.read()
+
+        # Upload an in-memory WAV instead of writing one to disk
+        buffer = io.BytesIO()
+        wav.write(buffer, TARGET_FS, to_linear16(np.asarray(audio), fs))
+        return "audio.wav", buffer.getvalue()
+
+
+class HedgedSTT(STTStrategy):
+    """Races two STT strategies on the same audio.
+
+    The historically faster strategy goes first. The other one is only fired if
+    no acceptable transcript has arrived after the hedge delay, which tracks a
+    high percentile of the first strategy's recent latency. The first acceptable
+    transcript wins and the other request is cancelled.
+    """
+
+    def __init__(self, primary: STTStrategy, secondary: STTStrategy, deadline: float = 10.0,
+                 hedge_percentile: float = 90, min_hedge_delay: float = 0.3,
+                 max_hedge_delay: float = 3.0, window: int = 50,
+                 accept: Callable[[str], bool] = lambda text: bool(text and text.strip())):
+        self.strategies = [primary, secondary]
+        self.deadline = deadline
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_delay = min_hedge_delay
+        self.max_hedge_delay = max_hedge_delay
+        self.accept = accept
+        self.latencies: Dict[str, Deque[float]] = {s.name: deque(maxlen=window) for s in self.strategies}
+        self.wins: Dict[str, int] = {s.name: 0 for s in self.strategies}
+        self.hedges = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedged-stt")
+
+    @property
+    def name(self) -> str:
+        return f"Hedged({self.strategies[0].name},{self.strategies[1].name})"
+
+    def ordered(self) -> List[STTStrategy]:
+        """Strategies sorted by recent median latency, unmeasured ones last."""
+        def median(strategy):
+            samples = self.latencies[strategy.name]
+            return float(np.median(samples)) if samples else float("inf")
+        with self._lock:
+            return sorted(self.strategies, key=median)
+
+    def hedge_delay(self, strategy: STTStrategy) -> float:
+        with self._lock:
+            samples = list(self.latencies[strategy.name])
+        if len(samples) < 5:
+            return self.max_hedge_delay
+        delay = float(np.percentile(samples, self.hedge_percentile))
+        return min(max(delay, self.min_hedge_delay), self.max_hedge_delay)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "wins": dict(self.wins),
+                "hedges": self.hedges,
+                "latency_p50": {name: float(np.median(v)) if v else None for name, v in self.latencies.items()},
+            }
+
+    def _record(self, strategy: STTStrategy, seconds: float):
+        # Cancelled requests are recorded too, as a lower bound on their latency,
+        # so a browned-out provider does not look fast just because it always loses
+        with self._lock:
+            self.latencies[strategy.name].append(seconds)
+
+    def _won(self, strategy: STTStrategy, hedged: bool):
+        with self._lock:
+            self.wins[strategy.name] += 1
+            self.hedges += int(hedged)
+
+    def transcribe(self, audio: AudioInput, fs: int = TARGET_FS) -> str:
+        first, second = self.ordered()
+        start = time.perf_counter()
+        delay = self.hedge_delay(first)
+
+        def timed(strategy):
+            launched = time.perf_counter()
+            try:
+                return strategy.transcribe(audio, fs)
+            finally:
+                self._record(strategy, time.perf_counter() - launched)
+
+        futures = {self._executor.submit(timed, first): first}
+        pending = set(futures)
+        hedged = False
+        errors = []
+        while True:
+            remaining = self.deadline - (time.perf_counter() - start)
+            if remaining <= 0:
+                break
+            timeout = remaining if hedged else min(remaining, max(delay - (time.perf_counter() - start), 0))
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    text = future.result()
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                if self.accept(text):
+                    for other in pending:
+                        # A request already running in a thread cannot be
+                        # interrupted; its result is simply ignored
+                        other.cancel()
+                    self._won(futures[future], hedged)
+                    return text
+            if not hedged and (not done or not pending):
+                # Hedge on timeout, or right away if the first provider failed
+                hedged = True
+                hedge = self._executor.submit(timed, second)
+                futures[hedge] = second
+                pending.add(hedge)
+            elif not pending:
+                break
+
+        for future in pending:
+            future.cancel()
+        if errors:
+            raise errors[-1]
+        if len(futures) == 2 and not pending:
+            return ""
+        raise TimeoutError(f"No acceptable transcript within {self.deadline:.1f}s")
+
+    async def transcribe_async(self, audio: AudioInput, fs: int = TARGET_FS) -> str:
+        first, second = self.ordered()
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        delay = self.hedge_delay(first)
+
+        async def timed(strategy):
+            launched = loop.time()
+            try:
+                return await strategy.transcribe_async(audio, fs)
+            finally:
+                self._record(strategy, loop.time() - launched)
+
+        tasks = {asyncio.create_task(timed(first)): first}
+        pending = set(tasks)
+        hedged = False
+        errors = []
+        try:
+            while True:
+                remaining = self.deadline - (loop.time() - start)
+                if remaining <= 0:
+                    break
+                timeout = remaining if hedged else min(remaining, max(delay - (loop.time() - start), 0))
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        errors.append(task.exception())
+                        continue
+                    if self.accept(task.result()):
+                        self._won(tasks[task], hedged)
+                        return task.result()
+                if not hedged and (not done or not pending):
+                    # Hedge on timeout, or right away if the first provider failed
+                    hedged = True
+                    hedge = asyncio.create_task(timed(second))
+                    tasks[hedge] = second
+                    pending.add(hedge)
+                elif not pending:
+                    break
+        finally:
+            # Cancelling the loser aborts its in-flight HTTP/gRPC request
+            for task in pending:
+                task.cancel()
+
+        if errors:
+            raise errors[-1]
+        if len(tasks) == 2 and not pending:
+            return ""
+        raise TimeoutError(f"No acceptable transcript within {self.deadline:.1f}s")
+
+
+class EnergyVAD:
+    """Frame-level voice activity detection from short-time energy and
+    zero-crossing rate, with an adaptive noise floor.
+
+    The noise floor is a low percentile of the energy of every recent frame,
+    speech or not, so it settles on the room's real background within the
+    first block and follows it up or down, even when the starting guess would
+    have classed all of the background as speech."""
+
+    def __init__(self, fs: int = TARGET_FS, frame_ms: int = 20, threshold_db: float = 12.0,
+                 min_energy_db: float = -50.0, max_zcr: float = 0.35,
+                 noise_window_ms: int = 5000, noise_percentile: float = 10.0):
+        self.frame_len = int(fs * frame_ms / 1000)
+        self.threshold_db = threshold_db
+        self.min_energy_db = min_energy_db
+        self.max_zcr = max_zcr
+        self.noise_percentile = noise_percentile
+        self.noise_energies: Deque[float] = deque(maxlen=max(1, noise_window_ms // frame_ms))
+        self.noise_floor_db = -60.0
+
+    def is_speech(self, block: np.ndarray) -> np.ndarray:
+        """Returns one speech/non-speech flag per full frame in the block."""
+        n_frames = len(block) // self.frame_len
+        if n_frames == 0:
+            return np.zeros(0, dtype=bool)
+        frames = block[:n_frames * self.frame_len].reshape(n_frames, self.frame_len).astype(np.float32)
+
+        rms = np.sqrt(np.mean(frames ** 2, axis=1)) / 32768.0
+        energy_db = 20 * np.log10(rms + 1e-10)
+        signs = np.signbit(frames)
+        zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+
+        # Pauses between words keep the low percentile at the background level
+        self.noise_energies.extend(energy_db.tolist())
+        self.noise_floor_db = float(np.percentile(self.noise_energies, self.noise_percentile))
+
+        threshold = max(self.noise_floor_db + self.threshold_db, self.min_energy_db)
+        # High zero-crossing rate at moderate energy is hiss, not voice
+        speech = (energy_db > threshold) & (
+            (zcr < self.max_zcr) | (energy_db > threshold + self.threshold_db)
+        )
+        return speech
+
+
+class AudioRingBuffer:
+    """Preallocated int16 ring buffer addressed by absolute sample index."""
+
+    def __init__(self, capacity: int):
+        self.buffer = np.zeros(capacity, dtype=np.int16)
+        self.capacity = capacity
+        self.total = 0
+
+    def write(self, samples: np.ndarray):
+        samples = samples[-self.capacity:]
+        pos = self.total % self.capacity
+        first = min(len(samples), self.capacity - pos)
+        self.buffer[pos:pos + first] = samples[:first]
+        self.buffer[:len(samples) - first] = samples[first:]
+        self.total += len(samples)
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        start = max(start, self.total - self.capacity, 0)
+        end = min(end, self.total)
+        if end <= start:
+            return np.zeros(0, dtype=np.int16)
+        indices = np.arange(start, end) % self.capacity
+        return self.buffer[indices]
+
+
+def trim_silence(audio: np.ndarray, fs: int = TARGET_FS, pad_ms: int = 150) -> np.ndarray:
+    """Drops leading and trailing silence, keeping pad_ms around the speech."""
+    vad = EnergyVAD(fs)
+    speech = vad.is_speech(audio)
+    if not speech.any():
+        return audio
+    voiced = np.flatnonzero(speech)
+    pad = int(fs * pad_ms / 1000)
+    start = max(voiced[0] * vad.frame_len - pad, 0)
+    end = min((voiced[-1] + 1) * vad.frame_len + pad, len(audio))
+    return audio[start:end]
+
 
 class STTClient:
     def __init__(self, strategy: STTStrategy):
@@ -97,18 +503,18 @@ class STTClient:
     def set_strategy(self, strategy: STTStrategy):
         self.strategy = strategy
 
-    def record_audio(self, fs=16000) -> Optional[str]:
+    def record_audio(self, fs=TARGET_FS, max_seconds=120) -> Optional[np.ndarray]:
         print("🎙️ Press Enter to start recording...")
         input()
         print("🔴 Recording... Press Enter again to stop.")
 
-        q = queue.Queue()
+        ring = AudioRingBuffer(int(fs * max_seconds))
         stop_flag = threading.Event()
         stop_flag.set()
 
         def callback(indata, frames, time, status):
             if stop_flag.is_set():
-                q.put(indata.copy())
+                ring.write(indata[:, 0])
 
         stream = sd.InputStream(
             callback=callback,
@@ -124,82 +530,321 @@ class STTClient:
         stream.close()
         print("🛑 Recording stopped.")
 
-        frames = []
-        while not q.empty():
-            frames.append(q.get())
-
-        if not frames:
+        if ring.total == 0:
             print("⚠️ No audio recorded.")
             return None
 
-        audio = np.concatenate(frames, axis=0)
-        temp_file = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-        wav.write(temp_file.name, fs, audio)
-        return temp_file.name
+        return trim_silence(ring.read(0, ring.total), fs)
+
+    def record_audio_hands_free(self, fs=TARGET_FS, hangover_ms=700, pre_roll_ms=300,
+                                min_onset_ms=60, max_seconds=30, timeout=None) -> Optional[np.ndarray]:
+        """Records one utterance without a keyboard: capture starts on speech
+        onset and stops after hangover_ms of silence."""
+        print("🎙️ Listening for speech...")
+
+        vad = EnergyVAD(fs)
+        ring = AudioRingBuffer(int(fs * (max_seconds + 1)))
+        hangover = int(fs * hangover_ms / 1000)
+        pre_roll = int(fs * pre_roll_ms / 1000)
+        min_onset_frames = max(1, int(min_onset_ms / 1000 * fs) // vad.frame_len)
+        max_samples = int(fs * max_seconds)
+        pad = int(fs * 0.15)
+        utterance = {"start": None, "last_speech": None}
+        done = threading.Event()
+
+        def callback(indata, frames, time, status):
+            if done.is_set():
+                return
+            block = indata[:, 0]
+            block_start = ring.total
+            ring.write(block)
+
+            speech = vad.is_speech(block)
+            voiced = np.flatnonzero(speech)
+            if utterance["start"] is None:
+                if len(voiced) < min_onset_frames:
+                    return
+                utterance["start"] = max(block_start + voiced[0] * vad.frame_len - pre_roll, 0)
+            if len(voiced):
+                utterance["last_speech"] = block_start + (voiced[-1] + 1) * vad.frame_len
+
+            if (ring.total - utterance["last_speech"] >= hangover
+                    or ring.total - utterance["start"] >= max_samples):
+                done.set()
+
+        stream = sd.InputStream(
+            callback=callback,
+            channels=1,
+            samplerate=fs,
+            dtype='int16',
+            blocksize=int(fs * 0.1)  # 100 ms frames
+        )
+        stream.start()
+        done.wait(timeout)
+        stream.stop()
+        stream.close()
 
-    def listen_and_transcribe(self) -> Optional[str]:
-        audio_path = self.record_audio()
-        if not audio_path:
+        if utterance["start"] is None:
+            print("⚠️ No speech detected.")
             return None
-        transcript = self.strategy.transcribe(audio_path)
-        os.remove(audio_path)
-        print(f"Transcribed Text[{self.strategy.name}]:", transcript)
-        return transcript
+        print("🛑 End of speech detected.")
+        return ring.read(utterance["start"], utterance["last_speech"] + pad)
 
+    def listen_and_transcribe_streaming(self, fs=TARGET_FS) -> Optional[str]:
+        """Streams microphone frames to the strategy while the guest is talking."""
+        print("🎙️ Press Enter to start recording...")
+        input()
+        print("🔴 Listening... Press Enter again to stop.")
 
+        q = queue.Queue()
+        stop_flag = threading.Event()
+        result = {}
 
-def remove_punctuation(text):
-    arabic_punctuation = "؟،؛ـ«»…“”"
-    all_punct = string.punctuation + arabic_punctuation
-    translator = str.maketrans('', '', all_punct)
-    return text.translate(translator)
+        def callback(indata, frames, time, status):
+            q.put(indata.copy())
 
+        def frame_source():
+            while True:
+                try:
+                    yield q.get(timeout=0.05)
+                except queue.Empty:
+                    if stop_flag.is_set():
+                        return
 
-def evaluate(json_file_path, audio_dir, client):
-    from jiwer import wer
-    with open(json_file_path, 'r', encoding='utf-8') as f:
-        reference_data = json.load(f)
+        def on_interim(text):
+            print(f"\r… {text}", end="", flush=True)
 
-    total_wer = 0
-    results = []
+        def worker():
+            try:
+                result["text"] = self.strategy.transcribe_stream(frame_source(), fs, on_interim=on_interim)
+            except Exception as e:
+                result["error"] = e
 
-    for item in reference_data:
-        filename = item["filename"]
-        ground_truth = item["transcribed_text"]
-        audio_path = os.path.join(audio_dir, filename)
+        stream = sd.InputStream(
+            callback=callback,
+            channels=1,
+            samplerate=fs,
+            dtype='int16',
+            blocksize=int(fs * 0.1)  # 100 ms frames
+        )
+        transcriber = threading.Thread(target=worker, daemon=True)
+        stream.start()
+        transcriber.start()
 
-        try:
-            prediction = client.transcribe(audio_path)
-            prediction = remove_punctuation(prediction)
-            ground_truth = remove_punctuation(ground_truth)
-            error = wer(ground_truth, prediction)
-            results.append({
-                "filename": filename,
-                "ground_truth": ground_truth,
-                "prediction": prediction,
-                "wer": error
-            })
-
-            total_wer += error
-        except Exception as e:
-            results.append({
-                "filename": filename,
-                "error": str(e)
-            })
-
-    average_wer = total_wer / len([r for r in results if "wer" in r])
+        input()
+        stream.stop()
+        stream.close()
+        stop_flag.set()
+        end_of_speech = time.perf_counter()
+        transcriber.join()
+        print(f"\n🛑 Recording stopped. Final transcript after {(time.perf_counter() - end_of_speech) * 1000:.0f} ms")
+
+        if "error" in result:
+            raise result["error"]
+        transcript = result.get("text")
+        if not transcript:
+            return None
+        print(f"Transcribed Text[{self.strategy.name}]:", transcript)
+        return transcript
 
-    print(f"\n=== Evaluation Results ===")
-    for r in results:
-        if "wer" in r:
-            print(f"{r['filename']}: WER = {r['wer']:.2f}")
+    def listen_and_transcribe(self, fs=TARGET_FS, hands_free=False) -> Optional[str]:
+        if hands_free:
+            audio = self.record_audio_hands_free(fs)
         else:
-            print(f"{r['filename']}: ERROR = {r['error']}")
+            audio = self.record_audio(fs)
+        if audio is None:
+            return None
+        transcript = self.strategy.transcribe(audio, fs)
+        print(f"Transcribed Text[{self.strategy.name}]:", transcript)
+        return transcript
+
+    async def listen_and_transcribe_async(self, fs=TARGET_FS, hands_free=False) -> Optional[str]:
+        """Async variant of listen_and_transcribe. Recording waits on the
+        keyboard or the microphone, so it runs on the default executor."""
+        record = self.record_audio_hands_free if hands_free else self.record_audio
+        audio = await asyncio.to_thread(record, fs)
+        if audio is None:
+            return None
+        transcript = await self.strategy.transcribe_async(audio, fs)
+        print(f"Transcribed Text[{self.strategy.name}]:", transcript)
+        return transcript
 
-    print(f"\nAverage WER: {average_wer:.2f}")
+    async def listen_and_transcribe_streaming_async(self, fs=TARGET_FS) -> Optional[str]:
+        """Async variant of listen_and_transcribe_streaming."""
+        return await asyncio.to_thread(self.listen_and_transcribe_streaming, fs)
+
+
+def merge_transcripts(previous: str, new: str, max_overlap_words: int = 8) -> str:
+    """Appends a transcript of overlapping audio, dropping the words repeated
+    from the end of the previous transcript."""
+    previous_words = previous.split()
+    new_words = new.split()
+    previous_keys = [remove_punctuation(word) for word in previous_words[-max_overlap_words:]]
+    new_keys = [remove_punctuation(word) for word in new_words]
+
+    for k in range(min(len(previous_keys), len(new_keys), max_overlap_words), 0, -1):
+        if previous_keys[-k:] == new_keys[:k]:
+            new_words = new_words[k:]
+            break
+    return " ".join(previous_words + new_words)
+
+
+class RateLimiter:
+    """Spaces calls to a provider at most calls_per_second apart, across threads."""
+
+    def __init__(self, calls_per_second: float):
+        self.interval = 1.0 / calls_per_second
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _evaluate_one(client, limiter, item, audio_dir):
+    from jiwer import wer, cer
+    filename = item["filename"]
+    result = {"provider": client.name, "filename": filename}
+    try:
+        samples, fs = read_audio(os.path.join(audio_dir, filename))
+        duration = len(samples) / fs
+
+        if limiter:
+            limiter.wait()
+        start = time.perf_counter()
+        prediction = client.transcribe(samples, fs)
+        latency = time.perf_counter() - start
+
+        prediction = remove_punctuation(prediction)
+        ground_truth = remove_punctuation(item["transcribed_text"])
+        result.update({
+            "ground_truth": ground_truth,
+            "prediction": prediction,
+            "wer": wer(ground_truth, prediction),
+            "cer": cer(ground_truth, prediction),
+            "latency": latency,
+            "duration": duration,
+            "rtf": latency / duration if duration else None,
+        })
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def summarize(results):
+    """Aggregates per-file results into per-provider WER/CER and latency stats."""
+    summary = {}
+    for provider in sorted({r["provider"] for r in results}):
+        ok = [r for r in results if r["provider"] == provider and "wer" in r]
+        errors = sum(1 for r in results if r["provider"] == provider and "error" in r)
+        latencies = np.array([r["latency"] for r in ok])
+        rtfs = [r["rtf"] for r in ok if r["rtf"] is not None]
+        summary[provider] = {
+            "files": len(ok),
+            "errors": errors,
+            "average_wer": float(np.mean([r["wer"] for r in ok])) if ok else None,
+            "average_cer": float(np.mean([r["cer"] for r in ok])) if ok else None,
+            "latency_p50": float(np.percentile(latencies, 50)) if ok else None,
+            "latency_p95": float(np.percentile(latencies, 95)) if ok else None,
+            "average_rtf": float(np.mean(rtfs)) if rtfs else None,
+        }
+    return summary
+
+
+def evaluation_config(client, reference_data) -> str:
+    """Fingerprint of a provider's setup and the corpus it is evaluated on, so
+    checkpointed results are never reused for a different model or corpus."""
+    parts = [
+        client.name,
+        str(getattr(client, "model", "")),
+        str(getattr(client, "language_code", "")),
+        str(getattr(client, "prompt", "")),
+        json.dumps(reference_data, ensure_ascii=False, sort_keys=True),
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def evaluate(json_file_path, audio_dir, clients, max_workers=4, rate_limits=None,
+             checkpoint_path="results.jsonl", output_path="results.json", resume=False):
+    """Evaluates one or more STT strategies side by side on a GT.json corpus.
+
+    Files are transcribed on a bounded thread pool, with optional per-provider
+    rate limits (calls per second, keyed by strategy name). Each result is
+    appended to checkpoint_path as soon as it finishes. With resume=True, files
+    already transcribed successfully there by the same provider configuration
+    on the same corpus are skipped, so an interrupted run continues where it
+    stopped; otherwise the checkpoint is started over. Checkpointed results of
+    providers not in this run are kept as they are.
+    """
+    if isinstance(clients, STTStrategy):
+        clients = [clients]
+    rate_limits = rate_limits or {}
+    limiters = {c.name: RateLimiter(rate_limits[c.name]) for c in clients if c.name in rate_limits}
 
-    with open("results.json", "w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    with open(json_file_path, 'r', encoding='utf-8') as f:
+        reference_data = json.load(f)
+    configs = {c.name: evaluation_config(c, reference_data) for c in clients}
+
+    results = []
+    other_providers = []
+    if resume and checkpoint_path and os.path.exists(checkpoint_path):
+        with open(checkpoint_path, 'r', encoding='utf-8') as f:
+            checkpointed = [json.loads(line) for line in f if line.strip()]
+        other_providers = [r for r in checkpointed if r["provider"] not in configs]
+        # Failed files are retried on resume
+        results = [r for r in checkpointed if r["provider"] in configs
+                   and "error" not in r and r.get("config") == configs[r["provider"]]]
+    done = {(r["provider"], r["filename"]) for r in results}
+
+    tasks = [(client, item) for client in clients for item in reference_data
+             if (client.name, item["filename"]) not in done]
+    print(f"Evaluating {len(tasks)} transcriptions ({len(done)} already done)")
+
+    checkpoint = open(checkpoint_path, 'w', encoding='utf-8') if checkpoint_path else None
+    try:
+        if checkpoint:
+            # Rewrite without the failed entries, then append as results come in
+            for r in other_providers + results:
+                checkpoint.write(json.dumps(r, ensure_ascii=False) + "\n")
+            checkpoint.flush()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_evaluate_one, client, limiters.get(client.name), item, audio_dir)
+                       for client, item in tasks]
+            for future in as_completed(futures):
+                r = future.result()
+                r["config"] = configs[r["provider"]]
+                results.append(r)
+                if checkpoint:
+                    checkpoint.write(json.dumps(r, ensure_ascii=False) + "\n")
+                    checkpoint.flush()
+                if "wer" in r:
+                    print(f"[{r['provider']}] {r['filename']}: WER = {r['wer']:.2f}, "
+                          f"CER = {r['cer']:.2f}, latency = {r['latency']:.2f}s")
+                else:
+                    print(f"[{r['provider']}] {r['filename']}: ERROR = {r['error']}")
+    finally:
+        if checkpoint:
+            checkpoint.close()
+
+    summary = summarize(results)
+    print(f"\n=== Evaluation Results ===")
+    for provider, stats in summary.items():
+        if stats["files"] == 0:
+            print(f"{provider}: no successful transcriptions ({stats['errors']} errors)")
+            continue
+        rtf = f"{stats['average_rtf']:.2f}" if stats["average_rtf"] is not None else "n/a"
+        print(f"{provider}: WER = {stats['average_wer']:.2f}, CER = {stats['average_cer']:.2f}, "
+              f"p50 = {stats['latency_p50']:.2f}s, p95 = {stats['latency_p95']:.2f}s, "
+              f"RTF = {rtf}, errors = {stats['errors']}")
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump({"summary": summary, "results": results}, f, ensure_ascii=False, indent=2)
 
     return results
 
@@ -208,6 +853,8 @@ if __name__ == "__main__":
     gcp_stt = GCP_STT()
     groq_stt = GroqWhisper_STT()
     client = STTClient(groq_stt)
+    # client.set_strategy(HedgedSTT(gcp_stt, groq_stt))
 
     # evaluate("audio/GT.json", "audio/", groq_stt)
     # evaluate("audio/GT.json", "audio/", gcp_stt)
+    # evaluate("audio/GT.json", "audio/", [gcp_stt, groq_stt], rate_limits={"GroqWhisper_STT": 0.3})
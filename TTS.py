@@ -1,6 +1,16 @@
 import os
-import tempfile
+import re
+import time
+import asyncio
+import queue
+import threading
+import io
+import hashlib
+import unicodedata
 from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import AsyncIterable, Deque, Dict, List, Optional, Tuple
 from pydub import AudioSegment # type: ignore
 from pydub.playback import play # type: ignore
 import mishkal.tashkeel
@@ -8,49 +18,79 @@ import mishkal.tashkeel
 from google.cloud import texttospeech
 
 # PlayAI (Groq) imports
-from groq import Groq # type: ignore
+from groq import Groq, AsyncGroq # type: ignore
 
 # Base Strategy
 class TTSStrategy(ABC):
+    @property
     @abstractmethod
-    def synthesize(self, text: str) -> str:
-        """Synthesize text and return path to a WAV file"""
+    def name(self) -> str:
         pass
 
+    @abstractmethod
+    def synthesize(self, text: str) -> AudioSegment:
+        """Synthesize text and return the decoded audio, ready to play"""
+        pass
+
+    async def synthesize_async(self, text: str) -> AudioSegment:
+        """Async variant of synthesize. Strategies without a native async
+        client run the blocking call on the default executor."""
+        return await asyncio.to_thread(self.synthesize, text)
+
 # GCP TTS implementation
 class GCP_TTS(TTSStrategy):
-    def __init__(self):
+    def __init__(self, voice="ar-XA-Chirp3-HD-Callirrhoe", language_code="ar-XA", sample_rate=24000):
         self.client = texttospeech.TextToSpeechClient()
+        # gRPC aio clients bind to the running event loop, so this one is
+        # created on first use
+        self.async_client = None
+        self.voice = voice
+        self.language_code = language_code
+        self.sample_rate = sample_rate
+
+    @property
+    def name(self) -> str:
+        return "GCP_TTS"
 
-    def synthesize(self, text: str) -> str:
+    def synthesis_request(self, text: str) -> dict:
         synthesis_input = texttospeech.SynthesisInput(text=text)
         voice = texttospeech.VoiceSelectionParams(
-            language_code="ar-XA",
+            language_code=self.language_code,
             ssml_gender=texttospeech.SsmlVoiceGender.FEMALE,
-            name="ar-XA-Chirp3-HD-Callirrhoe"
+            name=self.voice
         )
-        audio_config = texttospeech.AudioConfig(audio_encoding=texttospeech.AudioEncoding.MP3)
-        response = self.client.synthesize_speech(input=synthesis_input, voice=voice, audio_config=audio_config)
+        # LINEAR16 comes back as a WAV container, so no MP3 decoding is needed
+        audio_config = texttospeech.AudioConfig(
+            audio_encoding=texttospeech.AudioEncoding.LINEAR16,
+            sample_rate_hertz=self.sample_rate
+        )
+        return {"input": synthesis_input, "voice": voice, "audio_config": audio_config}
+
+    def synthesize(self, text: str) -> AudioSegment:
+        response = self.client.synthesize_speech(**self.synthesis_request(text))
 
-        mp3_temp = tempfile.NamedTemporaryFile(suffix=".mp3", delete=False)
-        mp3_temp.write(response.audio_content)
-        mp3_temp.close()
+        return AudioSegment.from_wav(io.BytesIO(response.audio_content))
 
-        # Convert MP3 to WAV
-        wav_temp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-        sound = AudioSegment.from_mp3(mp3_temp.name)
-        sound.export(wav_temp.name, format="wav")
+    async def synthesize_async(self, text: str) -> AudioSegment:
+        if self.async_client is None:
+            self.async_client = texttospeech.TextToSpeechAsyncClient()
+        response = await self.async_client.synthesize_speech(**self.synthesis_request(text))
 
-        return wav_temp.name
+        return AudioSegment.from_wav(io.BytesIO(response.audio_content))
 
 # PlayAI (Groq) TTS implementation
 class PlayAI_TTS(TTSStrategy):
     def __init__(self, model='playai-tts-arabic', voice="Amira-PlayAI"):
         self.client = Groq()
+        self.async_client = AsyncGroq()
         self.model = model
         self.voice = voice
 
-    def synthesize(self, text: str) -> str:
+    @property
+    def name(self) -> str:
+        return "PlayAI_TTS"
+
+    def synthesize(self, text: str) -> AudioSegment:
         print("Beginning TTS conversion (PlayAI)")
         response = self.client.audio.speech.create(
             model=self.model,
@@ -59,20 +99,464 @@ class PlayAI_TTS(TTSStrategy):
             response_format="mp3"
         )
 
-        mp3_temp = tempfile.NamedTemporaryFile(suffix=".mp3", delete=False)
-        response.write_to_file(mp3_temp.name)
+        # Decode the MP3 bytes in memory instead of via temp files
+        return AudioSegment.from_file(io.BytesIO(response.read()), format="mp3")
+
+    async def synthesize_async(self, text: str) -> AudioSegment:
+        response = await self.async_client.audio.speech.create(
+            model=self.model,
+            voice=self.voice,
+            input=text,
+            response_format="mp3"
+        )
+        mp3_bytes = await response.read()
+        # MP3 decoding goes through an ffmpeg pipe, so keep it off the event loop
+        return await asyncio.to_thread(AudioSegment.from_file, io.BytesIO(mp3_bytes), format="mp3")
+
+# Arabic diacritics (harakat, tanween, shadda, sukun, dagger alef)
+TASHKEEL_MARKS = set("\u064b\u064c\u064d\u064e\u064f\u0650\u0651\u0652\u0670")
+
+
+def normalize_tts_text(text: str) -> str:
+    """Normalize text for cache lookups without changing how it is pronounced."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+# Caching wrapper around any TTS strategy
+class CachedTTS(TTSStrategy):
+    def __init__(self, strategy: TTSStrategy, max_bytes: int = 64 * 1024 * 1024,
+                 cache_dir: Optional[str] = None):
+        self.strategy = strategy
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        self._memory: "OrderedDict[str, AudioSegment]" = OrderedDict()
+        self._memory_bytes = 0
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.shared = 0
+        self.misses = 0
+
+    @property
+    def name(self) -> str:
+        return f"Cached({self.strategy.name})"
+
+    def cache_key(self, text: str) -> str:
+        normalized = normalize_tts_text(text)
+        has_tashkeel = any(c in TASHKEEL_MARKS for c in normalized)
+        parts = [
+            self.strategy.name,
+            str(getattr(self.strategy, "voice", "")),
+            str(getattr(self.strategy, "model", "")),
+            str(getattr(self.strategy, "language_code", "")),
+            str(getattr(self.strategy, "sample_rate", "")),
+            "tashkeel" if has_tashkeel else "plain",
+            normalized,
+        ]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def synthesize(self, text: str) -> AudioSegment:
+        # AudioSegment is immutable, so cached entries can be shared directly
+        return self._get_audio(text)
+
+    async def synthesize_async(self, text: str) -> AudioSegment:
+        key = self.cache_key(text)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+        # Disk reads, single-flight waits and upstream calls may block
+        return await asyncio.to_thread(self._get_audio, text)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.shared + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "shared": self.shared,
+                "misses": self.misses,
+                "hit_rate": (lookups - self.misses) / lookups if lookups else 0.0,
+                "entries": len(self._memory),
+                "bytes": self._memory_bytes,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def _get_audio(self, text: str) -> AudioSegment:
+        key = self.cache_key(text)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.shared += 1
+
+        if not leader:
+            # Another session is already synthesizing this text; wait for it
+            return future.result()
+
+        try:
+            audio = self._read_disk(key)
+            if audio is not None:
+                with self._lock:
+                    self.disk_hits += 1
+            else:
+                with self._lock:
+                    self.misses += 1
+                audio = self.strategy.synthesize(text)
+                self._write_disk(key, audio)
+            self._store(key, audio)
+            future.set_result(audio)
+            return audio
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def _store(self, key: str, audio: AudioSegment):
+        size = len(audio.raw_data)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._memory:
+                return
+            self._memory[key] = audio
+            self._memory_bytes += size
+            while self._memory_bytes > self.max_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted.raw_data)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.wav")
+
+    def _read_disk(self, key: str) -> Optional[AudioSegment]:
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            return AudioSegment.from_wav(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # A corrupt or partial entry is a miss; remove it so it gets rewritten
+            print(f"⚠️ Dropping unreadable TTS cache entry {path}: {e!r}")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+    def _write_disk(self, key: str, audio: AudioSegment):
+        if not self.cache_dir:
+            return
+        # Write then rename so a crash never leaves a truncated entry behind
+        tmp_path = self._disk_path(key) + ".tmp"
+        try:
+            audio.export(tmp_path, format="wav")
+            os.replace(tmp_path, self._disk_path(key))
+        except Exception as e:
+            # A full or read-only disk only costs the entry; the audio is still returned
+            print(f"⚠️ Could not write TTS cache entry {self._disk_path(key)}: {e!r}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+# Rolling health of one backend behind RoutingTTS
+class BackendHealth:
+    CLOSED = "closed"
+    OPEN = "open"
+
+    def __init__(self, strategy: TTSStrategy, window: int, max_workers: int = 4):
+        self.strategy = strategy
+        # Each backend has its own threads, so calls hung on one backend never
+        # queue another backend's requests behind them and eat their timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"tts-{strategy.name}")
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.state = BackendHealth.CLOSED
+        self.probing = False
+
+    def latency_p50(self) -> float:
+        # Unmeasured backends sort first so each one gets tried
+        if not self.latencies:
+            return 0.0
+        return sorted(self.latencies)[len(self.latencies) // 2]
+
+    def latency_p95(self) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+
+    def error_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+
+# Latency-aware router with circuit breaking across TTS strategies
+class RoutingTTS(TTSStrategy):
+    def __init__(self, strategies: List[TTSStrategy], timeout: float = 6.0, window: int = 50,
+                 failure_threshold: int = 3, max_error_rate: float = 0.5, cooldown: float = 15.0,
+                 max_cooldown: float = 120.0, probe_text: str = "مرحبا"):
+        self.backends = [BackendHealth(strategy, window) for strategy in strategies]
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.max_error_rate = max_error_rate
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.probe_text = probe_text
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return f"Routing({','.join(b.strategy.name for b in self.backends)})"
+
+    def route(self) -> List[BackendHealth]:
+        """Healthy backends ordered by rolling median latency. If every circuit
+        is open, the tripped backends are tried anyway rather than failing."""
+        with self._lock:
+            healthy = [b for b in self.backends if b.state == BackendHealth.CLOSED]
+            return sorted(healthy or self.backends, key=BackendHealth.latency_p50)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                b.strategy.name: {
+                    "state": b.state,
+                    "requests": len(b.outcomes),
+                    "latency_p50": b.latency_p50() if b.latencies else None,
+                    "latency_p95": b.latency_p95(),
+                    "error_rate": b.error_rate(),
+                }
+                for b in self.backends
+            }
 
-        # Convert MP3 to WAV
-        wav_temp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-        sound = AudioSegment.from_mp3(mp3_temp.name)
-        sound.export(wav_temp.name, format="wav")
+    def synthesize(self, text: str) -> AudioSegment:
+        last_error: Optional[Exception] = None
+        for backend in self.route():
+            start = time.perf_counter()
+            future = backend.executor.submit(backend.strategy.synthesize, text)
+            try:
+                audio = future.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                # The call keeps running in its thread; its result is dropped
+                last_error = TimeoutError(f"{backend.strategy.name} timed out after {self.timeout:.1f}s")
+                self._record_failure(backend, self.timeout)
+                continue
+            except Exception as e:
+                last_error = e
+                self._record_failure(backend, time.perf_counter() - start)
+                continue
+            self._record_success(backend, time.perf_counter() - start)
+            return audio
+        raise last_error or RuntimeError("No TTS backends configured")
+
+    async def synthesize_async(self, text: str) -> AudioSegment:
+        last_error: Optional[Exception] = None
+        for backend in self.route():
+            start = time.perf_counter()
+            try:
+                audio = await asyncio.wait_for(backend.strategy.synthesize_async(text), self.timeout)
+            except asyncio.TimeoutError:
+                last_error = TimeoutError(f"{backend.strategy.name} timed out after {self.timeout:.1f}s")
+                self._record_failure(backend, self.timeout)
+                continue
+            except Exception as e:
+                last_error = e
+                self._record_failure(backend, time.perf_counter() - start)
+                continue
+            self._record_success(backend, time.perf_counter() - start)
+            return audio
+        raise last_error or RuntimeError("No TTS backends configured")
+
+    def _record_success(self, backend: BackendHealth, seconds: float):
+        with self._lock:
+            backend.latencies.append(seconds)
+            backend.outcomes.append(True)
+            backend.consecutive_failures = 0
+
+    def _record_failure(self, backend: BackendHealth, seconds: float):
+        with self._lock:
+            backend.latencies.append(seconds)
+            backend.outcomes.append(False)
+            backend.consecutive_failures += 1
+            tripped = (
+                backend.consecutive_failures >= self.failure_threshold
+                or (len(backend.outcomes) >= 10 and backend.error_rate() > self.max_error_rate)
+            )
+            if not tripped or backend.state == BackendHealth.OPEN:
+                return
+            backend.state = BackendHealth.OPEN
+            start_probe = not backend.probing
+            backend.probing = True
+        print(f"⚠️ {backend.strategy.name} circuit opened, routing around it")
+        if start_probe:
+            threading.Thread(target=self._probe, args=(backend,), daemon=True).start()
+
+    def _probe(self, backend: BackendHealth):
+        """Retries the tripped backend off the request path, with exponential
+        backoff, and closes its circuit once a probe succeeds in time."""
+        delay = self.cooldown
+        while True:
+            time.sleep(delay)
+            start = time.perf_counter()
+            future = backend.executor.submit(backend.strategy.synthesize, self.probe_text)
+            try:
+                future.result(timeout=self.timeout)
+            except Exception:
+                delay = min(delay * 2, self.max_cooldown)
+                continue
+            with self._lock:
+                backend.state = BackendHealth.CLOSED
+                backend.probing = False
+                backend.consecutive_failures = 0
+                # Start from a clean window so old failures don't re-trip it
+                backend.outcomes.clear()
+                backend.latencies.clear()
+                backend.latencies.append(time.perf_counter() - start)
+            print(f"✅ {backend.strategy.name} circuit closed after a successful probe")
+            return
+
+
+# Shared, memoized tashkeel vocalizer
+class TashkeelVocalizer:
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._vocalizer = None
+        self._load_lock = threading.Lock()
+        # mishkal keeps per-call state on the instance, so calls are serialized
+        self._call_lock = threading.Lock()
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._warm_up_thread: Optional[threading.Thread] = None
+
+    def warm_up(self) -> threading.Thread:
+        """Load the dictionaries in a background thread so the first
+        utterance does not pay for it."""
+        with self._load_lock:
+            if self._warm_up_thread is None:
+                self._warm_up_thread = threading.Thread(
+                    target=lambda: self.vocalize("مرحبا بكم في الفندق"), daemon=True
+                )
+                self._warm_up_thread.start()
+        return self._warm_up_thread
+
+    def _get(self):
+        if self._vocalizer is None:
+            with self._load_lock:
+                if self._vocalizer is None:
+                    print("Loading tashkeel dictionaries...")
+                    self._vocalizer = mishkal.tashkeel.TashkeelClass()
+        return self._vocalizer
+
+    def _cached(self, text: str) -> Optional[str]:
+        with self._cache_lock:
+            if text in self._cache:
+                self._cache.move_to_end(text)
+                return self._cache[text]
+        return None
+
+    def _remember(self, text: str, vocalized: str):
+        with self._cache_lock:
+            self._cache[text] = vocalized
+            self._cache.move_to_end(text)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def vocalize(self, text: str) -> str:
+        vocalized = self._cached(text)
+        if vocalized is None:
+            vocalizer = self._get()
+            with self._call_lock:
+                vocalized = vocalizer.tashkeel(text)
+            self._remember(text, vocalized)
+        return vocalized
+
+    def vocalize_batch(self, texts: List[str]) -> List[str]:
+        """Vocalize several sentences, running all cache misses through
+        mishkal in a single pass."""
+        results = {text: self._cached(text) for text in texts}
+        missing = [text for text, vocalized in results.items() if vocalized is None]
+
+        if len(missing) == 1:
+            results[missing[0]] = self.vocalize(missing[0])
+        elif missing:
+            vocalizer = self._get()
+            with self._call_lock:
+                joined = vocalizer.tashkeel("\n".join(missing))
+            lines = joined.split("\n")
+            if len(lines) == len(missing):
+                for text, vocalized in zip(missing, lines):
+                    results[text] = vocalized
+                    self._remember(text, vocalized)
+            else:
+                # Line breaks were not preserved; fall back to one call per sentence
+                for text in missing:
+                    results[text] = self.vocalize(text)
+
+        return [results[text] for text in texts]
+
+
+tashkeel_vocalizer = TashkeelVocalizer()
+
+
+# Sentence boundaries: Arabic question mark and comma, Latin ? ! and newlines,
+# and . followed by a space. Decimal points, dotted abbreviations ("e.g.",
+# "a.m.", "U.S.") and titles ("Dr.", "Mr.") don't end a sentence. A run such as
+# "..." or "؟!" ends one sentence, after its last mark.
+SENTENCE_BOUNDARY = re.compile(
+    r'(?<=[؟?!،\n])(?![؟?!،.\n])'
+    r'|(?<=\.)(?<!\b[A-Za-z]\.[A-Za-z]\.)(?<!\b[Mm]r\.)(?<!\b[Mm]rs\.)(?<!\b[Dd]r\.)(?<!\b[Ss]t\.)'
+    r'(?![؟?!،.])(?=\s|$)'
+)
+
+
+def is_speakable(chunk: str) -> bool:
+    """Chunks without a letter or digit (stray punctuation) have nothing to say."""
+    return any(c.isalnum() for c in chunk)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into chunks at Arabic and Latin sentence boundaries."""
+    return [chunk.strip() for chunk in SENTENCE_BOUNDARY.split(text) if is_speakable(chunk)]
+
+
+def split_complete_sentences(buffer: str) -> Tuple[List[str], str]:
+    """Split streamed text into the sentences that are already complete and the
+    unfinished remainder, which should be kept until more text arrives."""
+    pieces = SENTENCE_BOUNDARY.split(buffer)
+    remainder = pieces.pop()
+    if not remainder and buffer.endswith(".") and pieces:
+        # A trailing "." may still turn out to be a decimal point
+        remainder = pieces.pop()
+    return [piece.strip() for piece in pieces if is_speakable(piece)], remainder
 
-        return wav_temp.name
 
 # TTS Client
 class TTSClient:
-    def __init__(self, strategy: TTSStrategy):
+    def __init__(self, strategy: TTSStrategy, vocalizer: TashkeelVocalizer = tashkeel_vocalizer):
         self.strategy = strategy
+        self.vocalizer = vocalizer
 
     def set_strategy(self, strategy: TTSStrategy):
         self.strategy = strategy
@@ -80,14 +564,133 @@ class TTSClient:
     def speak(self, text: str, use_tashkeel: bool = False):
         if use_tashkeel:
             print("Applying tashkeel to text...")
-            vocalizer = mishkal.tashkeel.TashkeelClass()
-            text = vocalizer.tashkeel(text)
+            text = self.vocalizer.vocalize(text)
             print(f"Text with tashkeel: {text}")
-        wav_file = self.strategy.synthesize(text)
-        sound = AudioSegment.from_wav(wav_file)
+        sound = self.strategy.synthesize(text)
         print("Playing response...")
         play(sound)
-        os.remove(wav_file)
+
+    def speak_streaming(self, text: str, use_tashkeel: bool = False) -> Optional[float]:
+        """Speak text sentence by sentence, synthesizing the next chunk while the
+        current one plays. Returns the time-to-first-audio in seconds."""
+        start = time.perf_counter()
+        chunks = split_sentences(text)
+        if not chunks:
+            return None
+
+        if use_tashkeel:
+            print("Applying tashkeel to text...")
+            chunks = self.vocalizer.vocalize_batch(chunks)
+            print(f"Text with tashkeel: {' '.join(chunks)}")
+
+        strategy = self.strategy
+        # One slot: chunk N+1 is synthesized while chunk N is playing
+        ready = queue.Queue(maxsize=1)
+        stop_flag = threading.Event()
+
+        def producer():
+            try:
+                for chunk in chunks:
+                    if stop_flag.is_set():
+                        break
+                    ready.put(strategy.synthesize(chunk))
+            except Exception as e:
+                ready.put(e)
+            ready.put(None)
+
+        worker = threading.Thread(target=producer, daemon=True)
+        worker.start()
+
+        time_to_first_audio = None
+        try:
+            while True:
+                item = ready.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                if time_to_first_audio is None:
+                    time_to_first_audio = time.perf_counter() - start
+                    print(f"Playing response... (time to first audio: {time_to_first_audio:.2f}s)")
+                play(item)
+        finally:
+            stop_flag.set()
+            # Drain so the producer is never left blocked on a full queue
+            while worker.is_alive():
+                try:
+                    ready.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+        return time_to_first_audio
+
+    async def speak_async(self, text: str, use_tashkeel: bool = False):
+        """Async variant of speak: synthesis, tashkeel and playback never block
+        the event loop."""
+        if use_tashkeel:
+            print("Applying tashkeel to text...")
+            text = await asyncio.to_thread(self.vocalizer.vocalize, text)
+            print(f"Text with tashkeel: {text}")
+        sound = await self.strategy.synthesize_async(text)
+        print("Playing response...")
+        await asyncio.to_thread(play, sound)
+
+    async def speak_streaming_async(self, text: str, use_tashkeel: bool = False) -> Optional[float]:
+        """Async variant of speak_streaming. Returns the time-to-first-audio in seconds."""
+        start = time.perf_counter()
+        chunks = split_sentences(text)
+        if not chunks:
+            return None
+
+        if use_tashkeel:
+            print("Applying tashkeel to text...")
+            chunks = await asyncio.to_thread(self.vocalizer.vocalize_batch, chunks)
+            print(f"Text with tashkeel: {' '.join(chunks)}")
+
+        async def sentences():
+            for chunk in chunks:
+                yield chunk
+
+        return await self.speak_sentences_async(sentences(), start=start)
+
+    async def speak_sentences_async(self, sentences: AsyncIterable[str], use_tashkeel: bool = False,
+                                    start: Optional[float] = None) -> Optional[float]:
+        """Speak sentences as they are produced, e.g. while the agent is still
+        generating the rest of its reply. Returns the time-to-first-audio in
+        seconds, measured from start (a time.perf_counter() value) if given."""
+        start = start if start is not None else time.perf_counter()
+        strategy = self.strategy
+        # One slot: chunk N+1 is synthesized while chunk N is playing
+        ready: asyncio.Queue = asyncio.Queue(maxsize=1)
+
+        async def producer():
+            async for chunk in sentences:
+                if use_tashkeel:
+                    chunk = await asyncio.to_thread(self.vocalizer.vocalize, chunk)
+                await ready.put(await strategy.synthesize_async(chunk))
+            await ready.put(None)
+
+        synthesis = asyncio.create_task(producer())
+        time_to_first_audio = None
+        try:
+            while True:
+                get = asyncio.create_task(ready.get())
+                await asyncio.wait({get, synthesis}, return_when=asyncio.FIRST_COMPLETED)
+                if not get.done():
+                    # The producer finished first; surface its error, if any
+                    if synthesis.exception() is not None:
+                        get.cancel()
+                        raise synthesis.exception()
+                    await get
+                sound = get.result()
+                if sound is None:
+                    break
+                if time_to_first_audio is None:
+                    time_to_first_audio = time.perf_counter() - start
+                    print(f"Playing response... (time to first audio: {time_to_first_audio:.2f}s)")
+                await asyncio.to_thread(play, sound)
+        finally:
+            synthesis.cancel()
+        return time_to_first_audio
 
 
 if __name__ == "__main__":
@@ -96,7 +699,17 @@ if __name__ == "__main__":
     
     client = TTSClient(gcp_tts)
     client.speak("Hello from GCP!")
+    client.speak_streaming("Hello from GCP! This reply is streamed sentence by sentence.")
 
     client.set_strategy(playai_tts)
     client.speak("Hello from PlayAI!")
 
+    client.set_strategy(RoutingTTS([gcp_tts, playai_tts]))
+    client.speak("Hello from whichever backend is fastest!")
+
+    cached_tts = CachedTTS(gcp_tts, cache_dir=".tts_cache")
+    client.set_strategy(cached_tts)
+    client.speak("Hello from the cache!")
+    client.speak("Hello from the cache!")
+    print(cached_tts.stats())
+
@@ -0,0 +1,69 @@
+"""App setup shared by the voice client (main.py), the server and the test
+harnesses: the rooms inventory, each new session's state and where sessions
+and records are stored. Importing it needs no audio devices or speech
+credentials."""
+from datetime import date
+
+from dotenv import load_dotenv # type: ignore
+
+from Hotel_Agent.sub_agents.booking_agent.bookings import booking_store
+from Hotel_Agent.sub_agents.booking_agent.inventory import RoomInventory, register_inventory
+from Hotel_Agent.sub_agents.issues_agent.tickets import ticket_engine
+from session_service import SQLiteSessionService
+
+load_dotenv()
+# Conversations, session state, bookings and tickets survive restarts in this SQLite database
+SESSION_DB = "hotel_sessions.db"
+
+rooms_db = {
+    "room_101": {"type": "single", "price": 100, "in_service": True},
+    "room_102": {"type": "double", "price": 150, "in_service": True},
+    "room_103": {"type": "suite", "price": 300, "in_service": False},
+    "room_104": {"type": "single", "price": 100, "in_service": True},
+}
+
+# Rooms live in one shared, indexed inventory; sessions only reference it by id
+inventory = RoomInventory(rooms_db)
+inventory_id = register_inventory(inventory)
+
+initial_state = {
+    "user_name": "User", 
+    "recent_bookings": [],
+    "pending_issues": [],
+    "inventory_id": inventory_id,
+}
+
+
+def open_session_service(path: str = SESSION_DB) -> SQLiteSessionService:
+    """Opens the session database and restores the bookings, room reservations
+    and tickets saved in it. Later changes to them are written through."""
+    session_service = SQLiteSessionService(path)
+    bookings = session_service.load_records("bookings")
+    booking_store.load(bookings)
+    # Reservations are rebuilt from the bookings they belong to
+    for booking in bookings:
+        if booking["status"] == "confirmed":
+            inventory.reserve(booking["room_id"], date.fromisoformat(booking["check_in"]),
+                              date.fromisoformat(booking["check_out"]), booking["booking_id"])
+    ticket_engine.restore(session_service.load_records("tickets"))
+    session_service.attach_store("bookings", booking_store)
+    session_service.attach_store("tickets", ticket_engine.store)
+    return session_service
+
+
+def reset_records():
+    """Empties the bookings, tickets and room reservations, so harnesses that
+    run the same conversations again start from the same state."""
+    booking_store.clear()
+    ticket_engine.clear()
+    inventory.clear_reservations()
+
+
+def event_text(event):
+    """Concatenate all text parts of an event, skipping model thoughts."""
+    if not event.content or not event.content.parts:
+        return ""
+    return "".join(
+        part.text for part in event.content.parts
+        if getattr(part, "text", None) and not getattr(part, "thought", False)
+    )
@@ -0,0 +1,24 @@
+"""Arabic text normalization shared by speech evaluation, intent routing and
+the response cache, without the audio dependencies of STT."""
+import re
+import string
+
+
+def remove_punctuation(text):
+    arabic_punctuation = "؟،؛ـ«»…“”"
+    all_punct = string.punctuation + arabic_punctuation
+    translator = str.maketrans('', '', all_punct)
+    return text.translate(translator)
+
+
+ARABIC_DIACRITICS = re.compile("[\u064b-\u065f\u0670]")
+# Alef, yaa and taa marbuta forms that are written interchangeably
+ARABIC_VARIANTS = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ى": "ي", "ة": "ه"})
+
+
+def normalize_arabic(text):
+    """Normalize text for matching rather than display: drops punctuation,
+    tatweel and diacritics, unifies alef/yaa/taa marbuta variants, lowercases
+    Latin letters and collapses whitespace."""
+    text = ARABIC_DIACRITICS.sub("", remove_punctuation(text))
+    return " ".join(text.translate(ARABIC_VARIANTS).lower().split())
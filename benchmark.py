@@ -0,0 +1,338 @@
+"""Offline latency benchmark for the voice pipeline.
+
+Runs full turns (STT -> agents -> TTS) through main.call_agent_async and a
+real Runner, with stub STT/TTS providers and a scripted stand-in model in
+place of Gemini, so it needs no network access or credentials:
+
+    python benchmark.py
+"""
+import asyncio
+import copy
+import math
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+
+import numpy as np
+from google.adk.agents.callback_context import CallbackContext # type: ignore
+from google.adk.models.base_llm import BaseLlm # type: ignore
+from google.adk.models.llm_request import LlmRequest # type: ignore
+from google.adk.models.llm_response import LlmResponse # type: ignore
+from google.adk.plugins.base_plugin import BasePlugin # type: ignore
+from google.adk.runners import Runner # type: ignore
+from google.adk.sessions import InMemorySessionService # type: ignore
+from google.adk.tools.base_tool import BaseTool # type: ignore
+from google.adk.tools.tool_context import ToolContext # type: ignore
+from google.genai import types # type: ignore
+from pydub import AudioSegment # type: ignore
+
+import main
+from Hotel_Agent.agent import coordinator_agent
+from intent_router import IntentRouterPlugin
+from response_cache import ResponseCachePlugin
+from STT import STTStrategy, AudioInput, TARGET_FS
+from TTS import TTSStrategy
+
+APP_NAME = "Hotel Customer Support Benchmark"
+
+# Scripted guest turns, one per sub-agent route plus small talk
+QUERIES = [
+    "اهلا، انا اسمي حسن",
+    "اريد ان احجز غرفة من فضلك",
+    "عندي مشكلة في التكييف في غرفتي",
+    "كيف أصل الى الفندق من محطة القطار؟",
+]
+
+INTENT_KEYWORDS = {
+    "booking_agent": ["احجز", "حجز", "غرفة"],
+    "issue_agent": ["مشكلة", "شكوى", "لا يعمل"],
+    "maps_agent": ["كيف أصل", "طريق", "عنوان"],
+}
+
+
+class LatencyModel:
+    """Log-normal latency distribution described by its median and p95, in seconds."""
+
+    def __init__(self, median: float, p95: Optional[float] = None, seed: Optional[int] = None):
+        self.median = median
+        p95 = p95 if p95 is not None else median * 1.5
+        self.sigma = math.log(p95 / median) / 1.645 if median > 0 else 0.0
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        if self.median <= 0:
+            return 0.0
+        with self._lock:
+            z = self.rng.gauss(0, 1)
+        return self.median * math.exp(self.sigma * z)
+
+
+class LatencyRecorder:
+    """Collects latency samples per stage and reports percentiles."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def add(self, stage: str, seconds: float):
+        self.samples[stage].append(seconds)
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        report = {}
+        for stage, values in sorted(self.samples.items()):
+            values = np.array(values) * 1000
+            report[stage] = {
+                "count": len(values),
+                "p50_ms": float(np.percentile(values, 50)),
+                "p95_ms": float(np.percentile(values, 95)),
+                "p99_ms": float(np.percentile(values, 99)),
+            }
+        return report
+
+    def print_report(self, title: str):
+        print(f"\n=== {title} ===")
+        print(f"{'stage':<32}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for stage, stats in self.report().items():
+            print(f"{stage:<32}{stats['count']:>7}{stats['p50_ms']:>10.1f}"
+                  f"{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}")
+
+
+# Stub providers
+class StubSTT(STTStrategy):
+    def __init__(self, latency: LatencyModel, queries: List[str] = QUERIES, seed: int = 0):
+        self.latency = latency
+        self.queries = queries
+        self.rng = random.Random(seed)
+
+    @property
+    def name(self) -> str:
+        return "StubSTT"
+
+    def transcribe(self, audio: AudioInput, fs: int = TARGET_FS) -> str:
+        time.sleep(self.latency.sample())
+        return self.rng.choice(self.queries)
+
+
+class StubTTS(TTSStrategy):
+    def __init__(self, latency: LatencyModel):
+        self.latency = latency
+
+    @property
+    def name(self) -> str:
+        return "StubTTS"
+
+    def synthesize(self, text: str) -> AudioSegment:
+        time.sleep(self.latency.sample())
+        return AudioSegment.silent(duration=60 * len(text))
+
+
+# Scripted stand-in model
+def _text(text: str) -> types.Content:
+    return types.Content(role="model", parts=[types.Part(text=text)])
+
+
+def _call(name: str, args: Dict[str, Any]) -> types.Content:
+    return types.Content(role="model", parts=[
+        types.Part(function_call=types.FunctionCall(name=name, args=args))
+    ])
+
+
+def _last_function_response(llm_request: LlmRequest) -> Optional[types.FunctionResponse]:
+    if not llm_request.contents:
+        return None
+    for part in llm_request.contents[-1].parts or []:
+        if part.function_response:
+            return part.function_response
+    return None
+
+
+def _latest_user_text(llm_request: LlmRequest) -> str:
+    for content in reversed(llm_request.contents):
+        if content.role != "user":
+            continue
+        texts = [part.text for part in content.parts or [] if part.text]
+        if texts and not texts[0].startswith("For context"):
+            return " ".join(texts)
+    return ""
+
+
+def coordinator_script(llm_request: LlmRequest) -> types.Content:
+    if _last_function_response(llm_request):
+        return _text("شكرا لك، كيف يمكنني مساعدتك؟")
+    query = _latest_user_text(llm_request)
+    for agent_name, keywords in INTENT_KEYWORDS.items():
+        if any(keyword in query for keyword in keywords):
+            return _call("transfer_to_agent", {"agent_name": agent_name})
+    if "اسمي" in query:
+        return _call("update_user_info", {"user_name": query.split("اسمي")[-1].strip()})
+    return _text("كيف يمكنني مساعدتك؟")
+
+
+def tool_then_answer(name: str, args: Dict[str, Any], answer: str) -> Callable[[LlmRequest], types.Content]:
+    """Script for a sub-agent: call one tool, then answer once it responds."""
+    def script(llm_request: LlmRequest) -> types.Content:
+        if _last_function_response(llm_request):
+            return _text(answer)
+        return _call(name, args)
+    return script
+
+
+SCRIPTS = {
+    "root_coordinator": coordinator_script,
+    "booking_agent": tool_then_answer(
+        "check_room_availability", {"room_id": "room_101", "check_in": "", "check_out": ""},
+        "الغرفة 101 متاحة بسعر 100. هل تريد تأكيد الحجز؟"),
+    "issue_agent": tool_then_answer(
+        "create_issue_ticket", {"user_name": "", "issue_description": "التكييف لا يعمل", "severity": "high"},
+        "تم تسجيل المشكلة وسيتواصل معك فريق الصيانة قريبا."),
+    "maps_agent": tool_then_answer(
+        "get_directions", {"origin": "محطة مصر"},
+        "اتجه شرقا على طريق الحرية لمدة عشر دقائق حتى تصل الى الفندق."),
+}
+
+
+class ScriptedLlm(BaseLlm):
+    """Stand-in for Gemini that answers from a script after a sampled delay."""
+
+    script: Callable[[LlmRequest], types.Content]
+    latency: LatencyModel
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        await asyncio.sleep(self.latency.sample())
+        yield LlmResponse(content=self.script(llm_request))
+
+
+def get_directions(origin: str) -> dict:
+    """Offline stand-in for the TomTom MCP routing tool."""
+    return {"status": "success", "route": f"{origin} -> Hilton Green Plaza", "duration_minutes": 10}
+
+
+def install_stand_ins(model_latency: LatencyModel, agent=coordinator_agent):
+    """Swaps every agent's model for a ScriptedLlm and the maps MCP toolset for
+    a local tool. Only meant for benchmark processes: the agents are modified
+    in place."""
+    agent.model = ScriptedLlm(model=f"scripted-{agent.name}", script=SCRIPTS[agent.name],
+                              latency=model_latency)
+    if agent.name == "maps_agent":
+        agent.tools = [get_directions]
+    for sub_agent in agent.sub_agents:
+        install_stand_ins(model_latency, sub_agent)
+
+
+class TimingPlugin(BasePlugin):
+    """Records wall-clock time of every model call (per agent) and tool call."""
+
+    def __init__(self, recorder: LatencyRecorder):
+        super().__init__(name="timing")
+        self.recorder = recorder
+        self._started: Dict[Any, float] = {}
+
+    async def before_model_callback(self, *, callback_context: CallbackContext,
+                                    llm_request: LlmRequest) -> Optional[LlmResponse]:
+        self._started[(callback_context.invocation_id, callback_context.agent_name)] = time.perf_counter()
+        return None
+
+    async def after_model_callback(self, *, callback_context: CallbackContext,
+                                   llm_response: LlmResponse) -> Optional[LlmResponse]:
+        start = self._started.pop((callback_context.invocation_id, callback_context.agent_name), None)
+        if start is not None:
+            self.recorder.add(f"reasoning:{callback_context.agent_name}", time.perf_counter() - start)
+        return None
+
+    async def before_tool_callback(self, *, tool: BaseTool, tool_args: Dict[str, Any],
+                                   tool_context: ToolContext) -> Optional[dict]:
+        self._started[tool_context.function_call_id] = time.perf_counter()
+        return None
+
+    async def after_tool_callback(self, *, tool: BaseTool, tool_args: Dict[str, Any],
+                                  tool_context: ToolContext, result: dict) -> Optional[dict]:
+        start = self._started.pop(tool_context.function_call_id, None)
+        if start is not None:
+            self.recorder.add(f"tool:{tool.name}", time.perf_counter() - start)
+        return None
+
+
+async def run_session(runner: Runner, stt: STTStrategy, tts: TTSStrategy,
+                      recorder: LatencyRecorder, turns: int):
+    user_id = str(uuid.uuid4())
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name,
+        user_id=user_id,
+        state=copy.deepcopy(main.initial_state),
+    )
+    silence = np.zeros(TARGET_FS, dtype=np.int16)
+
+    for _ in range(turns):
+        turn_start = time.perf_counter()
+
+        start = time.perf_counter()
+        query = await stt.transcribe_async(silence, TARGET_FS)
+        recorder.add("stt", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        response = await main.call_agent_async(runner, user_id, session.id, query)
+        recorder.add("agent", time.perf_counter() - start)
+
+        if response:
+            start = time.perf_counter()
+            await tts.synthesize_async(response)
+            recorder.add("tts", time.perf_counter() - start)
+
+        recorder.add("turn", time.perf_counter() - turn_start)
+
+
+async def run_benchmark(concurrency: int = 1, turns: int = 20,
+                        stt_latency: Optional[LatencyModel] = None,
+                        model_latency: Optional[LatencyModel] = None,
+                        tts_latency: Optional[LatencyModel] = None,
+                        fast_path: bool = False, cache_responses: bool = False) -> LatencyRecorder:
+    """Runs `concurrency` sessions of `turns` turns each and returns the samples.
+    Latencies default to rough medians/p95s observed against the real vendors.
+    fast_path puts the local intent router in front of the coordinator and
+    cache_responses replays repeated turns from the response cache."""
+    stt_latency = stt_latency or LatencyModel(0.35, 0.8, seed=1)
+    model_latency = model_latency or LatencyModel(0.45, 1.2, seed=2)
+    tts_latency = tts_latency or LatencyModel(0.30, 0.7, seed=3)
+
+    install_stand_ins(model_latency)
+    recorder = LatencyRecorder()
+    router = IntentRouterPlugin(coordinator_agent.name)
+    cache = ResponseCachePlugin()
+    runner = Runner(
+        agent=coordinator_agent,
+        app_name=APP_NAME,
+        session_service=InMemorySessionService(),
+        plugins=([cache] if cache_responses else []) + ([router] if fast_path else []) + [TimingPlugin(recorder)],
+    )
+    stt = StubSTT(stt_latency)
+    tts = StubTTS(tts_latency)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_session(runner, stt, tts, recorder, turns) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    recorder.print_report(f"{concurrency} concurrent session(s), {turns} turns each"
+                          + (", intent fast path" if fast_path else "")
+                          + (", response cache" if cache_responses else ""))
+    print(f"Throughput: {concurrency * turns / elapsed:.2f} turns/s over {elapsed:.1f}s")
+    if fast_path:
+        print(f"Intent router: {router.stats()}")
+    if cache_responses:
+        print(f"Response cache: {cache.stats()}")
+    return recorder
+
+
+async def main_async():
+    for concurrency in [1, 4, 16]:
+        await run_benchmark(concurrency=concurrency, turns=10)
+    await run_benchmark(concurrency=1, turns=10, fast_path=True)
+    await run_benchmark(concurrency=4, turns=10, fast_path=True, cache_responses=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main_async())
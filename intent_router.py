@@ -0,0 +1,344 @@
+"""Local intent router in front of the coordinator agent.
+
+The coordinator's model call mostly decides which sub-agent should take the
+turn, which costs a full model round trip before any real work starts.
+IntentRouterPlugin classifies the guest's text locally instead (keyword/stem
+rules plus a small character n-gram model, tens of microseconds) and, when
+confident, answers the coordinator's model call itself with the transfer.
+Everything else still goes to the coordinator model:
+
+    runner = Runner(..., plugins=[IntentRouterPlugin()])
+"""
+import math
+import re
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from google.adk.agents.callback_context import CallbackContext # type: ignore
+from google.adk.models.llm_request import LlmRequest # type: ignore
+from google.adk.models.llm_response import LlmResponse # type: ignore
+from google.adk.plugins.base_plugin import BasePlugin # type: ignore
+from google.genai import types # type: ignore
+
+from arabic_text import normalize_arabic
+
+NO_INTENT = "none"
+CONFIDENCE_THRESHOLD = 0.85
+# A rule hit multiplies an intent's odds by e^RULE_WEIGHT (about 20x)
+RULE_WEIGHT = 3.0
+# Scale of the averaged n-gram log likelihood, i.e. how far text alone can go
+NGRAM_WEIGHT = 8.0
+NGRAM_SIZES = (2, 3, 4)
+
+# Words and phrases, matched word by word against normalize_arabic(text), so
+# written without hamza on alef and with ه for ة. A trailing * marks a stem
+# that matches any word starting with it; words are also tried without a
+# leading و/ف/ب/ل/ك and ال, so "طريق" matches "الطريق" but not "طريقه" (way, method).
+RULES = {
+    "booking_agent": ["حجز*", "احجز*", "اقام*", "ليله", "ليلتين", "ليالي", "اسعار", "غرف* متاح*",
+                      "book*", "reserv*"],
+    "issue_agent": ["مشكل*", "شكوي", "شكوا", "عطل", "معطل*", "عطلان", "خربان*", "لا يعمل", "لا تعمل",
+                    "ما يشتغل", "ما تشتغل", "تسريب*", "صيانه", "وسخ*", "ازعاج", "broken", "not working",
+                    "complain*"],
+    "maps_agent": ["كيف اصل", "كيف اروح", "طريق", "عنوان*", "موقع*", "اتجاهات", "مسافه", "اقرب", "خريطه",
+                   "direction*", "how do i get"],
+    # The guest is (also) telling us something the coordinator has to handle
+    # itself, such as their name, so these turns are never routed locally
+    NO_INTENT: ["اسمي", "my name", "name is"],
+}
+CLITICS = ("وال", "فال", "بال", "كال", "لل", "ال", "و", "ف", "ب", "ل", "ك")
+WORD = re.compile(r"\w+")
+
+# Labeled examples for the n-gram model; NO_INTENT turns stay with the coordinator
+EXAMPLES = {
+    "booking_agent": [
+        "اريد ان احجز غرفة من فضلك",
+        "ابغى احجز غرفة لشخصين",
+        "هل عندكم غرفة متاحة الليلة",
+        "كم سعر الغرفة المزدوجة",
+        "اريد جناح لثلاث ليالي",
+        "ممكن تلغي حجزي",
+        "اريد الغاء الحجز",
+        "هل يمكنني تمديد اقامتي ليلة اخرى",
+        "احتاج غرفة مفردة من الخميس الى السبت",
+        "اكد لي الحجز رقم",
+        "ما هي الغرف المتوفرة الاسبوع القادم",
+        "I want to book a room",
+    ],
+    "issue_agent": [
+        "عندي مشكلة في التكييف في غرفتي",
+        "المكيف لا يعمل",
+        "الحمام فيه تسريب ماء",
+        "التلفزيون خربان",
+        "الانترنت ما يشتغل",
+        "اريد تقديم شكوى",
+        "الغرفة غير نظيفة",
+        "في ازعاج من الغرفة المجاورة",
+        "المفتاح لا يفتح الباب",
+        "ما في ماء حار في الدش",
+        "ما هي حالة البلاغ الذي قدمته",
+        "the air conditioning is broken",
+    ],
+    "maps_agent": [
+        "كيف أصل الى الفندق من محطة القطار؟",
+        "كيف اروح المطار من الفندق",
+        "ما هو عنوان الفندق",
+        "وين اقرب مطعم",
+        "كم المسافة الى وسط المدينة",
+        "اعطني الاتجاهات الى المول",
+        "هل يوجد صيدلية قريبة",
+        "كم يستغرق الطريق الى البحر",
+        "وين موقع الفندق على الخريطة",
+        "اين اقرب محطة مترو",
+        "دلني على طريق المتحف",
+        "how do I get to the airport",
+    ],
+    NO_INTENT: [
+        "اهلا، انا اسمي حسن",
+        "مرحبا",
+        "السلام عليكم",
+        "صباح الخير",
+        "شكرا جزيلا",
+        "اسمي سارة",
+        "نعم",
+        "لا شكرا",
+        "مع السلامة",
+        "من انت",
+        "ماذا تستطيع ان تفعل",
+        "hello my name is Ali",
+        # Amenity and FAQ questions share words with the intents above
+        # ("هل يوجد", "الفندق", "غرفة") but are answered by the coordinator
+        "هل يوجد مسبح",
+        "هل يوجد مسبح في الفندق",
+        "هل عندكم نادي رياضي",
+        "هل يوجد موقف سيارات في الفندق",
+        "متى موعد الافطار",
+        "هل الافطار مشمول",
+        "متى وقت تسجيل الدخول",
+        "متى وقت تسجيل الخروج",
+        "هل عندكم واي فاي في الغرفة",
+        "ما هي كلمة سر الانترنت",
+        "هل يوجد سبا في الفندق",
+        "هل تسمحون بالحيوانات الاليفة",
+        "do you have a pool",
+        "what time is breakfast",
+    ],
+}
+
+
+def word_forms(word: str) -> Tuple[str, ...]:
+    """The word and what is left of it without each leading clitic."""
+    return (word,) + tuple(word[len(clitic):] for clitic in CLITICS
+                           if word.startswith(clitic) and len(word) - len(clitic) >= 2)
+
+
+def compile_rule(rule: str) -> Tuple[Tuple[str, bool], ...]:
+    """A rule as (word, is_prefix) pairs."""
+    return tuple((word.rstrip("*"), word.endswith("*")) for word in normalize_arabic(rule).split())
+
+
+def char_ngrams(text: str, sizes: Sequence[int] = NGRAM_SIZES) -> List[str]:
+    """Character n-grams of each word, padded so prefixes and suffixes count."""
+    grams = []
+    for word in text.split():
+        padded = f" {word} "
+        for n in sizes:
+            grams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+    return grams
+
+
+class IntentClassifier:
+    """Multinomial Naive Bayes over character n-grams, combined with keyword
+    rules. Word stems, prefixes (ال, و, ب) and dialect spellings share most
+    n-grams, so a few examples per intent generalize further than word lists.
+
+    All log probabilities are computed once up front; classify() only sums them.
+    """
+
+    def __init__(self, examples: Dict[str, List[str]] = EXAMPLES, rules: Dict[str, List[str]] = RULES,
+                 alpha: float = 0.5, rule_weight: float = RULE_WEIGHT, ngram_weight: float = NGRAM_WEIGHT):
+        self.intents = list(examples)
+        self.rules = {intent: [compile_rule(rule) for rule in phrases] for intent, phrases in rules.items()}
+        patterns = {pattern for phrases in self.rules.values() for rule in phrases for pattern in rule}
+        self._exact = {word for word, is_prefix in patterns if not is_prefix}
+        self._prefixes = {word for word, is_prefix in patterns if is_prefix}
+        self._prefix_lengths = sorted({len(word) for word in self._prefixes})
+        self._rules_by_first = defaultdict(list)
+        for intent, phrases in self.rules.items():
+            for rule in phrases:
+                self._rules_by_first[rule[0]].append((intent, rule))
+        self.rule_weight = rule_weight
+        self.ngram_weight = ngram_weight
+
+        counts = {intent: Counter() for intent in self.intents}
+        for intent, texts in examples.items():
+            for text in texts:
+                counts[intent].update(char_ngrams(normalize_arabic(text)))
+        vocabulary = set().union(*counts.values())
+        totals = {intent: sum(c.values()) + alpha * len(vocabulary) for intent, c in counts.items()}
+        total_examples = sum(len(texts) for texts in examples.values())
+
+        self.priors = [math.log(len(examples[intent]) / total_examples) for intent in self.intents]
+        # Unseen n-grams add the same per-intent term; known ones store their own
+        self.unseen = [math.log(alpha / totals[intent]) for intent in self.intents]
+        self.log_probs: Dict[str, Tuple[float, ...]] = {
+            gram: tuple(math.log((counts[intent][gram] + alpha) / totals[intent]) for intent in self.intents)
+            for gram in vocabulary
+        }
+
+    def _word_patterns(self, forms: Tuple[str, ...]) -> set:
+        """The (word, is_prefix) rule patterns that any form of a word matches."""
+        matched = set()
+        for form in forms:
+            if form in self._exact:
+                matched.add((form, False))
+            for n in self._prefix_lengths:
+                if form[:n] in self._prefixes:
+                    matched.add((form[:n], True))
+        return matched
+
+    def rule_hits(self, normalized: str) -> List[str]:
+        words = [self._word_patterns(word_forms(word)) for word in WORD.findall(normalized)]
+        hits = set()
+        for start, matched in enumerate(words):
+            for pattern in matched:
+                for intent, rule in self._rules_by_first[pattern]:
+                    if intent not in hits and all(
+                        start + i < len(words) and rule[i] in words[start + i] for i in range(1, len(rule))
+                    ):
+                        hits.add(intent)
+        return [intent for intent in self.rules if intent in hits]
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """Posterior probability of each intent for text."""
+        return self._scores(normalize_arabic(text))[0]
+
+    def _scores(self, normalized: str) -> Tuple[Dict[str, float], List[str]]:
+        grams = char_ngrams(normalized)
+        hits = self.rule_hits(normalized)
+        evidence = [sum(column) for column in zip(*(self.log_probs.get(gram, self.unseen) for gram in grams))]
+        # Naive Bayes is wildly overconfident on longer texts (overlapping n-grams
+        # are far from independent), so the evidence is averaged per n-gram
+        scale = self.ngram_weight / max(len(grams), 1)
+        logits = [
+            prior + scale * log_likelihood + (self.rule_weight if intent in hits else 0.0)
+            for intent, prior, log_likelihood in zip(self.intents, self.priors, evidence or [0.0] * len(self.intents))
+        ]
+        top = max(logits)
+        weights = [math.exp(logit - top) for logit in logits]
+        total = sum(weights)
+        return {intent: weight / total for intent, weight in zip(self.intents, weights)}, hits
+
+    def classify(self, text: str) -> Tuple[str, float]:
+        """The most likely intent and its probability. A NO_INTENT rule hit
+        always yields NO_INTENT, whatever else the text asks for."""
+        scores, hits = self._scores(normalize_arabic(text))
+        if NO_INTENT in hits:
+            return NO_INTENT, scores[NO_INTENT]
+        intent = max(scores, key=scores.get)
+        return intent, scores[intent]
+
+
+intent_classifier = IntentClassifier()
+
+
+def _turn_text(content: Optional[types.Content]) -> str:
+    if not content or not content.parts:
+        return ""
+    return "".join(part.text for part in content.parts if part.text)
+
+
+class IntentRouterPlugin(BasePlugin):
+    """Answers the coordinator's model call with transfer_to_agent when the
+    guest's message has an obvious intent.
+
+    Only the first model call of a turn is routed: later calls (after a tool
+    response, or when a sub-agent hands the conversation back) need the model.
+    The transfer goes through ADK's normal function-call handling, so events,
+    session history and the sub-agent's view of the conversation are the same
+    as when the model makes the call. Register it before other plugins; the
+    first plugin to return a response short-circuits the rest.
+    """
+
+    def __init__(self, coordinator_name: str = "root_coordinator",
+                 classifier: IntentClassifier = intent_classifier,
+                 threshold: float = CONFIDENCE_THRESHOLD):
+        super().__init__(name="intent_router")
+        self.coordinator_name = coordinator_name
+        self.classifier = classifier
+        self.threshold = threshold
+        self.decisions = 0
+        self.routed: Dict[str, int] = defaultdict(int)
+        self.classify_seconds = 0.0
+        self.coordinator_calls = 0
+        self.coordinator_seconds = 0.0
+        self._started: Dict[str, float] = {}
+
+    async def before_model_callback(self, *, callback_context: CallbackContext,
+                                    llm_request: LlmRequest) -> Optional[LlmResponse]:
+        if callback_context.agent_name != self.coordinator_name:
+            return None
+        text = _turn_text(callback_context.user_content)
+        last = llm_request.contents[-1] if llm_request.contents else None
+        # Fresh guest text only, and only if the coordinator can transfer
+        if (not text or last is None or last.role != "user" or _turn_text(last) != text
+                or "transfer_to_agent" not in llm_request.tools_dict):
+            self._started[callback_context.invocation_id] = time.perf_counter()
+            return None
+
+        start = time.perf_counter()
+        intent, confidence = self.classifier.classify(text)
+        self.classify_seconds += time.perf_counter() - start
+        self.decisions += 1
+        if intent == NO_INTENT or confidence < self.threshold:
+            self._started[callback_context.invocation_id] = time.perf_counter()
+            return None
+
+        self.routed[intent] += 1
+        return LlmResponse(content=types.Content(role="model", parts=[
+            types.Part(function_call=types.FunctionCall(name="transfer_to_agent", args={"agent_name": intent}))
+        ]))
+
+    async def after_model_callback(self, *, callback_context: CallbackContext,
+                                   llm_response: LlmResponse) -> Optional[LlmResponse]:
+        # With SSE streaming this runs for every chunk; only the final response is timed
+        if llm_response.partial:
+            return None
+        start = self._started.pop(callback_context.invocation_id, None)
+        if start is not None:
+            self.coordinator_calls += 1
+            self.coordinator_seconds += time.perf_counter() - start
+        return None
+
+    def stats(self) -> dict:
+        routed = sum(self.routed.values())
+        coordinator_ms = self.coordinator_seconds / self.coordinator_calls * 1000 if self.coordinator_calls else 0.0
+        return {
+            "decisions": self.decisions,
+            "routed": dict(self.routed),
+            "hit_rate": routed / self.decisions if self.decisions else 0.0,
+            "avg_classify_us": self.classify_seconds / self.decisions * 1e6 if self.decisions else 0.0,
+            "avg_coordinator_ms": coordinator_ms,
+            # Each routed turn skips one coordinator model call
+            "est_saved_ms": routed * coordinator_ms,
+        }
+
+
+if __name__ == "__main__":
+    queries = [text for texts in EXAMPLES.values() for text in texts] + [
+        "الغرفة ٢٠٣ فيها مشكلة في الإضاءة",
+        "أبغى أحجز جناح لليلتين",
+        "وين أقرب صراف آلي؟",
+        "عندي مشكلة في حجزي",
+        "ممكن تساعدني",
+    ]
+    for query in queries[-5:]:
+        print(query, intent_classifier.classify(query))
+
+    start = time.perf_counter()
+    rounds = 200
+    for _ in range(rounds):
+        for query in queries:
+            intent_classifier.classify(query)
+    print(f"classify: {(time.perf_counter() - start) / (rounds * len(queries)) * 1e6:.1f} µs per query")
@@ -0,0 +1,116 @@
+"""Load generator for server.py: many concurrent guests, each holding a
+WebSocket conversation, at increasing concurrency.
+
+    python loadgen.py                              # in-process server with stand-in models
+    python loadgen.py --url http://127.0.0.1:8080  # an already running server
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import time
+from typing import List, Tuple
+
+import httpx # type: ignore
+import uvicorn # type: ignore
+import websockets # type: ignore
+from google.adk.runners import Runner # type: ignore
+from google.adk.sessions import InMemorySessionService # type: ignore
+
+from benchmark import QUERIES, LatencyModel, LatencyRecorder, install_stand_ins
+from Hotel_Agent.agent import coordinator_agent
+from server import APP_NAME, AgentServer, create_app
+
+
+async def guest(client: httpx.AsyncClient, ws_url: str, turns: int,
+                recorder: LatencyRecorder, rng: random.Random) -> int:
+    """One guest conversation. Returns the number of rejected turns."""
+    response = await client.post("/sessions", json={})
+    response.raise_for_status()
+    ids = response.json()
+    rejected = 0
+
+    async with websockets.connect(
+            f"{ws_url}/sessions/{ids['session_id']}/ws?user_id={ids['user_id']}") as socket_:
+        for _ in range(turns):
+            start = time.perf_counter()
+            first_partial = None
+            await socket_.send(json.dumps({"text": rng.choice(QUERIES)}))
+            while True:
+                message = json.loads(await socket_.recv())
+                if message["type"] == "partial" and first_partial is None:
+                    first_partial = time.perf_counter() - start
+                elif message["type"] == "final":
+                    recorder.add("turn", time.perf_counter() - start)
+                    if first_partial is not None:
+                        recorder.add("first_partial", first_partial)
+                    break
+                elif message["type"] == "error":
+                    rejected += 1
+                    break
+    return rejected
+
+
+async def run_load(base_url: str, concurrency: int, turns: int, seed: int = 0) -> Tuple[LatencyRecorder, float]:
+    recorder = LatencyRecorder()
+    ws_url = base_url.replace("http", "ws", 1)
+    rng = random.Random(seed)
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        start = time.perf_counter()
+        rejected = await asyncio.gather(*(guest(client, ws_url, turns, recorder, rng) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        stats = (await client.get("/stats")).json()
+
+    completed = len(recorder.samples["turn"])
+    recorder.print_report(f"{concurrency} concurrent guest(s), {turns} turns each")
+    print(f"Throughput: {completed / elapsed:.2f} turns/s, rejected: {sum(rejected)}, "
+          f"server p95: {stats['p95_ms']:.1f} ms")
+    return recorder, elapsed
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def main_async(args):
+    server = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        install_stand_ins(LatencyModel(args.model_latency, args.model_latency * 2.5, seed=2))
+        runner = Runner(agent=coordinator_agent, app_name=APP_NAME, session_service=InMemorySessionService())
+        agent_server = AgentServer(runner, max_concurrent_turns=args.max_concurrent_turns)
+        port = free_port()
+        server = uvicorn.Server(uvicorn.Config(create_app(agent_server), host="127.0.0.1", port=port,
+                                               log_level="warning"))
+        serving = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.05)
+        base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        for concurrency in args.concurrency:
+            await run_load(base_url, concurrency, args.turns)
+    finally:
+        if server:
+            server.should_exit = True
+            await serving
+
+
+def parse_args(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Base URL of a running server; starts one in-process if omitted")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--turns", type=int, default=5, help="Turns per guest")
+    parser.add_argument("--model-latency", type=float, default=0.45,
+                        help="Median stand-in model latency in seconds (in-process server only)")
+    parser.add_argument("--max-concurrent-turns", type=int, default=32)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main_async(parse_args()))
@@ -1,13 +1,19 @@
 import asyncio
-import uuid
+import time
+from app_state import event_text, initial_state, open_session_service
 from Hotel_Agent.agent import coordinator_agent
-from dotenv import load_dotenv # type: ignore
+from Hotel_Agent.sub_agents.issues_agent.tickets import ticket_engine
+from Hotel_Agent.sub_agents.maps_agent.agent import maps_toolset
+from intent_router import IntentRouterPlugin
+from response_cache import ResponseCachePlugin
+from google.adk.agents.run_config import RunConfig, StreamingMode # type: ignore
 from google.adk.runners import Runner # type: ignore
-from google.adk.sessions import InMemorySessionService # type: ignore
 from google.genai import types # type: ignore
 from STT import *
 from TTS import *
 VERBOSE = False
+USE_TASHKEEL = False
+STREAM_RESPONSES = True
 
 async def display_state(session_service, app_name, user_id, session_id):
     """Display the current state of the session."""
@@ -34,13 +40,9 @@ async def process_agent_response(event):
 
     final_response = None
     if event.is_final_response():
-        if (
-            event.content
-            and event.content.parts
-            and hasattr(event.content.parts[0], "text")
-            and event.content.parts[0].text
-        ):
-            final_response = event.content.parts[0].text.strip()
+        text = event_text(event)
+        if text and not text.isspace():
+            final_response = text.strip()
             
             # print("==" * 30)
             # print(f"Agent Response: {final_response}")
@@ -70,49 +72,135 @@ async def call_agent_async(runner, user_id, session_id, query):
 
     return final_response_text
 
+async def call_agent_streaming_async(runner, user_id, session_id, query, tts_client, use_tashkeel=False):
+    """Call the agent with SSE streaming and speak each sentence as soon as it is
+    generated, instead of waiting for the whole multi-agent chain to finish."""
+    content = types.Content(role="user", parts=[types.Part(text=query)])
+
+    await display_state(runner.session_service, runner.app_name, user_id, session_id)
 
-load_dotenv()
-session_service = InMemorySessionService()
+    start = time.perf_counter()
+    time_to_first_token = None
+    sentences = asyncio.Queue()
 
-rooms_db = {
-    "room_101": {"type": "single", "price": 100, "available": True},
-    "room_102": {"type": "double", "price": 150, "available": True},
-    "room_103": {"type": "suite", "price": 300, "available": False},
-    "room_104": {"type": "single", "price": 100, "available": True},
-}
+    async def sentence_source():
+        while True:
+            sentence = await sentences.get()
+            if sentence is None:
+                return
+            yield sentence
 
-initial_state = {
-    "user_name": "User", 
-    "recent_bookings": [],
-    "pending_issues": [],
-    "rooms_db": rooms_db,
-}
+    speaking = asyncio.create_task(
+        tts_client.speak_sentences_async(sentence_source(), use_tashkeel=use_tashkeel, start=start)
+    )
+
+    final_response_text = None
+    buffer = ""
+    streamed = False
+    try:
+        run_config = RunConfig(streaming_mode=StreamingMode.SSE)
+        async for event in runner.run_async(user_id=user_id, session_id=session_id, new_message=content,
+                                            run_config=run_config):
+            text = event_text(event)
+            if event.partial:
+                if not text:
+                    continue
+                if time_to_first_token is None:
+                    time_to_first_token = time.perf_counter() - start
+                streamed = True
+                buffer += text
+                complete, buffer = split_complete_sentences(buffer)
+                for sentence in complete:
+                    sentences.put_nowait(sentence)
+                continue
 
-gcp_tts = GCP_TTS()
-playai_tts = PlayAI_TTS()
-TTS_client = TTSClient(gcp_tts)
+            response = await process_agent_response(event)
+            if response:
+                final_response_text = response
+            if streamed:
+                # The aggregated event repeats the streamed text; only the
+                # unterminated last sentence is still left to speak
+                if is_speakable(buffer):
+                    sentences.put_nowait(buffer.strip())
+            elif text:
+                # The model answered without partial events
+                if time_to_first_token is None:
+                    time_to_first_token = time.perf_counter() - start
+                for sentence in split_sentences(text):
+                    sentences.put_nowait(sentence)
+            buffer = ""
+            streamed = False
+    except Exception as e:
+        print(f"Error during agent call: {e}")
+    finally:
+        if is_speakable(buffer):
+            sentences.put_nowait(buffer.strip())
+        sentences.put_nowait(None)
+
+    time_to_first_audio = None
+    try:
+        time_to_first_audio = await speaking
+    except Exception as e:
+        print(f"Error during speech playback: {e}")
+    if time_to_first_token is not None:
+        print(f"Time to first token: {time_to_first_token:.2f}s")
+    if time_to_first_audio is not None:
+        print(f"Time to first audio: {time_to_first_audio:.2f}s")
+
+    await display_state(runner.session_service, runner.app_name, user_id, session_id)
+
+    return final_response_text
 
-gcp_stt = GCP_STT()
-groq_stt = GroqWhisper_STT()
-STT_client = STTClient(gcp_stt)
 
 async def main_async():
+    # Start the maps MCP server now, so npx and the handshake overlap client setup
+    # instead of delaying the first directions request
+    maps_toolset.start()
+
+    # Vendor clients are created here rather than at import time, so the agent
+    # helpers above can be imported without credentials (see benchmark.py)
+    gcp_tts = GCP_TTS()
+    playai_tts = PlayAI_TTS()
+    TTS_client = TTSClient(RoutingTTS([gcp_tts, playai_tts]))
+    if USE_TASHKEEL:
+        TTS_client.vocalizer.warm_up()
+
+    gcp_stt = GCP_STT()
+    groq_stt = GroqWhisper_STT()
+    STT_client = STTClient(gcp_stt)
+
+    # Escalate issue tickets that breach their SLA while the app runs
+    ticket_engine.start()
+
     # Setup constants
     APP_NAME = "Hotel Customer Support"
-    USER_ID = str(uuid.uuid4())
-
-    new_session = await session_service.create_session(
-        app_name=APP_NAME,
-        user_id=USER_ID,
-        state=initial_state,
-    )
-    SESSION_ID = new_session.id
-    print(f"Created new session: {SESSION_ID}")
+    # One guest per device: a stable id keeps their bookings and tickets
+    # reachable, and their conversation resumes after a restart
+    USER_ID = "local_guest"
+
+    session_service = open_session_service()
+
+    existing_sessions = await session_service.list_sessions(app_name=APP_NAME, user_id=USER_ID)
+    if existing_sessions.sessions:
+        # Sessions are listed oldest update first
+        SESSION_ID = existing_sessions.sessions[-1].id
+        print(f"Continuing existing session: {SESSION_ID}")
+    else:
+        new_session = await session_service.create_session(
+            app_name=APP_NAME,
+            user_id=USER_ID,
+            state=initial_state,
+        )
+        SESSION_ID = new_session.id
+        print(f"Created new session: {SESSION_ID}")
 
     runner = Runner(
         agent=coordinator_agent,
         app_name=APP_NAME,
         session_service=session_service,
+        # Repeated questions are answered from cache; obvious requests go straight
+        # to their sub-agent, skipping a coordinator model call
+        plugins=[ResponseCachePlugin(), IntentRouterPlugin(coordinator_agent.name)],
     )
 
     print("\nWelcome to Customer Service Chat!")
@@ -120,20 +208,24 @@ async def main_async():
 
     while True:
         # user_input = input("You: ")
-        # user_input = STT_client.listen_and_transcribe()
+        # user_input = await STT_client.listen_and_transcribe_async()
         user_input = "اهلا، انا اسمي حسن"
 
         if user_input.lower() in ["exit", "quit"]:
             print("Ending conversation. Goodbye!")
             break
 
+        if STREAM_RESPONSES:
+            response = await call_agent_streaming_async(
+                runner, USER_ID, SESSION_ID, user_input, TTS_client, use_tashkeel=USE_TASHKEEL
+            )
+            print(f"Agent: {response}")
+            continue
+
         response = await call_agent_async(runner, USER_ID, SESSION_ID, user_input)
         print(f"Agent: {response}")
         if response:
-            TTS_client.speak(response)
-            TTS_client.set_strategy(playai_tts)
-            TTS_client.speak(response)
-            TTS_client.set_strategy(gcp_tts)
+            await TTS_client.speak_async(response, use_tashkeel=USE_TASHKEEL)
 
     final_session = await session_service.get_session(
         app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID
@@ -141,6 +233,10 @@ async def main_async():
     print("\nFinal Session State:")
     for key, value in final_session.state.items():
         print(f"{key}: {value}")
+    print(f"Maps MCP server: {maps_toolset.stats()}")
+    await maps_toolset.close()
+    ticket_engine.stop()
+    session_service.close()
 
 
 def main():
@@ -0,0 +1,312 @@
+"""Record and replay the model calls of agent conversations.
+
+Recording runs conversations through the real agents and Gemini, logging
+every model request fingerprint and response. Replaying runs the same
+conversations with each agent's model swapped for a stand-in that answers from
+the log, so the rest of the stack (tools, state, session service) runs for
+real, deterministically and offline:
+
+    python replay.py record model_calls.jsonl.gz          # needs Gemini credentials
+    python replay.py replay model_calls.jsonl.gz          # offline, recorded model latency
+    python replay.py replay model_calls.jsonl.gz --latency-scale 0 --repeat 5 --profile
+    python replay.py replay model_calls.jsonl.gz --sqlite /tmp/replay.db
+
+Replay reports wall-clock time per agent hop (model call) and tool call. A
+request the log has no answer for means the agents now ask the model something
+different than when recorded; it is reported and ends that conversation.
+Record and replay must use the same plugins (none by default), since the
+intent router and response cache change which model calls happen, and the
+same maps server: the local fake one unless TOMTOM_MCP_FAKE is set to "".
+"""
+import argparse
+import asyncio
+import copy
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+import uuid
+from collections import defaultdict
+from typing import AsyncGenerator, Dict, List, Optional
+
+# Record and replay against the local fake maps MCP server, so replays need no
+# TomTom API key and find the same tools that were recorded
+os.environ.setdefault("TOMTOM_MCP_FAKE", "1")
+
+from google.adk.models.base_llm import BaseLlm # type: ignore
+from google.adk.models.llm_request import LlmRequest # type: ignore
+from google.adk.models.llm_response import LlmResponse # type: ignore
+from google.adk.runners import Runner # type: ignore
+from google.adk.sessions import InMemorySessionService # type: ignore
+from google.genai import types # type: ignore
+
+import app_state
+from benchmark import QUERIES, LatencyRecorder, TimingPlugin
+from Hotel_Agent.agent import coordinator_agent
+from Hotel_Agent.sub_agents.maps_agent.agent import maps_toolset
+
+APP_NAME = "Hotel Customer Support Replay"
+
+# Every benchmark query in one conversation, then each request on its own
+CONVERSATIONS = [QUERIES] + [[query] for query in QUERIES[1:]]
+
+# Values that differ between otherwise identical runs: timestamps and dates
+# (booking and ticket times, stays starting today), user ids (uuids, the
+# owners of bookings and tickets) and record ids (8 hex characters from
+# RecordStore.new_id)
+GENERATED_VALUES = [
+    (re.compile(r"\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?"), "<time>"),
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b"), "<user>"),
+    (re.compile(r"\b(?=[0-9a-f]{0,7}\d)[0-9a-f]{8}\b"), "<id>"),
+]
+
+
+class ReplayMismatch(Exception):
+    """The agents sent a model request that was not recorded."""
+
+
+def normalize_generated(text: str) -> str:
+    for pattern, placeholder in GENERATED_VALUES:
+        text = pattern.sub(placeholder, text)
+    return text
+
+
+def request_key(agent_name: str, llm_request: LlmRequest) -> str:
+    """Fingerprint of a model request: what the agent has seen so far.
+
+    Ignores what differs between otherwise identical runs: function call ids,
+    the instruction (today's date, the state block) and the generated ids and
+    timestamps in tool results, whether returned to this agent or quoted to it
+    as another agent's turn. Everything else in a result counts, so a tool that
+    now fails where it succeeded when recorded is a mismatch.
+    """
+    items = [agent_name]
+    for content in llm_request.contents:
+        for part in content.parts or []:
+            if part.function_call:
+                args = json.dumps(part.function_call.args or {}, sort_keys=True, ensure_ascii=False)
+                items.append(f"call:{part.function_call.name}:{args}")
+            elif part.function_response:
+                result = json.dumps(part.function_response.response or {}, sort_keys=True,
+                                    ensure_ascii=False, default=str)
+                items.append(f"result:{part.function_response.name}:{normalize_generated(result)}")
+            elif part.text and not part.thought:
+                items.append(f"{content.role}:{normalize_generated(part.text)}")
+    return hashlib.sha1("\n".join(items).encode()).hexdigest()[:16]
+
+
+class ModelLog:
+    """Guest turns and model calls of recorded conversations, stored as one JSON
+    object per line (gzipped when the path ends in .gz).
+
+    A call holds every response the model yielded (partials included) and when,
+    relative to the request. Identical requests recorded more than once are
+    answered in recorded order.
+    """
+
+    def __init__(self):
+        self.conversations: List[List[str]] = []
+        self.calls: Dict[str, List[dict]] = defaultdict(list)
+        self._served: Dict[str, int] = defaultdict(int)
+
+    def add_call(self, agent_name: str, key: str, responses: List[LlmResponse], offsets: List[float]):
+        self.calls[key].append({
+            "agent": agent_name,
+            "key": key,
+            "offsets": [round(offset, 4) for offset in offsets],
+            "responses": [response.model_dump(mode="json", exclude_none=True) for response in responses],
+        })
+
+    def next_call(self, key: str) -> Optional[dict]:
+        recorded = self.calls.get(key)
+        if not recorded:
+            return None
+        call = recorded[self._served[key] % len(recorded)]
+        self._served[key] += 1
+        return call
+
+    def save(self, path: str):
+        with (gzip.open if path.endswith(".gz") else open)(path, "wt", encoding="utf-8") as f:
+            for turns in self.conversations:
+                f.write(json.dumps({"conversation": turns}, ensure_ascii=False) + "\n")
+            for recorded in self.calls.values():
+                for call in recorded:
+                    f.write(json.dumps(call, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    @classmethod
+    def load(cls, path: str) -> "ModelLog":
+        log = cls()
+        with (gzip.open if path.endswith(".gz") else open)(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                if "conversation" in entry:
+                    log.conversations.append(entry["conversation"])
+                else:
+                    log.calls[entry["key"]].append(entry)
+        return log
+
+
+class RecordingLlm(BaseLlm):
+    """Passes requests to the real model and logs its responses."""
+
+    inner: BaseLlm
+    agent_name: str
+    log: ModelLog
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        key = request_key(self.agent_name, llm_request)
+        start = time.perf_counter()
+        responses, offsets = [], []
+        async for response in self.inner.generate_content_async(llm_request, stream):
+            offsets.append(time.perf_counter() - start)
+            responses.append(response)
+            yield response
+        self.log.add_call(self.agent_name, key, responses, offsets)
+
+
+class ReplayLlm(BaseLlm):
+    """Stand-in model answering from a ModelLog, after the recorded latency
+    times latency_scale (0 to measure only the agent stack's own overhead)."""
+
+    agent_name: str
+    log: ModelLog
+    latency_scale: float = 1.0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        key = request_key(self.agent_name, llm_request)
+        call = self.log.next_call(key)
+        if call is None:
+            raise ReplayMismatch(f"No recorded response for {self.agent_name} request {key}")
+        elapsed = 0.0
+        for offset, response in zip(call["offsets"], call["responses"]):
+            if self.latency_scale:
+                await asyncio.sleep((offset - elapsed) * self.latency_scale)
+            elapsed = offset
+            yield LlmResponse.model_validate(response)
+
+
+def install_models(agent, make_model):
+    """Replaces the model of agent and all its sub-agents with make_model(agent).
+    Agents are modified in place, so only use this in harness processes."""
+    agent.model = make_model(agent)
+    for sub_agent in agent.sub_agents:
+        install_models(sub_agent, make_model)
+
+
+async def run_conversations(conversations: List[List[str]], recorder: LatencyRecorder,
+                            session_service=None) -> int:
+    """Runs each conversation in a new session, one turn after another.
+    Returns the number of conversations cut short by an error, such as a
+    ReplayMismatch or a recorded call to a tool that no longer exists."""
+    runner = Runner(
+        agent=coordinator_agent,
+        app_name=APP_NAME,
+        session_service=session_service or InMemorySessionService(),
+        plugins=[TimingPlugin(recorder)],
+    )
+    failures = 0
+    for turns in conversations:
+        user_id = str(uuid.uuid4())
+        session = await runner.session_service.create_session(
+            app_name=APP_NAME, user_id=user_id, state=copy.deepcopy(app_state.initial_state))
+        for text in turns:
+            start = time.perf_counter()
+            content = types.Content(role="user", parts=[types.Part(text=text)])
+            try:
+                async for _ in runner.run_async(user_id=user_id, session_id=session.id, new_message=content):
+                    pass
+            except Exception as e:
+                print(f"⚠️ Conversation stopped at {text!r}: {e!r}")
+                failures += 1
+                break
+            recorder.add("turn", time.perf_counter() - start)
+    return failures
+
+
+async def record(path: str, conversations: List[List[str]] = CONVERSATIONS):
+    log = ModelLog()
+    log.conversations = conversations
+    install_models(coordinator_agent, lambda agent: RecordingLlm(
+        model=agent.canonical_model.model, inner=agent.canonical_model, agent_name=agent.name, log=log))
+    recorder = LatencyRecorder()
+    try:
+        await run_conversations(conversations, recorder)
+    finally:
+        await maps_toolset.close()
+        log.save(path)
+    recorder.print_report(f"Recorded {sum(len(c) for c in log.calls.values())} model calls to {path}")
+
+
+async def replay(path: str, latency_scale: float = 1.0, repeat: int = 1, sqlite_path: Optional[str] = None) -> int:
+    log = ModelLog.load(path)
+    install_models(coordinator_agent, lambda agent: ReplayLlm(
+        model=f"replay-{agent.name}", agent_name=agent.name, log=log, latency_scale=latency_scale))
+    session_service = None
+    if sqlite_path:
+        from session_service import SQLiteSessionService
+        session_service = SQLiteSessionService(sqlite_path)
+    recorder = LatencyRecorder()
+    try:
+        failures, elapsed = 0, 0.0
+        for _ in range(repeat):
+            # Each repeat books the same rooms and files the same tickets again
+            app_state.reset_records()
+            start = time.perf_counter()
+            failures += await run_conversations(log.conversations, recorder, session_service)
+            elapsed += time.perf_counter() - start
+    finally:
+        await maps_toolset.close()
+        if session_service:
+            session_service.close()
+    turns = len(recorder.samples["turn"])
+    recorder.print_report(f"Replayed {len(log.conversations) * repeat} conversation(s) from {path}, "
+                          f"latency x{latency_scale:g}")
+    print(f"{turns} turns in {elapsed:.2f}s, {failures} conversation(s) stopped early")
+    return failures
+
+
+def read_conversations(path: str) -> List[List[str]]:
+    """One guest turn per line; blank lines separate conversations."""
+    with open(path, encoding="utf-8") as f:
+        blocks = f.read().split("\n\n")
+    return [[line.strip() for line in block.splitlines() if line.strip()] for block in blocks if block.strip()]
+
+
+def parse_args(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_parser = commands.add_parser("record", help="Run conversations against the real models and log them")
+    record_parser.add_argument("log")
+    record_parser.add_argument("--conversations", help="Text file: one turn per line, blank line between conversations")
+    replay_parser = commands.add_parser("replay", help="Re-run logged conversations offline")
+    replay_parser.add_argument("log")
+    replay_parser.add_argument("--latency-scale", type=float, default=1.0,
+                               help="Multiplier for recorded model latency; 0 replays instantly")
+    replay_parser.add_argument("--repeat", type=int, default=1)
+    replay_parser.add_argument("--sqlite", help="Persist replayed sessions in this SQLite file instead of memory")
+    replay_parser.add_argument("--profile", action="store_true", help="Print the top functions by cumulative time")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "record":
+        conversations = read_conversations(args.conversations) if args.conversations else CONVERSATIONS
+        asyncio.run(record(args.log, conversations))
+    elif args.profile:
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        asyncio.run(replay(args.log, args.latency_scale, args.repeat, args.sqlite))
+        profiler.disable()
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+    else:
+        raise SystemExit(1 if asyncio.run(replay(args.log, args.latency_scale, args.repeat, args.sqlite)) else 0)
@@ -0,0 +1,190 @@
+"""Response cache for repeated, FAQ-style turns.
+
+Guests ask the same things over and over (directions, check-in time, room
+prices). ResponseCachePlugin remembers the final answer of such turns and
+replays it without running any agent:
+
+    runner = Runner(..., plugins=[ResponseCachePlugin()])
+
+Entries are keyed on the agent that receives the turn, the normalized query
+text, the agent's previous reply in the session (so "نعم" answers the question
+that was actually asked) and the versions of the state that agent's
+instruction renders (the rooms inventory, booking and ticket stores, the
+guest's name). Any change to
+that state yields a new key, so stale answers are never served; they age out
+of the LRU. Turns that write session state or change the stores they read
+(reservations, tickets, name updates) are never cached, nor are turns that
+call a tool answering from the guest's own records (see owner_scoped), since
+the key doesn't tell guests apart.
+"""
+import hashlib
+import time
+from collections import OrderedDict, defaultdict
+from typing import Dict, Optional, Set, Tuple
+
+from google.adk.agents.invocation_context import InvocationContext # type: ignore
+from google.adk.events.event import Event # type: ignore
+from google.adk.plugins.base_plugin import BasePlugin # type: ignore
+from google.adk.tools.base_tool import BaseTool # type: ignore
+from google.adk.tools.tool_context import ToolContext # type: ignore
+from google.genai import types # type: ignore
+
+from Hotel_Agent.state_renderer import state_renderer
+from arabic_text import normalize_arabic
+
+# Routes and traffic change faster than hotel facts
+AGENT_TTLS = {"maps_agent": 600.0}
+
+
+def agent_sections(agent) -> Tuple[str, ...]:
+    """State sections an agent's answers depend on: those its instruction renders."""
+    return getattr(agent.instruction, "sections", ())
+
+
+def _turn_text(content: Optional[types.Content]) -> str:
+    if not content or not content.parts:
+        return ""
+    return "".join(part.text for part in content.parts if part.text)
+
+
+def context_digest(session, invocation_id: str) -> str:
+    """Digest of the last agent reply before this turn; empty for a new conversation."""
+    for event in reversed(session.events):
+        if event.invocation_id == invocation_id or event.author == "user" or event.partial:
+            continue
+        text = _turn_text(event.content)
+        if text.strip():
+            return hashlib.sha1(normalize_arabic(text).encode()).hexdigest()[:16]
+    return ""
+
+
+class _Turn:
+    """What a cache miss did, collected from its events."""
+
+    def __init__(self, key: tuple, sections: Tuple[str, ...]):
+        self.key = key
+        self.sections = sections
+        self.started = time.perf_counter()
+        self.authors: Set[str] = set()
+        self.wrote_state = False
+        self.owner_scoped = False
+        self.response = ""
+
+
+class ResponseCachePlugin(BasePlugin):
+    """Replays the final response of an earlier identical turn.
+
+    A hit ends the invocation in before_run_callback: the runner records the
+    cached text as the model's reply, so the session history reads as if the
+    turn had run. The agent that handled the original turn does not become the
+    active agent, so the next turn is routed as usual.
+    """
+
+    def __init__(self, ttl_seconds: float = 3600.0, max_entries: int = 1024,
+                 agent_ttls: Optional[Dict[str, float]] = None, clock=time.monotonic):
+        super().__init__(name="response_cache")
+        self.ttl_seconds = ttl_seconds
+        self.agent_ttls = AGENT_TTLS if agent_ttls is None else agent_ttls
+        self.max_entries = max_entries
+        self.clock = clock
+        # key -> (response, expires_at)
+        self._entries: "OrderedDict[tuple, Tuple[str, float]]" = OrderedDict()
+        self._turns: Dict[str, _Turn] = {}
+        self.hits: Dict[str, int] = defaultdict(int)
+        self.misses = 0
+        self.stored = 0
+        self.uncacheable = 0
+        self.expired = 0
+        self.evicted = 0
+        self.miss_seconds = 0.0
+
+    def key(self, invocation_context: InvocationContext, text: str) -> Tuple[tuple, Tuple[str, ...]]:
+        agent = invocation_context.agent
+        session = invocation_context.session
+        sections = agent_sections(agent)
+        context = context_digest(session, invocation_context.invocation_id)
+        return (agent.name, normalize_arabic(text), context, state_renderer.versions(session.state, sections)), sections
+
+    async def before_run_callback(self, *, invocation_context: InvocationContext) -> Optional[types.Content]:
+        text = _turn_text(invocation_context.user_content)
+        if not text.strip():
+            return None
+        agent = invocation_context.agent
+        key, sections = self.key(invocation_context, text)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            response, expires_at = entry
+            if self.clock() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits[agent.name] += 1
+                return types.Content(role="model", parts=[types.Part(text=response)])
+            del self._entries[key]
+            self.expired += 1
+
+        self.misses += 1
+        self._turns[invocation_context.invocation_id] = _Turn(key, sections)
+        return None
+
+    async def before_tool_callback(self, *, tool: BaseTool, tool_args: dict,
+                                   tool_context: ToolContext) -> Optional[dict]:
+        turn = self._turns.get(tool_context.invocation_id)
+        if turn is not None and getattr(getattr(tool, "func", None), "owner_scoped", False):
+            turn.owner_scoped = True
+        return None
+
+    async def on_event_callback(self, *, invocation_context: InvocationContext, event: Event) -> Optional[Event]:
+        turn = self._turns.get(invocation_context.invocation_id)
+        if turn is None or event.partial:
+            return None
+        turn.authors.add(event.author)
+        if event.actions and event.actions.state_delta:
+            turn.wrote_state = True
+        if event.is_final_response():
+            text = _turn_text(event.content)
+            if text.strip():
+                turn.response = text
+        return None
+
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        turn = self._turns.pop(invocation_context.invocation_id, None)
+        if turn is None:
+            return None
+        self.miss_seconds += time.perf_counter() - turn.started
+
+        start_agent = invocation_context.agent
+        root = start_agent.root_agent
+        # Every agent that answered must depend only on state in the key
+        authors = [root.find_agent(author) for author in turn.authors if author != "user"]
+        needed = {section for agent in authors if agent for section in agent_sections(agent)}
+        unchanged = state_renderer.versions(invocation_context.session.state, turn.sections) == turn.key[-1]
+        if not turn.response or turn.wrote_state or turn.owner_scoped or not unchanged or not needed <= set(turn.sections):
+            self.uncacheable += 1
+            return None
+
+        ttl = self.agent_ttls.get(start_agent.name, self.ttl_seconds)
+        self._entries[turn.key] = (turn.response, self.clock() + ttl)
+        self._entries.move_to_end(turn.key)
+        self.stored += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evicted += 1
+        return None
+
+    def stats(self) -> dict:
+        hits = sum(self.hits.values())
+        lookups = hits + self.misses
+        avg_miss = self.miss_seconds / self.misses if self.misses else 0.0
+        return {
+            "entries": len(self._entries),
+            "hits": dict(self.hits),
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "stored": self.stored,
+            "uncacheable": self.uncacheable,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "avg_miss_ms": avg_miss * 1000,
+            # Each hit skips a whole agent run of about the average miss
+            "est_saved_ms": hits * avg_miss * 1000,
+        }
@@ -0,0 +1,363 @@
+"""Multi-session serving front end for the coordinator agent.
+
+Many guest conversations share one Runner and session service:
+
+    python server.py --port 8080
+
+    POST /sessions                      {"user_id": "..."}  -> {"user_id", "session_id"}
+    POST /sessions/{session_id}/turns   {"user_id", "text"} -> {"response", "latency_ms"}
+    WS   /sessions/{session_id}/ws?user_id=...   send {"text"}, receive partial/final messages
+    GET  /health, GET /stats
+    GET  /tickets/next                  staff: the most urgent open issue ticket
+    POST /tickets/claim                 {"assignee"} -> that ticket, now in progress
+
+Turns of one session run one at a time in arrival order. Each session may have
+a few turns queued and the whole server a bounded number in flight; beyond
+that requests are rejected (429/503) instead of queueing without limit.
+"""
+import argparse
+import asyncio
+import copy
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import numpy as np
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect # type: ignore
+from google.adk.agents.run_config import RunConfig, StreamingMode # type: ignore
+from google.adk.runners import Runner # type: ignore
+from google.genai import types # type: ignore
+from pydantic import BaseModel # type: ignore
+
+import app_state
+from Hotel_Agent.sub_agents.issues_agent.tickets import TicketEngine
+
+APP_NAME = "Hotel Customer Support"
+
+PartialCallback = Callable[[str], Awaitable[None]]
+
+
+class Busy(Exception):
+    """A turn was rejected because a queue is full or the server is shutting down."""
+
+    def __init__(self, status_code: int, reason: str):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+
+
+class SessionWorker:
+    """Runs the turns of one session one at a time, in the order they arrive.
+    Exits after idle_seconds without turns; the next turn starts a new worker."""
+
+    def __init__(self, server: "AgentServer", user_id: str, session_id: str):
+        self.server = server
+        self.user_id = user_id
+        self.session_id = session_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=server.max_pending_per_session)
+        self.stopping = False
+        self.task = asyncio.create_task(self._run())
+
+    def submit(self, text: str, on_partial: Optional[PartialCallback]) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((text, on_partial, future))
+        except asyncio.QueueFull:
+            raise Busy(429, "Too many turns pending for this session")
+        return future
+
+    def stop(self):
+        """Lets the queued turns finish, then exits. Never waits: with a full
+        queue the worker is busy and notices the flag once it has drained it."""
+        self.stopping = True
+        try:
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+    async def _run(self):
+        while True:
+            if self.stopping and self.queue.empty():
+                return
+            try:
+                item = await asyncio.wait_for(self.queue.get(), self.server.idle_seconds)
+            except asyncio.TimeoutError:
+                if self.queue.empty():
+                    self.server.workers.pop((self.user_id, self.session_id), None)
+                    return
+                continue
+            if item is None:
+                return
+            text, on_partial, future = item
+            try:
+                async with self.server.turn_slots:
+                    response = await self.server.run_turn(self.user_id, self.session_id, text, on_partial)
+                if not future.done():
+                    future.set_result(response)
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.set_exception(Busy(503, "Server is shutting down"))
+                raise
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self.server.pending -= 1
+
+
+class AgentServer:
+    """Multiplexes guest sessions onto one shared Runner."""
+
+    def __init__(self, runner: Runner, initial_state: Optional[dict] = None,
+                 max_concurrent_turns: int = 32, max_pending_turns: int = 512,
+                 max_pending_per_session: int = 4, idle_seconds: float = 300.0):
+        self.runner = runner
+        self.initial_state = initial_state if initial_state is not None else app_state.initial_state
+        self.max_pending_turns = max_pending_turns
+        self.max_pending_per_session = max_pending_per_session
+        self.idle_seconds = idle_seconds
+        # Caps turns running against the model at once; the rest wait in their session queue
+        self.turn_slots = asyncio.Semaphore(max_concurrent_turns)
+        self.workers: Dict[Tuple[str, str], SessionWorker] = {}
+        self.accepting = True
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.latencies = deque(maxlen=1000)
+
+    async def create_session(self, user_id: Optional[str] = None) -> Tuple[str, str]:
+        if not self.accepting:
+            raise Busy(503, "Server is shutting down")
+        user_id = user_id or str(uuid.uuid4())
+        session = await self.runner.session_service.create_session(
+            app_name=self.runner.app_name, user_id=user_id, state=copy.deepcopy(self.initial_state))
+        return user_id, session.id
+
+    async def submit(self, user_id: str, session_id: str, text: str,
+                     on_partial: Optional[PartialCallback] = None) -> str:
+        """Queues a turn behind the session's earlier turns and waits for its response."""
+        if not self.accepting:
+            self.rejected += 1
+            raise Busy(503, "Server is shutting down")
+        if self.pending >= self.max_pending_turns:
+            self.rejected += 1
+            raise Busy(503, "Server is at capacity")
+
+        key = (user_id, session_id)
+        worker = self.workers.get(key)
+        if worker is None:
+            session = await self.runner.session_service.get_session(
+                app_name=self.runner.app_name, user_id=user_id, session_id=session_id)
+            if session is None:
+                raise KeyError(session_id)
+            # Re-check: another request may have started the worker while we awaited
+            worker = self.workers.get(key)
+            if worker is None:
+                worker = self.workers[key] = SessionWorker(self, user_id, session_id)
+
+        try:
+            future = worker.submit(text, on_partial)
+        except Busy:
+            self.rejected += 1
+            raise
+        self.pending += 1
+        start = time.perf_counter()
+        try:
+            response = await future
+        except Exception:
+            self.failed += 1
+            raise
+        self.completed += 1
+        self.latencies.append(time.perf_counter() - start)
+        return response
+
+    async def run_turn(self, user_id: str, session_id: str, text: str,
+                       on_partial: Optional[PartialCallback] = None) -> str:
+        content = types.Content(role="user", parts=[types.Part(text=text)])
+        # Partial text only exists with SSE streaming, so only ask for it when someone listens
+        run_config = RunConfig(streaming_mode=StreamingMode.SSE if on_partial else StreamingMode.NONE)
+        final_response = ""
+        async for event in self.runner.run_async(user_id=user_id, session_id=session_id,
+                                                 new_message=content, run_config=run_config):
+            text = app_state.event_text(event)
+            if event.partial:
+                if on_partial and text:
+                    await on_partial(text)
+            elif event.is_final_response() and text:
+                final_response = text
+        return final_response
+
+    async def shutdown(self, timeout: float = 30.0):
+        """Stops accepting turns, lets queued turns finish for up to timeout
+        seconds, then cancels whatever is left."""
+        self.accepting = False
+        workers = list(self.workers.values())
+        for worker in workers:
+            worker.stop()
+        tasks = [worker.task for worker in workers]
+        if tasks:
+            _, still_running = await asyncio.wait(tasks, timeout=timeout)
+            for task in still_running:
+                task.cancel()
+            await asyncio.gather(*still_running, return_exceptions=True)
+        # Fail turns that were still queued behind a cancelled one
+        for worker in workers:
+            while not worker.queue.empty():
+                item = worker.queue.get_nowait()
+                if item is not None and not item[2].done():
+                    item[2].set_exception(Busy(503, "Server is shutting down"))
+                    self.pending -= 1
+        self.workers.clear()
+
+    def stats(self) -> dict:
+        latencies = np.array(self.latencies) * 1000 if self.latencies else np.zeros(1)
+        return {
+            "active_sessions": len(self.workers),
+            "pending_turns": self.pending,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p95_ms": float(np.percentile(latencies, 95)),
+            **{plugin.name: plugin.stats() for plugin in self.runner.plugin_manager.plugins
+               if hasattr(plugin, "stats")},
+        }
+
+
+class CreateSessionRequest(BaseModel):
+    user_id: Optional[str] = None
+
+
+class TurnRequest(BaseModel):
+    user_id: str
+    text: str
+
+
+class ClaimTicketRequest(BaseModel):
+    assignee: str
+
+
+def create_app(server: AgentServer, shutdown_timeout: float = 30.0,
+               on_startup: Optional[Callable[[], None]] = None,
+               on_shutdown: Optional[Callable[[], Awaitable[None]]] = None,
+               tickets: Optional[TicketEngine] = None) -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        if on_startup:
+            on_startup()
+        yield
+        print("🛑 Shutting down, finishing queued turns...")
+        await server.shutdown(shutdown_timeout)
+        if on_shutdown:
+            await on_shutdown()
+
+    app = FastAPI(title=APP_NAME, lifespan=lifespan)
+
+    @app.get("/health")
+    async def health():
+        if not server.accepting:
+            raise HTTPException(503, "Server is shutting down")
+        return {"status": "ok"}
+
+    @app.get("/stats")
+    async def stats():
+        return server.stats()
+
+    @app.post("/sessions")
+    async def create_session(request: CreateSessionRequest):
+        try:
+            user_id, session_id = await server.create_session(request.user_id)
+        except Busy as e:
+            raise HTTPException(e.status_code, e.reason)
+        return {"user_id": user_id, "session_id": session_id}
+
+    @app.post("/sessions/{session_id}/turns")
+    async def turn(session_id: str, request: TurnRequest):
+        start = time.perf_counter()
+        try:
+            response = await server.submit(request.user_id, session_id, request.text)
+        except Busy as e:
+            raise HTTPException(e.status_code, e.reason)
+        except KeyError:
+            raise HTTPException(404, f"Session {session_id} not found")
+        return {"response": response, "latency_ms": (time.perf_counter() - start) * 1000}
+
+    @app.websocket("/sessions/{session_id}/ws")
+    async def session_socket(websocket: WebSocket, session_id: str, user_id: str):
+        await websocket.accept()
+
+        async def send_partial(text: str):
+            await websocket.send_json({"type": "partial", "text": text})
+
+        try:
+            while True:
+                message = await websocket.receive_json()
+                start = time.perf_counter()
+                try:
+                    response = await server.submit(user_id, session_id, message["text"], send_partial)
+                except Busy as e:
+                    await websocket.send_json({"type": "error", "status": e.status_code, "error": e.reason})
+                    continue
+                except KeyError:
+                    await websocket.send_json({"type": "error", "status": 404,
+                                               "error": f"Session {session_id} not found"})
+                    await websocket.close()
+                    return
+                await websocket.send_json({"type": "final", "text": response,
+                                           "latency_ms": (time.perf_counter() - start) * 1000})
+        except WebSocketDisconnect:
+            pass
+
+    if tickets is not None:
+        # Staff pull issue tickets most urgent first (severity, then SLA deadline)
+        @app.get("/tickets/next")
+        async def next_ticket():
+            ticket = tickets.next_ticket()
+            if ticket is None:
+                raise HTTPException(404, "No open tickets")
+            return ticket
+
+        @app.post("/tickets/claim")
+        async def claim_ticket(request: ClaimTicketRequest):
+            ticket = tickets.claim_next(request.assignee)
+            if ticket is None:
+                raise HTTPException(404, "No open tickets")
+            return ticket
+
+    return app
+
+
+def build_app() -> FastAPI:
+    """The production app: real agents, sessions, bookings and tickets persisted in SQLite."""
+    from Hotel_Agent.agent import coordinator_agent
+    from Hotel_Agent.sub_agents.issues_agent.tickets import ticket_engine
+    from Hotel_Agent.sub_agents.maps_agent.agent import maps_toolset
+    from intent_router import IntentRouterPlugin
+    from response_cache import ResponseCachePlugin
+
+    session_service = app_state.open_session_service()
+    runner = Runner(agent=coordinator_agent, app_name=APP_NAME, session_service=session_service,
+                    plugins=[ResponseCachePlugin(), IntentRouterPlugin(coordinator_agent.name)])
+    ticket_engine.start()
+
+    async def close():
+        print(f"Maps MCP server: {maps_toolset.stats()}")
+        await maps_toolset.close()
+        ticket_engine.stop()
+        session_service.close()
+
+    # The maps MCP server starts with the event loop, before the first request
+    return create_app(AgentServer(runner), on_startup=maps_toolset.start, on_shutdown=close, tickets=ticket_engine)
+
+
+if __name__ == "__main__":
+    import uvicorn # type: ignore
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    uvicorn.run(build_app(), host=args.host, port=args.port)
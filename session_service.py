@@ -0,0 +1,389 @@
+"""Durable session service for the ADK Runner on a local SQLite database.
+
+    session_service = SQLiteSessionService("hotel_sessions.db")
+    runner = Runner(agent=..., app_name=..., session_service=session_service)
+
+Every appended event is written as one row, together with only the state keys
+its state_delta touched, so a turn's write cost doesn't grow with the session.
+Sessions are loaded lazily on first access, kept in memory while in use and
+evicted again once idle.
+
+The same database also holds the app's records (bookings, tickets) so they
+survive restarts with the conversations that refer to them:
+
+    booking_store.load(session_service.load_records("bookings"))
+    session_service.attach_store("bookings", booking_store)
+"""
+import asyncio
+import copy
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.adk.events.event import Event # type: ignore
+from google.adk.sessions.base_session_service import ( # type: ignore
+    BaseSessionService, GetSessionConfig, ListSessionsResponse,
+)
+from google.adk.sessions.session import Session # type: ignore
+from google.adk.sessions.state import State # type: ignore
+
+from Hotel_Agent.records import RecordStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL, user_id TEXT NOT NULL, id TEXT NOT NULL,
+    update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, id)
+);
+CREATE TABLE IF NOT EXISTS session_state (
+    app_name TEXT NOT NULL, user_id TEXT NOT NULL, session_id TEXT NOT NULL,
+    key TEXT NOT NULL, value TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id, key)
+);
+CREATE TABLE IF NOT EXISTS user_state (
+    app_name TEXT NOT NULL, user_id TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, key)
+);
+CREATE TABLE IF NOT EXISTS app_state (
+    app_name TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,
+    PRIMARY KEY (app_name, key)
+);
+CREATE TABLE IF NOT EXISTS events (
+    app_name TEXT NOT NULL, user_id TEXT NOT NULL, session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL, timestamp REAL NOT NULL, data TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id, seq)
+);
+CREATE TABLE IF NOT EXISTS records (
+    store TEXT NOT NULL, id TEXT NOT NULL, data TEXT NOT NULL,
+    PRIMARY KEY (store, id)
+);
+"""
+
+SessionKey = Tuple[str, str, str]
+
+
+def split_state(state: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """Splits a state dict into (app, user, session) parts, dropping temp: keys."""
+    app_state, user_state, session_state = {}, {}, {}
+    for key, value in state.items():
+        if key.startswith(State.APP_PREFIX):
+            app_state[key.removeprefix(State.APP_PREFIX)] = value
+        elif key.startswith(State.USER_PREFIX):
+            user_state[key.removeprefix(State.USER_PREFIX)] = value
+        elif not key.startswith(State.TEMP_PREFIX):
+            session_state[key] = value
+    return app_state, user_state, session_state
+
+
+class SQLiteSessionService(BaseSessionService):
+    """BaseSessionService on SQLite in WAL mode, with a bounded cache of live sessions.
+
+    Args:
+        path: Database file. ":memory:" works for tests but is not durable.
+        idle_seconds: Sessions not touched for this long are dropped from memory
+            (not from disk) and reloaded on next access.
+        max_cached_sessions: Upper bound on sessions kept in memory.
+    """
+
+    def __init__(self, path: str = "sessions.db", idle_seconds: float = 600.0,
+                 max_cached_sessions: int = 1000):
+        self.path = path
+        self.idle_seconds = idle_seconds
+        self.max_cached_sessions = max_cached_sessions
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # Durable across process crashes; only an OS crash can lose the last commits
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        # Live sessions (with all their events), least recently used first
+        self._sessions: "OrderedDict[SessionKey, Tuple[Session, float]]" = OrderedDict()
+        self._next_seq: Dict[SessionKey, int] = {}
+        self._stores: List[RecordStore] = []
+        self.loads = 0
+        self.evictions = 0
+
+    def close(self):
+        with self._lock:
+            for store in self._stores:
+                store.on_change = None
+            self._stores.clear()
+            self._db.close()
+
+    def load_records(self, name: str) -> List[dict]:
+        """Records saved under a store name, oldest first."""
+        with self._lock:
+            rows = self._db.execute("SELECT data FROM records WHERE store = ? ORDER BY rowid", (name,)).fetchall()
+        return [json.loads(data) for data, in rows]
+
+    def attach_store(self, name: str, store: RecordStore):
+        """Writes every later change of a RecordStore through to this database.
+        Records are small and change once or twice per tool call, so each
+        change is a single-row write on the calling thread."""
+        def save(record_id: str, record: Optional[dict]):
+            with self._lock:
+                if record is None:
+                    self._db.execute("DELETE FROM records WHERE store = ? AND id = ?", (name, record_id))
+                else:
+                    # An upsert keeps the rowid, so records load back in insertion order
+                    self._db.execute(
+                        "INSERT INTO records VALUES (?, ?, ?) "
+                        "ON CONFLICT (store, id) DO UPDATE SET data = excluded.data",
+                        (name, record_id, json.dumps(record, ensure_ascii=False)))
+
+        with self._lock:
+            store.on_change = save
+            self._stores.append(store)
+
+    async def create_session(self, *, app_name: str, user_id: str,
+                             state: Optional[Dict[str, Any]] = None,
+                             session_id: Optional[str] = None) -> Session:
+        return await asyncio.to_thread(self._create_session, app_name, user_id, state or {}, session_id)
+
+    async def get_session(self, *, app_name: str, user_id: str, session_id: str,
+                          config: Optional[GetSessionConfig] = None) -> Optional[Session]:
+        return await asyncio.to_thread(self._get_session, app_name, user_id, session_id, config)
+
+    async def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        return await asyncio.to_thread(self._list_sessions, app_name, user_id)
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        await asyncio.to_thread(self._delete_session, app_name, user_id, session_id)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        # Updates the caller's session object the same way every service does
+        await super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+        await asyncio.to_thread(self._append_event, session, event)
+        return event
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"cached_sessions": len(self._sessions), "loads": self.loads, "evictions": self.evictions}
+
+    def _create_session(self, app_name: str, user_id: str, state: Dict[str, Any],
+                        session_id: Optional[str]) -> Session:
+        session_id = session_id.strip() if session_id and session_id.strip() else str(uuid.uuid4())
+        key = (app_name, user_id, session_id)
+        app_delta, user_delta, session_state = split_state(state)
+        now = time.time()
+        with self._lock:
+            try:
+                with self._transaction():
+                    self._db.execute("INSERT INTO sessions VALUES (?, ?, ?, ?)", (*key, now))
+                    self._write_state(app_name, user_id, session_id, app_delta, user_delta, session_state)
+            except sqlite3.IntegrityError:
+                raise ValueError(f"Session {session_id} already exists")
+            self._share_state(app_name, user_id, app_delta, user_delta)
+            session = Session(app_name=app_name, user_id=user_id, id=session_id,
+                              state={**session_state, **self._shared_state(app_name, user_id)},
+                              last_update_time=now)
+            self._next_seq[key] = 0
+            self._cache(key, session)
+            return self._snapshot(session, None)
+
+    def _get_session(self, app_name: str, user_id: str, session_id: str,
+                     config: Optional[GetSessionConfig]) -> Optional[Session]:
+        key = (app_name, user_id, session_id)
+        with self._lock:
+            cached = self._sessions.get(key)
+            session = cached[0] if cached else self._load(key)
+            if session is None:
+                return None
+            self._cache(key, session)
+            return self._snapshot(session, config)
+
+    def _list_sessions(self, app_name: str, user_id: str) -> ListSessionsResponse:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, update_time FROM sessions WHERE app_name = ? AND user_id = ? ORDER BY update_time",
+                (app_name, user_id),
+            ).fetchall()
+        return ListSessionsResponse(sessions=[
+            Session(app_name=app_name, user_id=user_id, id=session_id, last_update_time=update_time)
+            for session_id, update_time in rows
+        ])
+
+    def _delete_session(self, app_name: str, user_id: str, session_id: str):
+        key = (app_name, user_id, session_id)
+        with self._lock, self._transaction():
+            for table, id_column in [("sessions", "id"), ("session_state", "session_id"), ("events", "session_id")]:
+                self._db.execute(
+                    f"DELETE FROM {table} WHERE app_name = ? AND user_id = ? AND {id_column} = ?", key)
+            self._sessions.pop(key, None)
+            self._next_seq.pop(key, None)
+
+    def _append_event(self, session: Session, event: Event):
+        key = (session.app_name, session.user_id, session.id)
+        delta = event.actions.state_delta if event.actions and event.actions.state_delta else {}
+        app_delta, user_delta, session_delta = split_state(delta)
+        with self._lock:
+            seq = self._next_seq.get(key)
+            if seq is None:
+                seq = self._db.execute(
+                    "SELECT COALESCE(MAX(seq) + 1, 0) FROM events WHERE app_name = ? AND user_id = ? "
+                    "AND session_id = ?", key).fetchone()[0]
+            with self._transaction():
+                updated = self._db.execute(
+                    "UPDATE sessions SET update_time = ? WHERE app_name = ? AND user_id = ? AND id = ?",
+                    (event.timestamp, *key)).rowcount
+                if not updated:
+                    raise ValueError(f"Session {session.id} does not exist")
+                self._db.execute("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?)",
+                                 (*key, seq, event.timestamp, event.model_dump_json(exclude_none=True)))
+                self._write_state(*key, app_delta, user_delta, session_delta)
+            self._next_seq[key] = seq + 1
+
+            cached = self._sessions.get(key)
+            if cached and cached[0] is not session:
+                stored = cached[0]
+                stored.state.update(session_delta)
+                stored.events.append(event)
+                stored.last_update_time = event.timestamp
+            self._share_state(session.app_name, session.user_id, app_delta, user_delta)
+
+    def _load(self, key: SessionKey) -> Optional[Session]:
+        """Reads a session, its state and its events from disk."""
+        row = self._db.execute(
+            "SELECT update_time FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?", key).fetchone()
+        if row is None:
+            return None
+        app_name, user_id, session_id = key
+        state = {k: json.loads(v) for k, v in self._db.execute(
+            "SELECT key, value FROM session_state WHERE app_name = ? AND user_id = ? AND session_id = ?", key)}
+        state.update(self._shared_state(app_name, user_id))
+        rows = self._db.execute(
+            "SELECT seq, data FROM events WHERE app_name = ? AND user_id = ? AND session_id = ? ORDER BY seq",
+            key).fetchall()
+        self._next_seq[key] = rows[-1][0] + 1 if rows else 0
+        self.loads += 1
+        return Session(app_name=app_name, user_id=user_id, id=session_id, state=state,
+                       events=[Event.model_validate_json(data) for _, data in rows], last_update_time=row[0])
+
+    def _shared_state(self, app_name: str, user_id: str) -> Dict[str, Any]:
+        """The app: and user: keys visible to a session of this app and user."""
+        state = {State.APP_PREFIX + k: json.loads(v) for k, v in self._db.execute(
+            "SELECT key, value FROM app_state WHERE app_name = ?", (app_name,))}
+        state.update({State.USER_PREFIX + k: json.loads(v) for k, v in self._db.execute(
+            "SELECT key, value FROM user_state WHERE app_name = ? AND user_id = ?", (app_name, user_id))})
+        return state
+
+    def _share_state(self, app_name: str, user_id: str, app_delta: Dict[str, Any], user_delta: Dict[str, Any]):
+        """app:/user: keys are shared, so other live sessions must see changes too."""
+        if not app_delta and not user_delta:
+            return
+        for (other_app, other_user, _), (other, _) in self._sessions.items():
+            if other_app == app_name:
+                other.state.update({State.APP_PREFIX + k: v for k, v in app_delta.items()})
+                if other_user == user_id:
+                    other.state.update({State.USER_PREFIX + k: v for k, v in user_delta.items()})
+
+    def _write_state(self, app_name: str, user_id: str, session_id: str, app_delta: Dict[str, Any],
+                     user_delta: Dict[str, Any], session_delta: Dict[str, Any]):
+        if app_delta:
+            self._db.executemany("INSERT OR REPLACE INTO app_state VALUES (?, ?, ?)",
+                                 [(app_name, k, json.dumps(v)) for k, v in app_delta.items()])
+        if user_delta:
+            self._db.executemany("INSERT OR REPLACE INTO user_state VALUES (?, ?, ?, ?)",
+                                 [(app_name, user_id, k, json.dumps(v)) for k, v in user_delta.items()])
+        if session_delta:
+            self._db.executemany("INSERT OR REPLACE INTO session_state VALUES (?, ?, ?, ?, ?)",
+                                 [(app_name, user_id, session_id, k, json.dumps(v)) for k, v in session_delta.items()])
+
+    def _cache(self, key: SessionKey, session: Session):
+        now = time.monotonic()
+        self._sessions[key] = (session, now)
+        self._sessions.move_to_end(key)
+        while self._sessions:
+            oldest_key, (_, last_used) = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.max_cached_sessions and now - last_used < self.idle_seconds:
+                break
+            del self._sessions[oldest_key]
+            self._next_seq.pop(oldest_key, None)
+            self.evictions += 1
+
+    @staticmethod
+    def _snapshot(session: Session, config: Optional[GetSessionConfig]) -> Session:
+        """A copy the caller may modify. Events are never changed once appended,
+        so only the list is copied; state values are deep-copied since tools
+        may mutate them in place."""
+        events = session.events
+        if config:
+            if config.num_recent_events:
+                events = events[-config.num_recent_events:]
+            if config.after_timestamp:
+                events = [event for event in events if event.timestamp >= config.after_timestamp]
+        return Session(app_name=session.app_name, user_id=session.user_id, id=session.id,
+                       state=copy.deepcopy(session.state), events=list(events),
+                       last_update_time=session.last_update_time)
+
+    def _transaction(self):
+        return _Transaction(self._db)
+
+
+class _Transaction:
+    """BEGIN/COMMIT around a block, ROLLBACK on error (autocommit connection)."""
+
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute("BEGIN")
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+if __name__ == "__main__":
+    # Benchmark: event write throughput and resume latency after a restart
+    import os
+    import tempfile
+
+    from google.adk.events.event_actions import EventActions # type: ignore
+    from google.genai import types # type: ignore
+
+    async def benchmark():
+        path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        service = SQLiteSessionService(path)
+        app_name, user_id = "bench", "user"
+        sessions = [await service.create_session(app_name=app_name, user_id=user_id,
+                                                 state={"user_name": "Hassan", "recent_bookings": []})
+                    for _ in range(20)]
+
+        events_per_session = 200
+        start = time.perf_counter()
+        for i in range(events_per_session):
+            await asyncio.gather(*(
+                service.append_event(session, Event(
+                    author="booking_agent", invocation_id=str(i),
+                    content=types.Content(role="model", parts=[types.Part(text="تم تأكيد الحجز " * 5)]),
+                    actions=EventActions(state_delta={"recent_bookings": [f"b{i}"]}),
+                ))
+                for session in sessions
+            ))
+        elapsed = time.perf_counter() - start
+        total = events_per_session * len(sessions)
+        print(f"append_event: {total / elapsed:.0f} events/s ({elapsed / total * 1e6:.0f} µs each), "
+              f"db size {os.path.getsize(path) / 1e6:.1f} MB")
+        service.close()
+
+        # A fresh service is a restart: the first get_session loads from disk
+        service = SQLiteSessionService(path)
+        start = time.perf_counter()
+        session = await service.get_session(app_name=app_name, user_id=user_id, session_id=sessions[0].id)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        await service.get_session(app_name=app_name, user_id=user_id, session_id=sessions[0].id)
+        warm = time.perf_counter() - start
+        print(f"resume {len(session.events)} events: cold {cold * 1000:.1f} ms, warm {warm * 1000:.2f} ms, "
+              f"state {session.state['recent_bookings']}")
+        service.close()
+
+    asyncio.run(benchmark())
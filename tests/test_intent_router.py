@@ -0,0 +1,41 @@
+import asyncio
+from types import SimpleNamespace
+
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from intent_router import NO_INTENT, IntentRouterPlugin, intent_classifier
+
+
+def test_amenity_questions_stay_with_the_coordinator():
+    for text in ["هل يوجد مسبح", "هل عندكم مسبح", "في مسبح بالفندق؟", "هل يوجد جيم", "what time is breakfast"]:
+        intent, confidence = intent_classifier.classify(text)
+        assert intent == NO_INTENT or confidence < 0.85, (text, intent, confidence)
+
+
+def test_obvious_requests_are_routed():
+    assert intent_classifier.classify("اريد حجز غرفة")[0] == "booking_agent"
+    assert intent_classifier.classify("المكيف خربان")[0] == "issue_agent"
+    assert intent_classifier.classify("اين اقرب صيدلية")[0] == "maps_agent"
+
+
+def test_streamed_coordinator_call_is_timed_on_the_final_response():
+    router = IntentRouterPlugin("root_coordinator")
+    text = "مرحبا"
+    context = SimpleNamespace(agent_name="root_coordinator", invocation_id="1",
+                              user_content=types.Content(role="user", parts=[types.Part(text=text)]))
+    request = LlmRequest(contents=[types.Content(role="user", parts=[types.Part(text=text)])])
+    request.tools_dict["transfer_to_agent"] = None
+
+    async def turn():
+        assert await router.before_model_callback(callback_context=context, llm_request=request) is None
+        chunk = types.Content(role="model", parts=[types.Part(text="اهلا")])
+        for _ in range(3):
+            await router.after_model_callback(callback_context=context,
+                                              llm_response=LlmResponse(content=chunk, partial=True))
+        await router.after_model_callback(callback_context=context, llm_response=LlmResponse(content=chunk))
+
+    asyncio.run(turn())
+    assert router.coordinator_calls == 1
+    assert router.stats()["avg_coordinator_ms"] > 0
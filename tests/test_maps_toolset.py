@@ -0,0 +1,86 @@
+import asyncio
+import os
+import signal
+import sys
+
+from google.adk.tools.mcp_tool import StdioConnectionParams
+from mcp import StdioServerParameters
+
+from Hotel_Agent.sub_agents.maps_agent.tool_cache import ToolResultCache
+from Hotel_Agent.sub_agents.maps_agent.toolset import PersistentMCPToolset
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GEOCODE = ("tomtom-geocode", {"query": "Montaza Palace"})
+ROUTE = ("tomtom-routing", {"origin": {"lat": 31.2, "lon": 29.9}, "destination": {"lat": 31.21, "lon": 29.97}})
+
+
+def fake_server_toolset(pid_file, cache=None):
+    params = StdioServerParameters(
+        command=sys.executable, args=["-m", "Hotel_Agent.sub_agents.maps_agent.fake_tomtom_mcp"], cwd=ROOT,
+        env={**os.environ, "FAKE_TOMTOM_LATENCY": "0", "FAKE_TOMTOM_PID_FILE": str(pid_file)},
+    )
+    return PersistentMCPToolset(StdioConnectionParams(server_params=params, timeout=10), name="fake",
+                                health_interval=60.0, startup_timeout=30.0, cache=cache)
+
+
+def test_toolset_recovers_after_the_server_is_killed(tmp_path):
+    pid_file = tmp_path / "tomtom.pid"
+
+    async def scenario():
+        toolset = fake_server_toolset(pid_file)
+        try:
+            tools = {tool.name: tool for tool in await toolset.get_tools()}
+            geocode = tools["tomtom-geocode"]
+            first = await geocode.run_async(args=GEOCODE[1], tool_context=None)
+            os.kill(int(pid_file.read_text()), signal.SIGKILL)
+            await asyncio.sleep(0.2)
+            # The call finds the server dead and is retried on a new one
+            second = await geocode.run_async(args=GEOCODE[1], tool_context=None)
+            return first, second, toolset.stats()
+        finally:
+            await toolset.close()
+
+    first, second, stats = asyncio.run(scenario())
+    assert not first.get("isError") and not second.get("isError")
+    assert stats["starts"] == 2 and stats["restarts"] == 1
+
+
+def test_cache_answers_until_the_tool_ttl_expires():
+    now = [0.0]
+    cache = ToolResultCache(ttls={"tomtom-geocode": 3600, "tomtom-routing": 600}, clock=lambda: now[0])
+    for name, args in (GEOCODE, ROUTE):
+        assert cache.get(name, args) is None
+        cache.put(name, args, {"result": name})
+
+    now[0] += 599
+    assert cache.get(*ROUTE) == {"result": "tomtom-routing"}
+    now[0] += 2
+    assert cache.get(*ROUTE) is None
+    assert cache.get(*GEOCODE) == {"result": "tomtom-geocode"}
+    now[0] += 3000
+    assert cache.get(*GEOCODE) is None
+    assert cache.expired == 2
+
+
+def test_cache_skips_uncached_tools_and_errors():
+    cache = ToolResultCache(ttls={"tomtom-geocode": 3600})
+    cache.put("tomtom-traffic", {"bbox": "x"}, {"incidents": []})
+    cache.put(*GEOCODE, {"isError": True, "content": []})
+    assert cache.get("tomtom-traffic", {"bbox": "x"}) is None
+    assert cache.get(*GEOCODE) is None
+
+
+def test_toolset_serves_repeated_calls_from_the_cache(tmp_path):
+    async def scenario():
+        toolset = fake_server_toolset(tmp_path / "tomtom.pid", cache=ToolResultCache())
+        try:
+            geocode = {tool.name: tool for tool in await toolset.get_tools()}["tomtom-geocode"]
+            results = [await geocode.run_async(args=GEOCODE[1], tool_context=None) for _ in range(3)]
+            return results, toolset.stats()
+        finally:
+            await toolset.close()
+
+    results, stats = asyncio.run(scenario())
+    assert results[0] == results[1] == results[2]
+    assert stats["calls"]["tomtom-geocode"]["count"] == 1
+    assert stats["cache"]["tools"]["tomtom-geocode"] == {"hits": 2, "misses": 1}
@@ -0,0 +1,39 @@
+import copy
+from types import SimpleNamespace
+
+import app_state
+from Hotel_Agent.sub_agents.booking_agent import agent as booking
+from Hotel_Agent.sub_agents.issues_agent import agent as issues
+
+
+def guest(user_id):
+    """Stands in for the ToolContext of a turn by user_id."""
+    return SimpleNamespace(state=copy.deepcopy(app_state.initial_state),
+                           _invocation_context=SimpleNamespace(user_id=user_id))
+
+
+def test_bookings_are_scoped_to_their_owner_and_hide_it():
+    alice, mallory = guest("alice"), guest("mallory")
+    made = booking.make_reservation(alice, "room_104", "", "", "")
+    booking_id = made["booking_details"]["booking_id"]
+    try:
+        assert booking.confirm_booking(mallory, booking_id)["status"] == "error"
+        assert booking.cancel_booking(mallory, booking_id)["status"] == "error"
+        assert booking.find_guest_bookings(mallory, "")["status"] == "error"
+        results = [made["booking_details"], booking.confirm_booking(alice, booking_id)["booking_details"],
+                   *booking.find_guest_bookings(alice, "")["bookings"]]
+        assert all("owner" not in result for result in results)
+    finally:
+        assert "owner" not in booking.cancel_booking(alice, booking_id)["booking_details"]
+
+
+def test_tickets_are_scoped_to_their_owner_and_hide_it():
+    alice, mallory = guest("alice"), guest("mallory")
+    created = issues.create_issue_ticket(alice, "", "AC broken", "high")
+    ticket_id = created["ticket_details"]["ticket_id"]
+    assert issues.view_issue_status(mallory, ticket_id)["status"] == "error"
+    assert issues.resolve_issue(mallory, ticket_id, "closed")["status"] == "error"
+    results = [created["ticket_details"], issues.view_issue_status(alice, ticket_id)["ticket_details"],
+               *issues.view_user_issues(alice, "")["tickets"],
+               issues.resolve_issue(alice, ticket_id, "fixed")["ticket_details"]]
+    assert all("owner" not in result for result in results)
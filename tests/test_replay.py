@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+# replay runs on the benchmark harness, which loads the voice pipeline
+pytest.importorskip("sounddevice")
+
+import benchmark
+import replay
+from Hotel_Agent.agent import coordinator_agent
+
+BOOKING = [["اريد ان احجز غرفة من فضلك"]]
+
+
+def all_agents(agent):
+    yield agent
+    for sub_agent in agent.sub_agents:
+        yield from all_agents(sub_agent)
+
+
+@pytest.fixture
+def stand_in_models():
+    """Scripted models that make a real reservation; the agents are restored afterwards."""
+    saved = [(agent, agent.model, getattr(agent, "tools", None)) for agent in all_agents(coordinator_agent)]
+    benchmark.install_stand_ins(benchmark.LatencyModel(0.0))
+    booking_agent = coordinator_agent.find_agent("booking_agent")
+    booking_agent.model.script = benchmark.tool_then_answer(
+        "make_reservation", {"room_id": "room_101", "guest_name": "", "check_in": "", "check_out": ""},
+        "تم تأكيد الحجز.")
+    yield
+    for agent, model, tools in saved:
+        agent.model = model
+        if tools is not None:
+            agent.tools = tools
+
+
+def test_repeated_replay_of_a_booking(stand_in_models, tmp_path):
+    path = str(tmp_path / "calls.jsonl.gz")
+    asyncio.run(replay.record(path, BOOKING))
+    # The recorded booking still holds the room, so each repeat must start over
+    assert asyncio.run(replay.replay(path, latency_scale=0, repeat=2)) == 0
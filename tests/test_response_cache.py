@@ -0,0 +1,61 @@
+import asyncio
+from types import SimpleNamespace
+
+from google.adk.events.event import Event
+from google.adk.tools.function_tool import FunctionTool
+from google.genai import types
+
+from Hotel_Agent.sub_agents.booking_agent.agent import find_guest_bookings
+from response_cache import ResponseCachePlugin
+
+
+def make_context(agent, user_id, invocation_id, text):
+    return SimpleNamespace(
+        agent=agent, user_id=user_id, invocation_id=invocation_id,
+        session=SimpleNamespace(events=[], state={}),
+        user_content=types.Content(role="user", parts=[types.Part(text=text)]),
+    )
+
+
+async def run_turn(cache, agent, user_id, invocation_id, text, tool=None):
+    """Drives the plugin through one turn; returns the cached reply on a hit."""
+    context = make_context(agent, user_id, invocation_id, text)
+    hit = await cache.before_run_callback(invocation_context=context)
+    if hit is not None:
+        return hit.parts[0].text
+    if tool is not None:
+        await cache.before_tool_callback(tool=tool, tool_args={},
+                                         tool_context=SimpleNamespace(invocation_id=invocation_id))
+    reply = Event(author=agent.name, invocation_id=invocation_id,
+                  content=types.Content(role="model", parts=[types.Part(text=f"answer for {user_id}")]))
+    await cache.on_event_callback(invocation_context=context, event=reply)
+    await cache.after_run_callback(invocation_context=context)
+    return None
+
+
+def make_agent():
+    agent = SimpleNamespace(name="booking_agent", instruction="")
+    agent.root_agent = SimpleNamespace(find_agent=lambda name: agent if name == agent.name else None)
+    return agent
+
+
+def test_owner_scoped_answers_are_not_shared_between_users():
+    cache, agent = ResponseCachePlugin(), make_agent()
+    tool = FunctionTool(find_guest_bookings)
+
+    async def turns():
+        assert await run_turn(cache, agent, "alice", "1", "show my bookings", tool) is None
+        return await run_turn(cache, agent, "bob", "2", "show my bookings", tool)
+
+    assert asyncio.run(turns()) is None
+    assert cache.stored == 0 and cache.uncacheable == 2
+
+
+def test_general_answers_are_shared_between_users():
+    cache, agent = ResponseCachePlugin(), make_agent()
+
+    async def turns():
+        await run_turn(cache, agent, "alice", "1", "what time is check-in")
+        return await run_turn(cache, agent, "bob", "2", "what time is check-in")
+
+    assert asyncio.run(turns()) == "answer for alice"
@@ -0,0 +1,38 @@
+from Hotel_Agent.sub_agents.issues_agent.tickets import TicketEngine
+
+
+def make_engine(now):
+    return TicketEngine(on_escalate=lambda ticket: None, clock=lambda: now[0])
+
+
+def test_restore_keeps_deadline_of_ticket_escalated_to_critical():
+    now = [1_700_000_000.0]
+    engine = make_engine(now)
+    ticket = engine.create("Hassan", "AC broken", "high")
+    now[0] += 61 * 60
+    assert [t["severity"] for t in engine.escalate_overdue()] == ["critical"]
+
+    restored = make_engine(now)
+    restored.restore([engine.get(ticket["ticket_id"])])
+    now[0] += 16 * 60
+    breached = restored.escalate_overdue()
+    assert [t["ticket_id"] for t in breached] == [ticket["ticket_id"]]
+    assert breached[0]["sla_expired"]
+    assert [t["ticket_id"] for t in engine.escalate_overdue()] == [ticket["ticket_id"]]
+
+
+def test_restore_skips_expired_and_resolved_tickets():
+    now = [1_700_000_000.0]
+    engine = make_engine(now)
+    expired = engine.create("Hassan", "water leak", "critical")
+    resolved = engine.create("Hassan", "towels", "low")
+    engine.resolve(resolved["ticket_id"], "done")
+    now[0] += 16 * 60
+    engine.escalate_overdue()
+
+    restored = make_engine(now)
+    restored.restore([engine.get(expired["ticket_id"]), engine.get(resolved["ticket_id"])])
+    assert restored.next_ticket()["ticket_id"] == expired["ticket_id"]
+    assert restored.open_count() == 1
+    now[0] += 24 * 60 * 60
+    assert restored.escalate_overdue() == []
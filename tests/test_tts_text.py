@@ -0,0 +1,24 @@
+import pytest
+
+# TTS loads the vendor SDKs and the tashkeel model at import
+pytest.importorskip("mishkal")
+
+from TTS import split_complete_sentences, split_sentences
+
+
+def test_abbreviations_and_decimals_do_not_end_a_sentence():
+    assert split_sentences("e.g. this") == ["e.g. this"]
+    assert split_sentences("Use the pool, i.e. the one outside. Then rest.") == [
+        "Use the pool, i.e. the one outside.", "Then rest."]
+    assert split_sentences("Dr. Ali will meet you at 10 a.m. tomorrow") == [
+        "Dr. Ali will meet you at 10 a.m. tomorrow"]
+    assert split_sentences("السعر 3.5 دولار. شكرا") == ["السعر 3.5 دولار.", "شكرا"]
+
+
+def test_arabic_marks_and_runs_end_one_sentence():
+    assert split_sentences("مرحبا، كيف حالك؟! اهلا...") == ["مرحبا،", "كيف حالك؟!", "اهلا..."]
+
+
+def test_streamed_text_keeps_the_unfinished_sentence():
+    assert split_complete_sentences("مرحبا. كيف") == (["مرحبا."], " كيف")
+    assert split_complete_sentences("See e.g.") == ([], "See e.g.")